@@ -72,9 +72,9 @@ class AccessListCache(object):
                         continue
 
                     if allowedFn(f, acc.actor) or accessAllowedFn(f, acc):
-                        l = accessListsInst.get(acc.actor.uid()) or set()
+                        l = accessListsInst.get(acc.actor.iid()) or set()
                         l.add((f, acc))
-                        accessListsInst[acc.actor.uid()] = l
+                        accessListsInst[acc.actor.iid()] = l
 
             self.cache[name] = accessListsInst
 
@@ -1,10 +1,12 @@
 """A runtime instance of a Linux Desktop application."""
 from xdg import DesktopEntry
 from constants import DESKTOPPATHS, DESKTOPIDRE
+from DesktopIndex import DesktopIndex
 from blist import sortedlist
-from copy import deepcopy
+from copy import copy
 import re
 import os
+import threading
 
 
 class Application(object):
@@ -39,6 +41,11 @@ class Application(object):
 
     desktopre = re.compile(DESKTOPIDRE)
     desktopCache = dict()
+    settingCache = dict()  # type: dict; typed settings already read.
+    uidIds = dict()  # type: dict; integer id of each UID that was given one.
+    idApps = dict()  # type: dict; Application that accessed Files per id.
+    idGeneration = 0  # type: int; bumped whenever the ids above are cleared.
+    uidLock = threading.Lock()  # Applications can be made by several loaders.
 
     def __init__(self,
                  desktopid: str=None,
@@ -71,6 +78,8 @@ class Application(object):
         self.tend = tend
         self.interpreterid = interpreterid.lower() if interpreterid else None
         self._uid = None
+        self._iid = None
+        self._idGeneration = 0
         self._regenUid()
 
     @staticmethod
@@ -78,6 +87,11 @@ class Application(object):
         """Get a .desktop file from the desktop cache for a given desktopid."""
         finalid = None
         if not Application.desktopCache.get(desktopid):
+            indexed = DesktopIndex.get().lookup(desktopid)
+            if indexed:
+                Application.desktopCache[indexed[0]] = indexed
+                return indexed
+
             de = DesktopEntry.DesktopEntry()
             for path in DESKTOPPATHS:
                 if not desktopid.endswith(".desktop"):
@@ -138,6 +152,23 @@ class Application(object):
         """Tell if an Application differs from another (different UIDs)."""
         return self._uid.__hash__()
 
+    def __getstate__(self):
+        """Return a picklable state, as sortedlists with keys are not."""
+        state = self.__dict__.copy()
+        state['events'] = list(self.events)
+        return state
+
+    def __setstate__(self, state: dict):
+        """Restore an Application, and the .desktop entry it points to."""
+        events = state.pop('events')
+        self.__dict__.update(state)
+        self.clearEvents()
+        self.events.update(events)
+
+        # getSetting() expects our .desktop entry to be in the desktop cache.
+        if self.desktopid:
+            Application.getDesktopIdFromDesktopUri(self.desktopid)
+
     def isInitialised(self):
         """Check if an Application is initialised."""
         return self.init
@@ -151,13 +182,47 @@ class Application(object):
         return self.interpreterid
 
     def _regenUid(self):
-        """Regenerate the UID for this application."""
+        """Regenerate the UID for this application.
+
+        An Application that already has an integer id keeps it under its new
+        UID, unless another Application already has that UID.
+        """
         self._uid = "%s:%d:%d" % (self.desktopid, self.pid, self.tstart)
+        if self._iid is not None and \
+                self._idGeneration == Application.idGeneration:
+            with Application.uidLock:
+                self._iid = Application.uidIds.setdefault(self._uid,
+                                                          self._iid)
 
     def uid(self):
         """Generate a unique string identifier for this Application."""
         return self._uid
 
+    def iid(self):
+        """Return a small integer identifier matching this Application's UID.
+
+        Applications with the same UID have the same integer id, so it can be
+        used in place of the UID as a cheaper dictionary key. Ids are handed
+        out on first use, which the ApplicationStore does in the order of its
+        Applications, so that temporary Applications and UIDs never get one.
+        Ids handed out before the last call to clearIds() are handed out again.
+        """
+        if self._iid is None or \
+                self._idGeneration != Application.idGeneration:
+            with Application.uidLock:
+                self._iid = Application.uidIds.setdefault(
+                    self._uid, len(Application.uidIds))
+                self._idGeneration = Application.idGeneration
+        return self._iid
+
+    @staticmethod
+    def clearIds():
+        """Forget the integer ids handed out so far, and their Applications."""
+        with Application.uidLock:
+            Application.uidIds.clear()
+            Application.idApps.clear()
+            Application.idGeneration += 1
+
     def hasSameDesktopId(self, other, resolveInterpreter: bool=False):
         """Check whether a desktop id is equivalent to the current object's.
 
@@ -340,21 +405,29 @@ class Application(object):
                    defaultValue=None,
                    type: str="string"):
         """Get a stored setting relative to this app."""
-        (__, entry) = Application.desktopCache.get(self.desktopid)
+        isList = type.endswith(" list")
+        if isList and defaultValue is None:
+            defaultValue = []
 
-        if not entry:
-            return None
+        cacheKey = (self.desktopid, key, group, type)
+        try:
+            value = Application.settingCache[cacheKey]
+        except(KeyError) as e:
+            (__, entry) = Application.desktopCache.get(self.desktopid)
 
-        isList = False
-        if type.endswith(" list"):
-            isList = True
-            type = type[:-5]
-            defaultValue = [] if defaultValue is None else defaultValue
+            if not entry:
+                return None
 
-        return entry.get(key,
-                         group=group,
-                         type=type,
-                         list=isList) or defaultValue
+            value = entry.get(key,
+                              group=group,
+                              type=type[:-5] if isList else type,
+                              list=isList)
+            Application.settingCache[cacheKey] = value
+
+        # Callers get their own copy of lists, which they may modify.
+        if isList and value:
+            return list(value)
+        return value or defaultValue
 
     def getAppType(self):
         """Return the type of the Appplication (sys/desktop/study/userland)."""
@@ -399,6 +472,9 @@ class Application(object):
         and ending at this Application's end time. Events are split too. If
         Events exist in the gap between :beforeEnd: and :afterStart:, this
         function returns an IndexError.
+
+        Both halves share this Application's immutable fields, and each only
+        keeps the Events and file descriptors that belong to its own runtime.
         """
         from Event import Event
         il = self.events.bisect_left(Event(time=beforeEnd))
@@ -409,22 +485,50 @@ class Application(object):
                              "resulting Applications (between %s and %s)." % (
                               self.uid(), ir - il, beforeEnd, afterStart))
 
-        appLeft = deepcopy(self)
+        appLeft = copy(self)
         appLeft.events = self.events[:il]
+        appLeft.fds = self._sliceFDs(end=beforeEnd)
         if len(appLeft.events):
             appLeft.tend = appLeft.events[-1].time
 
-        appRight = deepcopy(self)
+        appRight = copy(self)
+        appRight._iid = None
         appRight.events = self.events[ir:]
+        appRight.fds = self._sliceFDs(start=afterStart)
         if len(appRight.events):
             appRight.tstart = appRight.events[0].time
+            appRight._regenUid()
 
         return (appLeft, appRight)
 
+    def _sliceFDs(self, start: int=0, end: int=0):
+        """Return the file descriptors open between :start: and :end:."""
+        fds = dict()
+        for (fd, fdList) in self.fds.items():
+            kept = [item for item in fdList if
+                    (not end or item[1] <= end) and
+                    (not item[2] or item[2] >= start)]
+            if kept:
+                fds[fd] = kept
+        return fds
+
     def addEvent(self, event: 'Event'):
         """Keep an Event temporarily till its final actor is resolved."""
         self.events.add(event)
 
+    def popEvents(self):
+        """Return this app's time-sorted Events, and clear them.
+
+        The Events are updated to point to the updated self.
+        """
+        events = self.events
+        for event in events:
+            event.actor = self
+
+        # Clear events, to save RAM.
+        self.clearEvents()
+        return events
+
     def sendEventsToStore(self):
         """Send this app's Events to the EventStore, and clear them."""
         # Get the EventStore
@@ -432,9 +536,5 @@ class Application(object):
         eventStore = EventStore.get()
 
         # Send each Event, after updating it to point to the updated self.
-        for event in self.events:
-            event.actor = self
+        for event in self.popEvents():
             eventStore.append(event)
-
-        # Clear events, to save RAM.
-        self.clearEvents()
@@ -2,9 +2,15 @@
 from Application import Application
 from Event import Event
 from constants import APPMERGEWINDOW
+from bisect import bisect_left
 import sys
 
 
+def _appEnd(app: Application):
+    """Return the time of end of an Application, to bisect PID lists."""
+    return app.getTimeOfEnd()
+
+
 class ApplicationStore(object):
     """A place to store Applications as they are being built from multiple sources.
 
@@ -26,6 +32,7 @@ class ApplicationStore(object):
     @staticmethod
     def reset():
         ApplicationStore.__app_store = None
+        Application.clearIds()
 
     def __init__(self):
         """Construct an ApplicationStore."""
@@ -94,9 +101,31 @@ class ApplicationStore(object):
         """Empty the ApplicationStore."""
         self.pidStore = dict()   # type: dict
         self.nameStore = dict()  # type: dict
+        self.idStore = dict()    # type: dict
         self.nameStoreClean = True
+        self._overlappingPids = set()  # type: set
         self._len = 0
 
+    def _checkDisjoint(self, pid: int, pids: list, start: int=0, end: int=-1):
+        """Check that the instances of a PID still run one after the other.
+
+        Instances at positions :start: to :end: are checked. If one of them
+        starts before the previous one ends, the PID's instances are no longer
+        searched by bisection.
+        """
+        end = len(pids) - 1 if end < 0 else min(end, len(pids) - 1)
+        for index in range(max(start, 1), end + 1):
+            if pids[index-1].getTimeOfEnd() >= pids[index].getTimeOfStart():
+                self._overlappingPids.add(pid)
+                return
+
+    def _firstEndingAfter(self, pid: int, pids: list, time: int):
+        """Return the index of the first instance of a PID ending at :time:
+        or later, or of the first instance if the PID has overlapping ones."""
+        if pid in self._overlappingPids:
+            return 0
+        return bisect_left(pids, time, key=_appEnd)
+
     def _mergePidList(self, pids: list):
         """Ensure a time-sorted PID list has its similar neighbours merged."""
         newPids = []
@@ -279,7 +308,10 @@ class ApplicationStore(object):
         pids = self.pidStore.get(app.pid, list())  # type: list
 
         neighbourCheckupIndex = -1
-        for (index, bpp) in enumerate(pids):
+        splitCheckup = False
+        for index in range(self._firstEndingAfter(app.pid, pids, tstart),
+                           len(pids)):
+            bpp = pids[index]
             bstart = bpp.getTimeOfStart()
             bend = bpp.getTimeOfEnd()
 
@@ -318,6 +350,7 @@ class ApplicationStore(object):
                     # be more complicated (thus error-prone) than browsing the
                     # whole (short) list of pids. So let's keep it fool-proof.
                     pids = self._mergePidList(pids)
+                    splitCheckup = True
 
                     # raise ValueError("Applications %s and %s have the same "
                     #                  "PID (%d) and their runtimes overlap:\n"
@@ -343,6 +376,14 @@ class ApplicationStore(object):
         if neighbourCheckupIndex >= 0:
             pids = self._mergePidItem(pids, neighbourCheckupIndex)
 
+        # Merges extend instances, and splits reorder them.
+        if splitCheckup:
+            self._checkDisjoint(app.pid, pids)
+        elif neighbourCheckupIndex >= 0:
+            self._checkDisjoint(app.pid, pids,
+                                neighbourCheckupIndex - 2,
+                                neighbourCheckupIndex + 2)
+
         self.pidStore[app.getPid()] = pids
         self.nameStoreClean = False
 
@@ -376,6 +417,8 @@ class ApplicationStore(object):
                     changed = True
                     interpretersAdded += 1
             self.pidStore[pid] = self._mergePidList(apps) if changed else apps
+            if changed:
+                self._checkDisjoint(pid, self.pidStore[pid])
             instancesEliminated += listLen - len(self.pidStore[pid])
 
         # Ensure the name store is up-to-date again
@@ -384,14 +427,26 @@ class ApplicationStore(object):
         return (interpretersAdded, instancesEliminated)
 
     def sendEventsToStore(self):
-        """Send Applications' events to the EventStore with a correct actor."""
+        """Send Applications' events to the EventStore with a correct actor.
+
+        Each Application's Events are already sorted, so they are merged into
+        the EventStore, which remains sorted. Applications are also given
+        their integer ids here, in the order of the store, before simulated
+        Events start using them.
+        """
+        from EventStore import EventStore
+        streams = []
         for (pid, apps) in self.pidStore.items():
             for app in apps:
-                app.sendEventsToStore()
+                app.iid()
+                streams.append(app.popEvents())
+
+        EventStore.get().merge(streams)
 
     def _regenNameStore(self):
-        """Regenerate the desktopid index of this ApplicationStore."""
+        """Regenerate the desktopid and integer id indexes of this store."""
         self.nameStore = dict()
+        self.idStore = dict()
         summedLen = 0
 
         for (pid, apps) in self.pidStore.items():
@@ -400,6 +455,7 @@ class ApplicationStore(object):
                 desktopList = self.nameStore.get(app.desktopid) or []
                 desktopList.append(app)
                 self.nameStore[app.desktopid] = desktopList
+                self.idStore[app.iid()] = app
 
         self._len = summedLen
         self.nameStoreClean = True
@@ -423,8 +479,23 @@ class ApplicationStore(object):
 
         return events
 
+    def lookupId(self, iid: int):
+        """Return the Application that has the given integer id, if any."""
+        if not self.nameStoreClean:
+            self._regenNameStore()
+
+        return self.idStore.get(iid)
+
     def lookupUid(self, uid: str):
         """Return the only Application that has the given UID."""
+        # Regenerating the name store first gives stored Applications an id.
+        if not self.nameStoreClean:
+            self._regenNameStore()
+        app = self.idStore.get(Application.uidIds.get(uid))
+        if app and app.uid() == uid:
+            return app
+
+        # The UID may point to the middle of an Application's lifetime.
         try:
             func = (str, int, int)
             (desktopid, pid, tstart) = map(lambda f, d: f(d), func,
@@ -462,6 +533,14 @@ class ApplicationStore(object):
         except(KeyError):
             return None
         else:
+            # Instances run one after the other, so only one can match.
+            if pid not in self._overlappingPids:
+                index = bisect_left(pids, timestamp, key=_appEnd)
+                if index < len(pids) and \
+                        timestamp >= pids[index].getTimeOfStart():
+                    return pids[index]
+                return None
+
             for app in pids:
                 if (timestamp >= app.getTimeOfStart() and
                         timestamp <= app.getTimeOfEnd()):
@@ -102,9 +102,8 @@ class AttackSimulator(object):
                             spreadTimes[follower] = f.time
 
                 # Add future accesses.
-                for acc in current.accesses:
-                    if acc.time > currentTime and \
-                            acc.actor.desktopid not in appSet and \
+                for acc in current.getAccesses(after=currentTime):
+                    if acc.actor.desktopid not in appSet and \
                             _allowed(policy, current, acc):
                         toSpread.append(acc.actor)
                         spreadTimes[acc.actor] = acc.time
@@ -115,7 +114,7 @@ class AttackSimulator(object):
                     tprnt("App added @%d: %s" % (currentTime, current.uid()))
 
                 # Add files accessed by the app.
-                for (accFile, acc) in acListInst.get(current.uid()) or []:
+                for (accFile, acc) in acListInst.get(current.iid()) or []:
                     if acc.time > currentTime and \
                             accFile not in seen and \
                             _allowed(policy, accFile, acc):
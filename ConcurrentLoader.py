@@ -0,0 +1,57 @@
+"""Load the Zeitgeist database and the PreloadLogger logs at the same time."""
+from Application import Application
+from ApplicationStore import ApplicationStore
+from ParseCache import ParseCache
+from PreloadLoggerLoader import PreloadLoggerLoader
+from SqlLoader import SqlLoader
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+
+
+class _AppCollector(list):
+    """Collect the Applications made by a loader, to insert them later."""
+
+    def insert(self, app: Application):
+        """Keep an Application for later insertion into the store."""
+        self.append(app)
+
+
+def loadConcurrently(store: ApplicationStore,
+                     sql: SqlLoader,
+                     pll: PreloadLoggerLoader,
+                     jobs: int,
+                     cache: ParseCache=None,
+                     streaming: bool=False):
+    """Load both data sources, reading the SQLite db in a worker thread.
+
+    The SQLite db is read in a worker thread while the PreloadLogger logs are
+    parsed, in :jobs: processes if it is greater than 1. Each loader gathers
+    its Applications in a list rather than inserting them. Once both are
+    done, the Applications are inserted into :store: in the same order as in
+    a serial run: Zeitgeist first, then PreloadLogger. The statistics of the
+    SQLite db are printed at that point too, so they do not interleave with
+    the PreloadLogger's output.
+
+    Application ids are only handed out by the store once its Applications
+    are final, so they do not depend on which loader made an Application
+    first either.
+
+    The worker processes are forked before the worker thread starts, so that
+    they cannot inherit a lock held by that thread at the time of the fork.
+    """
+    sqlApps = _AppCollector()
+    pllApps = _AppCollector()
+    pool = Pool(processes=jobs) if jobs > 1 else None
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            sqlLoading = executor.submit(sql.loadDb, sqlApps, cache=cache,
+                                         streaming=streaming, quiet=True)
+            pll.loadDb(pllApps, jobs=jobs, cache=cache, pool=pool)
+            sqlLoading.result()
+    finally:
+        if pool:
+            pool.terminate()
+    sql.printStats()
+
+    for app in sqlApps + pllApps:
+        store.insert(app)
@@ -4,11 +4,14 @@ from File import EventFileFlags
 from Application import Application
 from blist import sortedlist
 from utils import time2Str
+from math import inf
 
 
 class DesignationCacheItem(object):
     """An act of designation for one Application over some Files."""
 
+    __slots__ = ('actor', 'evflags', 'tstart', 'tend', 'paths', 'cmdline')
+
     def __init__(self,
                  actor: Application,
                  evflags: EventFileFlags,
@@ -22,10 +25,65 @@ class DesignationCacheItem(object):
         self.evflags = evflags
         self.tstart = tstart
         self.tend = tstart + duration if duration != -1 else 0
-        self.files = files or []
+        self.paths = frozenset(f.path for f in files)
         self.cmdline = cmdline
 
 
+class DesignationCacheTimeline(object):
+    """The acts of designation of one Application, indexed over time.
+
+    Acts are sorted by time of start. As the simulation clock advances, acts
+    that have started are moved to a list of live acts, and acts that have
+    expired are pruned from it. Asking for an earlier time than the previous
+    one rewinds the timeline.
+    """
+
+    __slots__ = ('acts', 'started', 'live', 'expiry', 'clock')
+
+    def __init__(self):
+        """Construct a DesignationCacheTimeline."""
+        super(DesignationCacheTimeline, self).__init__()
+        self.acts = sortedlist(key=lambda i: i.tstart)
+        self.rewind()
+
+    def rewind(self):
+        """Reset the simulation clock, so that no act has started yet."""
+        self.started = 0    # Number of acts that have started
+        self.live = []      # Acts that have started and not yet expired
+        self.expiry = inf   # Earliest time of end of a live act
+        self.clock = -inf   # Time of the latest call to :actsAt():
+
+    def add(self, item: DesignationCacheItem):
+        """Add an act of designation to the timeline."""
+        self.acts.add(item)
+        if item.tstart <= self.clock:
+            self.rewind()
+
+    def actsAt(self, time: int):
+        """Return the acts active at :time:, starting with the latest ones."""
+        if time < self.clock:
+            self.rewind()
+        self.clock = time
+
+        acts = self.acts
+        live = self.live
+        started = self.started
+        while started < len(acts) and acts[started].tstart <= time:
+            act = acts[started]
+            live.append(act)
+            if act.tend and act.tend < self.expiry:
+                self.expiry = act.tend
+            started += 1
+        self.started = started
+
+        if self.expiry < time:
+            self.live = live = [a for a in live
+                                if not a.tend or a.tend >= time]
+            self.expiry = min((a.tend for a in live if a.tend), default=inf)
+
+        return reversed(live)
+
+
 class DesignationCache(object):
     """A cache for acts of designation used in an EventStore simulation.
 
@@ -72,10 +130,11 @@ class DesignationCache(object):
                                         cmdline=event.data,
                                         tstart=event.time,
                                         duration=duration)
-        l = self.store.get(event.getActor().uid()) or \
-            sortedlist(key=lambda i: i.tstart)
-        l.add(item)
-        self.store[event.getActor().uid()] = l
+        timeline = self.store.get(event.getActor().iid())
+        if timeline is None:
+            timeline = DesignationCacheTimeline()
+            self.store[event.getActor().iid()] = timeline
+        timeline.add(item)
 
     def checkForDesignation(self, event: Event, files: list):
         """Check for acts of designation that match an Event and its Files.
@@ -89,31 +148,26 @@ class DesignationCache(object):
 
         Returns a list of (File, EventFileFlags) tuples.
         """
-        l = self.store.get(event.getActor().uid()) or []
-        lChanged = False
+        timeline = self.store.get(event.getActor().iid())
 
         # Bypass Zeitgeist events as they're all by designation.
-        if event.getSource() == EventSource.zeitgeist:
-            l = []
+        if timeline is None or event.getSource() == EventSource.zeitgeist:
+            acts = ()
+        else:
+            acts = timeline.actsAt(event.time)
+
+        # The flags for which an act must apply to match the Event.
+        accesses = event.getFileFlags() & ~(EventFileFlags.designation |
+                                            EventFileFlags.programmatic)
 
         # Check latest acts of designation first, and loop till we're done.
         res = []
-        for (actIdx, act) in enumerate(reversed(l)):
+        files = list(files)
+        for act in acts:
             # If there are no files left, we can exit.
-            if not len(files):
+            if not files:
                 break
 
-            # If we reach events that have expired, we can get rid of them.
-            if act.tend and act.tend < event.time:
-                # FIXME review how this index is calculated (l is reversed!)
-                # del l[actIdx]
-                # lChanged = True
-                continue
-
-            # We can't yet rely on this designation cache item.
-            if act.tstart > event.time:
-                continue
-
             # Compare the event's flags to the act's.
             crossover = event.getFileFlags() & act.evflags
 
@@ -123,8 +177,6 @@ class DesignationCache(object):
                 continue
 
             # The flags for which the act applies don't match all event flags.
-            accesses = event.getFileFlags() & ~(EventFileFlags.designation |
-                                                EventFileFlags.programmatic)
             if crossover != accesses:
                 # print("Debug: an act of designation was found for Event %s,"
                 #       " but the access flags don't match. Event: %s. Act:"
@@ -140,8 +192,9 @@ class DesignationCache(object):
             newFlags |= auths
 
             # Now find Files that match the act of designation's own Files
-            for (fIdx, f) in enumerate(files):
-                if f.path in act.cmdline:
+            unmatched = []
+            for f in files:
+                if act.cmdline and f.path in act.cmdline:
                     # print("Info: Event '%s' performed on %s by App '%s' on "
                     #       "File '%s' is turned into a %s event based on an "
                     #       "act of designation performed on %s." % (
@@ -153,8 +206,7 @@ class DesignationCache(object):
                     #        EventFileFlags.designation else "programmatic",
                     #        time2Str(act.tstart)))
                     res.append((f, newFlags))
-                    del files[fIdx]
-                elif f.path in [x.path for x in act.files]:
+                elif f.path in act.paths:
                     print("Info: Event '%s' performed on %s by App '%s' on "
                           "File '%s' is turned into a %s event based on an "
                           "Zeitgeit event performed on %s." % (
@@ -166,16 +218,14 @@ class DesignationCache(object):
                            EventFileFlags.designation else "programmatic",
                            time2Str(act.tstart)))
                     res.append((f, newFlags))
-                    del files[fIdx]
+                else:
+                    unmatched.append(f)
+            files = unmatched
+
         # Now that we've checked all acts of designation for this Application,
         # check if some files have not matched any act. We return those with
         # the original event flags.
-        else:
-            for f in files:
-                res.append((f, event.getFileFlags()))
-
-        # If we've removed expired acts, we should update the store.
-        if lChanged:
-            self.store[event.getActor().uid()] = l
+        for f in files:
+            res.append((f, event.getFileFlags()))
 
         return res
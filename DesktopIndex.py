@@ -0,0 +1,95 @@
+"""An index of the .desktop entries shipped with the program."""
+from xdg import DesktopEntry
+from constants import DESKTOPPATHS, DESKTOPIDRE
+import os
+import re
+
+
+class DesktopIndex(object):
+    """An index of the .desktop entries shipped with the program.
+
+    DesktopIndex parses every .desktop file of a directory once, so that
+    Applications find their entry with a dictionary lookup rather than by
+    trying to parse a file in each of the DESKTOPPATHS. Parsed entries can be
+    saved in a ParseCache, where they are keyed by the modification time of
+    the directory and of each of its .desktop files.
+    """
+    __index = None
+    cacheKind = "desktop"
+
+    @staticmethod
+    def get():
+        """Return the DesktopIndex for the entire application."""
+        if DesktopIndex.__index is None:
+            DesktopIndex.__index = DesktopIndex()
+        return DesktopIndex.__index
+
+    @staticmethod
+    def reset():
+        """Reset the DesktopIndex, so that it is built again when used."""
+        from Application import Application
+        DesktopIndex.__index = None
+        Application.settingCache.clear()
+
+    def __init__(self):
+        """Construct a DesktopIndex."""
+        super(DesktopIndex, self).__init__()
+        self.path = None
+        self.entries = dict()  # type: dict; file name -> (desktopid, entry)
+
+    def load(self, path: str=DESKTOPPATHS[0], cache: 'ParseCache'=None):
+        """Index the .desktop files in :path:, using :cache: if provided."""
+        self.path = path
+        names = self._listNames(path)
+        (sig, entries) = (None, None)
+
+        # Files edited in place do not change the directory's modification
+        # time, so each file is part of the cache entry's signature.
+        if cache:
+            (sig, entries) = cache.load(DesktopIndex.cacheKind, path,
+                                        [path + n for n in names])
+
+        if entries is None:
+            entries = self._parse(path, names)
+            if cache:
+                cache.save(DesktopIndex.cacheKind, path, sig, entries)
+
+        self.entries = entries
+
+    def _listNames(self, path: str):
+        """Return the sorted names of the .desktop files in :path:."""
+        try:
+            names = os.listdir(path)
+        except(OSError) as e:
+            return []
+
+        return sorted(n for n in names if n.endswith(".desktop"))
+
+    def _parse(self, path: str, names: list):
+        """Parse the .desktop files :names: in :path:, indexed by name."""
+        desktopre = re.compile(DESKTOPIDRE)
+        entries = dict()
+        for name in names:
+            depath = os.path.realpath(path + name)
+            de = DesktopEntry.DesktopEntry()
+            try:
+                de.parse(depath)
+            except(DesktopEntry.ParsingError) as e:
+                continue
+
+            res = desktopre.match(depath)
+            try:
+                finalid = res.groups()[0].lower()
+            except(ValueError, KeyError) as e:
+                finalid = depath.lower()
+            entries[name[:-8]] = (finalid, de)
+
+        return entries
+
+    def lookup(self, desktopid: str):
+        """Return the (desktopid, entry) indexed for a Desktop id, if any."""
+        if self.path is None:
+            self.load()
+
+        name = desktopid[:-8] if desktopid.endswith(".desktop") else desktopid
+        return self.entries.get(name)
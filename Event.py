@@ -4,7 +4,7 @@ from Application import Application
 from SqlEvent import SqlEvent
 from File import File, EventFileFlags, FileStub
 from utils import urlToUnixPath, int16, debugEnabled, intersection, \
-                  checkExcludedFilesEnabled
+                  checkExcludedFilesEnabled, lazyEventsEnabled
 from constants import POSIX_OPEN_RE, POSIX_FOPEN_RE, POSIX_FDOPEN_RE, \
                       POSIX_OPENDIR_RE, POSIX_UNLINK_RE, POSIX_CLOSE_RE, \
                       POSIX_FCLOSE_RE, POSIX_RENAME_RE, POSIX_DUP_RE, \
@@ -20,6 +20,27 @@ excludedEvents = 0
 excludedFiles = set()
 excludedApps = dict()
 exclItemsRORW = dict()
+hiddenFolders = dict()
+
+
+def _isHiddenFolder(path: str):
+    """Return True if the folder at :path:, or one of its parents, is hidden.
+
+    Results are cached per folder, as many files share the same parents.
+    """
+    hidden = hiddenFolders.get(path)
+    if hidden is None:
+        lastDir = path.rfind('/')
+        if lastDir >= 0:
+            hidden = len(path) > lastDir+1 and path[lastDir+1] == '.'
+        else:
+            hidden = path[0] == '.'
+
+        if not hidden:
+            parent = File.getParentNameFromName(path)
+            hidden = _isHiddenFolder(parent) if parent else False
+        hiddenFolders[path] = hidden
+    return hidden
 
 
 def dbgPrintExcludedEvents():
@@ -77,6 +98,9 @@ class Event(object):
     target subjects (e.g. Files or other Applications).
     """
 
+    __slots__ = ('actor', 'time', 'evflags', 'source', 'data', 'data_app',
+                 '_lazy')
+
     posixOpenRe = re.compile(POSIX_OPEN_RE)
     posixFopenRe = re.compile(POSIX_FOPEN_RE)
     posixFDopenRe = re.compile(POSIX_FDOPEN_RE)
@@ -88,6 +112,9 @@ class Event(object):
     posixRenameRe = re.compile(POSIX_RENAME_RE)
     posixDupRe = re.compile(POSIX_DUP_RE)
 
+    # Split single-line system calls with str methods rather than regexes.
+    fastTokenizer = True
+
     def __init__(self,
                  actor: Application=None,
                  time: int=0,
@@ -107,6 +134,7 @@ class Event(object):
 
         self.data = []        # binary data specific to each Event.
         self.data_app = []    # binary data specific to each Event's actor.
+        self._lazy = None     # raw system call and actor uid, if unparsed.
 
         # Dummy actors are useful for making dummy events for time comparison.
         if not actor:
@@ -130,6 +158,12 @@ class Event(object):
             self.parseZeitgeist(zgEvent)
         elif syscallStr:
             self.source = EventSource.preloadlogger
+            # Keep the raw system call until the Event is simulated.
+            if lazyEventsEnabled():
+                self.data = None
+                self.data_app = None
+                self._lazy = (syscallStr, actor.uid())
+                return
             self.parseSyscall(syscallStr)
         elif cmdlineStr:
             self.source = EventSource.cmdline
@@ -138,6 +172,30 @@ class Event(object):
         if checkExcludedFilesEnabled():
             self.checkIfExcluded()
 
+    def parse(self):
+        """Parse the system call of an Event that was loaded lazily.
+
+        With --lazy-events, Events only keep their raw system call until they
+        are simulated. Their data lists are only made once the system call is
+        known to be valid. Return True if the Event was parsed by this call.
+        """
+        if self._lazy is None:
+            return False
+
+        syscallStr = self._lazy[0]
+        self._lazy = None
+        self.parseSyscall(syscallStr)
+        if self.isInvalid():
+            return True
+
+        if self.data is None:
+            self.data = []
+        if self.data_app is None:
+            self.data_app = []
+        if checkExcludedFilesEnabled():
+            self.checkIfExcluded()
+        return True
+
     def markInvalid(self):
         """Mark an Event as being invalid, by deleting its flags."""
         self.evflags = EventFileFlags.no_flags
@@ -162,27 +220,14 @@ class Event(object):
             global exclItemsRORW
 
             def _userFile(p, userHome):
-                hasParent = True
-                hidden = False
-                path = p
-                while hasParent and not hidden:
-                    path = File.getParentNameFromName(path)
-                    hasParent = True if path else False
-
-                    if hasParent:
-                        lastDir = path.rfind('/')
-                        if lastDir >= 0:
-                            hidden = len(path) > lastDir+1 and \
-                                path[lastDir+1] == '.'
-                        else:
-                            hidden = path[0] == '.'
-
-                if hidden or p.startswith(userHome+"/."):
+                parent = File.getParentNameFromName(p)
+                if parent and _isHiddenFolder(parent):
+                    return False
+
+                if p.startswith(userHome+"/."):
                     return False
 
-                if not p.startswith("/media") and \
-                        not p.startswith("/mnt") and \
-                        not p.startswith(userHome):
+                if not p.startswith(("/media", "/mnt", userHome)):
                     return False
 
                 return True
@@ -199,6 +244,7 @@ class Event(object):
             userConf = UserConfigLoader.get()
             userHome = userConf.getHomeDir()
             excl = userConf.getExcludedHomeDirs()
+            exclRe = userConf.getExcludedHomeDirsRe()
 
             if isinstance(self.data[0], FileStub):
                 paths = list((f.path for f in self.data))
@@ -217,7 +263,9 @@ class Event(object):
             ro = self.evflags & EventFileFlags.read
             for p in paths:
                 found = False
-                for e in excl:
+                # Most paths are not excluded, and need not be compared to
+                # each excluded directory.
+                for e in (excl if exclRe.match(p) else ()):
                     if p.startswith(e):
                         found = True
                         i.append(p)
@@ -290,7 +338,11 @@ class Event(object):
 
     def setDataSyscallFD(self, fd: int, path: str, fdType):
         """Set list of FDs that this Event links to its acting Application."""
-        self.data_app.append((fd, path, fdType))
+        fdItem = (fd, sys.intern(path) if path else path, fdType)
+        if self.data_app is None:
+            self.data_app = [fdItem]
+        else:
+            self.data_app.append(fdItem)
 
     def setDataSyscallFilesDual(self, oldpath: str, newpath: str):
         """Set data to a list of file couples (for copy/move events)."""
@@ -373,6 +425,11 @@ class Event(object):
             # TODO continue
             self.markInvalid()
 
+    def _fdRef(self, fd: int):
+        """Return a path referencing a file descriptor of the actor."""
+        uid = self._lazy[1] if self._lazy else self.getActor().uid()
+        return "@fdref:%d@appref:%s@" % (fd, uid)
+
     def _rejectError(self, syscall, path, flags, error):
         """Print a warning that a syscall failed and invalidate the Event."""
         # Don't log failed syscalls, but inform the reader
@@ -404,13 +461,114 @@ class Event(object):
             self.evflags |= EventFileFlags.write
             self.evflags |= EventFileFlags.read
 
+    @staticmethod
+    def _isInt(field: str):
+        """Tell if a field is a decimal integer, optionally negative."""
+        return field.isdecimal() or (field[:1] == '-' and
+                                     field[1:].isdecimal())
+
+    @staticmethod
+    def _isPointer(field: str, nullable: bool=True):
+        """Tell if a field matches the 0x[a-f0-9]+ or (nil) expressions."""
+        if nullable and field == '(nil)':
+            return True
+        return len(field) > 2 and field[:2] == '0x' and \
+            not field[2:].strip('0123456789abcdef')
+
+    @staticmethod
+    def _splitOpen(content: str):
+        """Split the content of an open() call, like :posixOpenRe: does."""
+        (filename, __, rest) = content.partition('|fd ')
+        (fd, __, rest) = rest.partition(': with flag ')
+        (flags, __, rest) = rest.partition(', e')
+        (error, sep, cwd) = rest.partition('|')
+        if sep and Event._isInt(fd) and Event._isInt(flags) and \
+                Event._isInt(error):
+            return (filename, int(fd), int(flags), int(error), cwd)
+        return None
+
+    @staticmethod
+    def _splitFopen(content: str):
+        """Split the content of an fopen() call, like :posixFopenRe: does."""
+        (filename, __, rest) = content.partition('|FILE ')
+        (fd, __, rest) = rest.partition(': with flag ')
+        (flags, __, rest) = rest.partition(', e')
+        (error, sep, cwd) = rest.partition('|')
+        if sep and Event._isPointer(fd) and Event._isInt(flags) and \
+                Event._isInt(error):
+            return (filename, int16(fd), int(flags), int(error), cwd)
+        return None
+
+    @staticmethod
+    def _splitOpendir(content: str):
+        """Split the content of an opendir() call, like :posixOpendirRe:."""
+        (filename, __, rest) = content.partition('|DIR ')
+        (fd, __, rest) = rest.partition(': e')
+        (error, sep, cwd) = rest.partition('|')
+        if sep and Event._isPointer(fd) and Event._isInt(error):
+            return (filename, int16(fd), int(error), cwd)
+        return None
+
+    @staticmethod
+    def _splitUnlink(content: str):
+        """Split the content of an unlink() call, like :posixUnlinkRe: does."""
+        (filename, __, rest) = content.partition('|e')
+        (error, sep, cwd) = rest.partition('|')
+        if sep and Event._isInt(error):
+            return (filename, int(error), cwd)
+        return None
+
+    @staticmethod
+    def _splitClose(content: str):
+        """Split the content of a close() call, like :posixCloseRe: does."""
+        if not content.startswith('fd: '):
+            return None
+        (fd, __, rest) = content[4:].partition('|e')
+        (error, sep, __) = rest.partition('|')
+        if sep and Event._isInt(fd) and Event._isInt(error):
+            return (int(fd), int(error))
+        return None
+
+    @staticmethod
+    def _splitFclose(content: str):
+        """Split the content of an fclose() call, like :posixFcloseRe: does."""
+        if content.startswith('FILE: '):
+            content = content[6:]
+        elif content.startswith('DIR: '):
+            content = content[5:]
+        else:
+            return None
+        (fd, __, rest) = content.partition('|e')
+        (error, sep, __) = rest.partition('|')
+        if sep and Event._isPointer(fd, nullable=False) and \
+                Event._isInt(error):
+            return (int(fd, 16), int(error))
+        return None
+
+    @staticmethod
+    def _tokenize(content: str, regex, func: tuple, splitter=None):
+        """Split a system call's content into fields of the types in :func:.
+
+        The :splitter: function is used if the fast tokenizer is enabled, and
+        the :regex: is used for multi-line contents and as a fallback. Return
+        None if the content does not match the :regex:.
+        """
+        if splitter and Event.fastTokenizer and '\n' not in content:
+            fields = splitter(content)
+            if fields is not None:
+                return fields
+
+        res = regex.match(content)
+        if res is None:
+            return None
+        return tuple(f(d) for (f, d) in zip(func, res.groups()))
+
     def parsePOSIXOpen(self, syscall: str, content: str):
         """Process a POSIX open() or similar system call."""
         # Process the event's content
-        res = Event.posixOpenRe.match(content)
-        try:
-            g = res.groups()
-        except(AttributeError) as e:
+        g = Event._tokenize(content, Event.posixOpenRe,
+                            (str, int, int, int, str), Event._splitOpen)
+        if g is None:
             if syscall not in ('openat', 'openat64', 'mkdirat'):
                 print("Error: POSIX open* system call was not logged "
                       "properly: %s" % content, file=sys.stderr)
@@ -420,17 +578,9 @@ class Event(object):
                 print("TODO: find RE parser for: ", syscall, "***", content)
                 print("TODO: init @fdref@ with fd value")
                 sys.exit(1)  # TODO
-        else:
-            # Check the syscall was well formed and we have everything we need
-            if len(g) != 5:
-                print("Error: POSIX open* system call was not logged "
-                      "properly: %s" % content, file=sys.stderr)
-                self.markInvalid()
-                return
 
-            # Assign relevant variables
-            func = (str, int, int, int, str)
-            (filename, fd, flags, error, cwd) = map(lambda f, d: f(d), func, g)
+        # Assign relevant variables
+        (filename, fd, flags, error, cwd) = g
 
         # Build path to be used by simulator
         path = filename if filename.startswith('/') else np(cwd+'/'+filename)
@@ -440,8 +590,7 @@ class Event(object):
         # not defined, and that's fine.
         if syscall in ('openat', 'openat64', 'mkdirat'):
             try:
-                path = ("@fdref:%d@appref:%s@" % (
-                         fdref, self.getActor().uid())) + path
+                path = self._fdRef(fdref) + path
             except NameError:
                 pass
 
@@ -467,25 +616,16 @@ class Event(object):
     def parsePOSIXFopen(self, syscall: str, content: str):
         """Process a POSIX fopen() or freopen() system call."""
         # Process the event's content
-        res = Event.posixFopenRe.match(content)
-        try:
-            g = res.groups()
-        except(AttributeError) as e:
+        g = Event._tokenize(content, Event.posixFopenRe,
+                            (str, int16, int, int, str), Event._splitFopen)
+        if g is None:
             print("Error: POSIX fopen/freopen system call was not logged "
                   "properly: %s" % content, file=sys.stderr)
             self.markInvalid()
             return
-        else:
-            # Check the syscall was well formed and we have everything we need
-            if len(g) != 5:
-                print("Error: POSIX fopen/freopen system call was not logged "
-                      "properly: %s" % content, file=sys.stderr)
-                self.markInvalid()
-                return
 
-            # Assign relevant variables
-            func = (str, int16, int, int, str)
-            (filename, fd, flags, error, cwd) = map(lambda f, d: f(d), func, g)
+        # Assign relevant variables
+        (filename, fd, flags, error, cwd) = g
 
         # Ignore abstract sockets
         if filename.startswith('@/'):
@@ -513,28 +653,19 @@ class Event(object):
         """Process a POSIX fdopendir() system call."""
         # Process the event's content
         content = content.strip()
-        res = Event.posixFDopendirRe.match(content)
-        try:
-            g = res.groups()
-        except(AttributeError) as e:
+        g = Event._tokenize(content, Event.posixFDopendirRe,
+                            (int, int16, int))
+        if g is None:
             print("Error: POSIX fdopendir system call was not "
                   "logged properly: %s" % content, file=sys.stderr)
             self.markInvalid()
             return
-        else:
-            # Check the syscall was well formed and we have everything we need
-            if len(g) != 3:
-                print("Error: POSIX fdopendir system call was not "
-                      "logged properly: %s" % content, file=sys.stderr)
-                self.markInvalid()
-                return
 
-            # Assign relevant variables
-            func = (int, int16, int)
-            (fdref, fd, error) = map(lambda f, d: f(d), func, g)
+        # Assign relevant variables
+        (fdref, fd, error) = g
 
         # Build path to be used by simulator, and save the corresponding File
-        path = ("@fdref:%d@appref:%s@" % (fdref, self.getActor().uid()))
+        path = self._fdRef(fdref)
 
         # Opendir requires the directory to exist, and is a read access
         flags = O_RDONLY
@@ -556,28 +687,19 @@ class Event(object):
 
         # Process the event's content
         content = content.strip()
-        res = Event.posixFDopenRe.match(content)
-        try:
-            g = res.groups()
-        except(AttributeError) as e:
+        g = Event._tokenize(content, Event.posixFDopenRe,
+                            (int, int16, int, int))
+        if g is None:
             print("Error: POSIX fdopen system call was not "
                   "logged properly: %s" % content, file=sys.stderr)
             self.markInvalid()
             return
-        else:
-            # Check the syscall was well formed and we have everything we need
-            if len(g) != 4:
-                print("Error: POSIX fdopen system call was not "
-                      "logged properly: %s" % content, file=sys.stderr)
-                self.markInvalid()
-                return
 
-            # Assign relevant variables
-            func = (int, int16, int, int)
-            (fdref, fd, flags, error) = map(lambda f, d: f(d), func, g)
+        # Assign relevant variables
+        (fdref, fd, flags, error) = g
 
         # Build path to be used by simulator, and save the corresponding File
-        path = ("@fdref:%d@appref:%s@" % (fdref, self.getActor().uid()))
+        path = self._fdRef(fdref)
 
         # Don't log failed syscalls, but inform the reader
         if error < 0 or fd == -1:
@@ -597,25 +719,16 @@ class Event(object):
     def parsePOSIXOpendir(self, syscall: str, content: str):
         """Process a POSIX opendir() system call."""
         # Process the event's content
-        res = Event.posixOpendirRe.match(content)
-        try:
-            g = res.groups()
-        except(AttributeError) as e:
+        g = Event._tokenize(content, Event.posixOpendirRe,
+                            (str, int16, int, str), Event._splitOpendir)
+        if g is None:
             print("Error: POSIX opendir system call was not logged "
                   "properly: %s" % content, file=sys.stderr)
             self.markInvalid()
             return
-        else:
-            # Check the syscall was well formed and we have everything we need
-            if len(g) != 4:
-                print("Error: POSIX opendir system call was not logged "
-                      "properly: %s" % content, file=sys.stderr)
-                self.markInvalid()
-                return
 
-            # Assign relevant variables
-            func = (str, int16, int, str)
-            (filename, fd, error, cwd) = map(lambda f, d: f(d), func, g)
+        # Assign relevant variables
+        (filename, fd, error, cwd) = g
 
         # Build path to be used by simulator, and save the corresponding File
         path = filename if filename.startswith('/') else np(cwd+'/'+filename)
@@ -638,25 +751,16 @@ class Event(object):
     def parsePOSIXUnlink(self, syscall: str, content: str):
         """Process a POSIX unlink() system call."""
         # Process the event's content
-        res = Event.posixUnlinkRe.match(content)
-        try:
-            g = res.groups()
-        except(AttributeError) as e:
+        g = Event._tokenize(content, Event.posixUnlinkRe,
+                            (str, int, str), Event._splitUnlink)
+        if g is None:
             print("Error: POSIX unlink system call was not logged "
                   "properly: %s" % content, file=sys.stderr)
             self.markInvalid()
             return
-        else:
-            # Check the syscall was well formed and we have everything we need
-            if len(g) != 3:
-                print("Error: POSIX unlink system call was not logged "
-                      "properly: %s" % content, file=sys.stderr)
-                self.markInvalid()
-                return
 
-            # Assign relevant variables
-            func = (str, int, str)
-            (filename, error, cwd) = map(lambda f, d: f(d), func, g)
+        # Assign relevant variables
+        (filename, error, cwd) = g
 
         # Build path to be used by simulator, and save the corresponding File
         path = filename if filename.startswith('/') else np(cwd+'/'+filename)
@@ -682,28 +786,20 @@ class Event(object):
         """Process a POSIX close() or fclose() or closedir() system call."""
         # Process the event's content
         if syscall == 'close':
-            res = Event.posixCloseRe.match(content)
+            g = Event._tokenize(content, Event.posixCloseRe,
+                                (int, int), Event._splitClose)
         else:
-            res = Event.posixFcloseRe.match(content)
+            g = Event._tokenize(content, Event.posixFcloseRe,
+                                (int16, int), Event._splitFclose)
 
-        try:
-            g = res.groups()
-        except(AttributeError) as e:
+        if g is None:
             print("Error: POSIX close* system call was not logged "
                   "properly: %s" % content, file=sys.stderr)
             self.markInvalid()
             return
-        else:
-            # Check the syscall was well formed and we have everything we need
-            if len(g) != 2:
-                print("Error: POSIX close* system call was not logged "
-                      "properly: %s" % content, file=sys.stderr)
-                self.markInvalid()
-                return
 
-            # Assign relevant variables
-            func = (int if syscall == 'close' else int16, int)
-            (fd, error) = map(lambda f, d: f(d), func, g)
+        # Assign relevant variables
+        (fd, error) = g
 
         # Don't log failed syscalls, but inform the reader
         if error < 0 or fd == -1:
@@ -722,27 +818,16 @@ class Event(object):
             sys.exit(1)
 
         # Process the event's content
-        res = Event.posixRenameRe.match(content)
-
-        try:
-            g = res.groups()
-        except(AttributeError) as e:
+        g = Event._tokenize(content, Event.posixRenameRe,
+                            (str, str, str, int, int, str))
+        if g is None:
             print("Error: POSIX rename system call was not logged "
                   "properly: %s" % content, file=sys.stderr)
             self.markInvalid()
             return
-        else:
-            # Check the syscall was well formed and we have everything we need
-            if len(g) != 6:
-                print("Error: POSIX rename system call was not logged "
-                      "properly: %s" % content, file=sys.stderr)
-                self.markInvalid()
-                return
 
-            # Assign relevant variables
-            func = (str, str, str, int, int, str)
-            (old, ocwd, new, flags, error, ncwd) = map(
-                lambda f, d: f(d), func, g)
+        # Assign relevant variables
+        (old, ocwd, new, flags, error, ncwd) = g
 
         # Don't log failed syscalls, but inform the reader
         if error < 0:
@@ -765,26 +850,16 @@ class Event(object):
         """
 
         # Process the event's content
-        res = Event.posixDupRe.match(content)
-        try:
-            g = res.groups()
-        except(AttributeError) as e:
+        g = Event._tokenize(content, Event.posixDupRe,
+                            (int, str, int, str, str))
+        if g is None:
             print("Error: POSIX dup* system call was not logged "
                   "properly: %s" % content, file=sys.stderr)
             self.markInvalid()
             return
-        else:
-            # Check the syscall was well formed and we have everything we need
-            if len(g) != 5:
-                print("Error: POSIX dup* system call was not logged "
-                      "properly: %s" % content, file=sys.stderr)
-                self.markInvalid()
-                return
 
-            # Assign relevant variables
-            func = (int, str, int, str, str)
-            (oldfd, oldcwd, newfd, __, newcwd) = \
-                map(lambda f, d: f(d), func, g)
+        # Assign relevant variables
+        (oldfd, oldcwd, newfd, __, newcwd) = g
 
         # No error checking in this syscall due to a bug in PreloadLogger.
         if -1 in (oldfd, newfd):
@@ -808,12 +883,39 @@ class Event(object):
                 return
 
         # Build path to be used by simulator, and save the corresponding File
-        newpath = ("@fdref:%d@appref:%s@" % (oldfd, self.getActor().uid()))
+        newpath = self._fdRef(oldfd)
         self.setDataSyscallFD(newfd, newpath, FD_OPEN)
 
         self.evflags |= EventFileFlags.read
         self.setDataSyscallFile(newpath)
 
+    # Parsers for each supported system call, keyed by system call name
+    syscallParsers = dict()
+    # Variants of the open() system call
+    syscallParsers.update(dict.fromkeys(('creat', 'open', 'openat', 'open64',
+                                         'openat64', 'mkdir', 'mkdirat'),
+                                        parsePOSIXOpen))
+    # Variants of the fopen() system calls
+    syscallParsers.update(dict.fromkeys(('fopen', 'freopen'), parsePOSIXFopen))
+    # Variants of the fdopen() system calls
+    syscallParsers.update(dict.fromkeys(('fdopen',), parsePOSIXFDopen))
+    # Variants of the fdopendir() system calls
+    syscallParsers.update(dict.fromkeys(('fdopendir',), parsePOSIXFDopendir))
+    # folder opening
+    syscallParsers.update(dict.fromkeys(('opendir',), parsePOSIXOpendir))
+    # file deletion
+    syscallParsers.update(dict.fromkeys(('unlink', 'remove', 'rmdir'),
+                                        parsePOSIXUnlink))
+    # file descriptor closing
+    syscallParsers.update(dict.fromkeys(('close', 'fclose', 'closedir'),
+                                        parsePOSIXClose))
+    # file renaming
+    syscallParsers.update(dict.fromkeys(('rename', 'renameat', 'renameat2'),
+                                        parsePOSIXRename))
+    # file description duplication
+    syscallParsers.update(dict.fromkeys(('dup', 'dup2', 'dup3'),
+                                        parsePOSIXDup))
+
     def parseSyscall(self, syscallStr: str):
         """Process a system call string to initialise this Event."""
 
@@ -832,34 +934,10 @@ class Event(object):
         syscall = syscallStr[:sep] if sep else syscallStr
         content = syscallStr[sep+1:] if sep else ''
 
-        # Variants of the open() system call
-        if syscall in ('creat', 'open', 'openat',
-                       'open64', 'openat64', 'mkdir', 'mkdirat'):
-            self.parsePOSIXOpen(syscall, content)
-        # Variants of the fopen() system calls
-        elif syscall in ('fopen', 'freopen'):
-            self.parsePOSIXFopen(syscall, content)
-        # Variants of the fdopen() system calls
-        elif syscall in ('fdopen',):
-            self.parsePOSIXFDopen(syscall, content)
-        # Variants of the fdopendir() system calls
-        elif syscall in ('fdopendir',):
-            self.parsePOSIXFDopendir(syscall, content)
-        # folder opening
-        elif syscall in ('opendir',):
-            self.parsePOSIXOpendir(syscall, content)
-        # file deletion
-        elif syscall in ('unlink', 'remove', 'rmdir'):
-            self.parsePOSIXUnlink(syscall, content)
-        # file descriptor closing
-        elif syscall in ('close', 'fclose', 'closedir'):
-            self.parsePOSIXClose(syscall, content)
-        # file renaming
-        elif syscall in ('rename', 'renameat', 'renameat2', ):
-            self.parsePOSIXRename(syscall, content)
-        # file description duplication
-        elif syscall in ('dup', 'dup2', 'dup3', ):
-            self.parsePOSIXDup(syscall, content)
+        # Dispatch to the parser of this system call's family
+        parser = Event.syscallParsers.get(syscall)
+        if parser:
+            parser(self, syscall, content)
         else:
             # TODO continue
             self.markInvalid()
@@ -89,8 +89,23 @@ class EventStore(object):
             targetb += 1
         self.store.insert(targetb, event)
 
+    def merge(self, streams: list):
+        """Merge lists of Events sorted by timestamp into the store.
+
+        The store remains sorted, and is identical to the one obtained by
+        appending each list and then sorting the store. Python's sort detects
+        the sorted runs formed by each list and merges them, which costs
+        O(n log k) for k lists, and runs faster than a heapq.merge().
+        """
+        for stream in streams:
+            self.store.extend(stream)
+        self.store.sort(key=lambda x: x.time)
+        self._sorted = True
+
     def sort(self):
-        """Sort all the inserted Events by timestamp."""
+        """Sort all the inserted Events by timestamp, unless already sorted."""
+        if self._sorted:
+            return
         self.store = sorted(self.store, key=lambda x: x.time)
         self._sorted = True
 
@@ -376,19 +391,14 @@ class EventStore(object):
 
         return newFiles
 
-    def simulateAllEvents(self):
-        """Simulate all events to instantiate Files in the FileStore."""
-        if not self._sorted:
-            self.sort()
-
-        fileStore = FileStore.get()
-        fileFactory = FileFactory.get()
+    def indexDesignation(self, events):
+        """Add the acts of designation among :events: to the DesignationCache.
 
-        # First, parse for Zeitgeist designation events in order to instantiate
-        # the designation cache.
-        if debugEnabled():
-            print("Instantiating Zeitgeist acts of designation...")
-        for event in self.store:
+        Events loaded with --lazy-events are system calls, which are never acts
+        of designation. They have no flags until they are parsed, and are
+        skipped.
+        """
+        for event in events:
             if event.isInvalid():
                 continue
 
@@ -402,55 +412,124 @@ class EventStore(object):
             elif event.getFileFlags() & EventFileFlags.designationcache:
                 self.desigcache.addItem(event)
 
+    def simulateEvent(self,
+                      event: Event,
+                      fileFactory: FileFactory,
+                      fileStore: FileStore):
+        """Simulate a single Event, parsing it first if it was loaded lazily.
+
+        Return True if the Event was parsed by this call.
+        """
+        parsed = event.parse()
+        if event.isInvalid():
+            return parsed
+
+        # Designation events are already processed.
+        if event.getFileFlags() & EventFileFlags.designationcache:
+            return parsed
+
         if debugEnabled():
-            print("Done. Starting simulation...")
-        # Then, dispatch each event to the appropriate handler
-        for event in self.store:
-            if event.isInvalid():
-                continue
+            print("Simulating Event %s from %s at time %s." % (
+                event.evflags, event.actor.uid(), time2Str(event.time)))
 
-            # Designation events are already processed.
-            if event.getFileFlags() & EventFileFlags.designationcache:
-                continue
+        for data in event.data_app:
+            if data[2] == FD_OPEN:
+                event.actor.openFD(data[0], data[1], event.time)
+            elif data[2] == FD_CLOSE:
+                event.actor.closeFD(data[0], event.time)
 
-            if debugEnabled():
-                print("Simulating Event %s from %s at time %s." % (
-                    event.evflags, event.actor.uid(), time2Str(event.time)))
+        if event.getFileFlags() & EventFileFlags.destroy:
+            res = self.simulateDestroy(event, fileFactory, fileStore)
 
-            for data in event.data_app:
-                if data[2] == FD_OPEN:
-                    event.actor.openFD(data[0], data[1], event.time)
-                elif data[2] == FD_CLOSE:
-                    event.actor.closeFD(data[0], event.time)
+        elif event.getFileFlags() & EventFileFlags.create:
+            res = self.simulateCreate(event, fileFactory, fileStore)
 
-            if event.getFileFlags() & EventFileFlags.destroy:
-                res = self.simulateDestroy(event, fileFactory, fileStore)
+        elif event.getFileFlags() & EventFileFlags.overwrite:
+            res = self.simulateCreate(event, fileFactory, fileStore)
 
-            elif event.getFileFlags() & EventFileFlags.create:
-                res = self.simulateCreate(event, fileFactory, fileStore)
+            # We received a list of files that were created
+            if isinstance(res, list):
+                pass
+            # We received instructions to hot-patch the event list
+            else:
+                raise NotImplementedError  # TODO
 
-            elif event.getFileFlags() & EventFileFlags.overwrite:
-                res = self.simulateCreate(event, fileFactory, fileStore)
+        elif event.getFileFlags() & (EventFileFlags.read |
+                                     EventFileFlags.write):
+            self.simulateAccess(event, fileFactory, fileStore)
 
-                # We received a list of files that were created
-                if isinstance(res, list):
-                    pass
-                # We received instructions to hot-patch the event list
-                else:
-                    raise NotImplementedError  # TODO
-
-            elif event.getFileFlags() & (EventFileFlags.read |
-                                         EventFileFlags.write):
-                self.simulateAccess(event, fileFactory, fileStore)
-
-            # Keep me last, or use elif guards: I WILL change your event flags!
-            elif event.getFileFlags() & EventFileFlags.move or \
-                    event.getFileFlags() & EventFileFlags.copy:
-                res = self.simulateCopy(event,
-                                        fileFactory,
-                                        fileStore,
-                                        keepOld=event.getFileFlags() &
-                                        EventFileFlags.copy)
+        # Keep me last, or use elif guards: I WILL change your event flags!
+        elif event.getFileFlags() & EventFileFlags.move or \
+                event.getFileFlags() & EventFileFlags.copy:
+            res = self.simulateCopy(event,
+                                    fileFactory,
+                                    fileStore,
+                                    keepOld=event.getFileFlags() &
+                                    EventFileFlags.copy)
+
+        return parsed
+
+    def simulateAllEvents(self, streaming: bool=False):
+        """Simulate all events to instantiate Files in the FileStore.
+
+        Events loaded with --lazy-events that turn out to be invalid or
+        excluded are dropped from the store as soon as they are parsed. Other
+        Events are kept. If simulating an Event raises, the Events not
+        simulated yet are left in the store, after those already simulated.
+
+        If :streaming: is True, each Event is released once it is simulated,
+        and the store is empty afterwards. The acts of designation found in
+        the Events are released as well. If simulating an Event raises, the
+        store is left with that Event and the ones after it, which were not
+        simulated yet, and the acts of designation are kept.
+        """
+        if not self._sorted:
+            self.sort()
+
+        fileStore = FileStore.get()
+        fileFactory = FileFactory.get()
+
+        # First, parse for Zeitgeist designation events in order to instantiate
+        # the designation cache.
+        if debugEnabled():
+            print("Instantiating Zeitgeist acts of designation...")
+        self.indexDesignation(self.store)
+
+        if debugEnabled():
+            print("Done. Starting simulation...")
+        # Then, dispatch each event to the appropriate handler
+        if streaming:
+            # Each Event is dropped from the store before it is simulated, so
+            # it can be freed as soon as the simulation no longer needs it.
+            events = self.store
+            self.store = list()
+            for idx in range(len(events)):
+                event = events[idx]
+                events[idx] = None
+                try:
+                    self.simulateEvent(event, fileFactory, fileStore)
+                except BaseException:
+                    events[idx] = event
+                    self.store = events[idx:]
+                    raise
+            self.desigcache = DesignationCache()
+        else:
+            # Lazily loaded Events that turn out to be invalid are dropped as
+            # soon as they are parsed, by moving the kept Events down.
+            store = self.store
+            kept = 0
+            try:
+                for (idx, event) in enumerate(store):
+                    if self.simulateEvent(event, fileFactory, fileStore) and \
+                            event.isInvalid():
+                        continue
+                    store[kept] = event
+                    kept += 1
+            except BaseException:
+                # Keep the Events that were not simulated yet after the others.
+                del store[kept:idx]
+                raise
+            del store[kept:]
 
         # Filter out invalid file descriptor references before computing stats.
         fileStore.purgeFDReferences()
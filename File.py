@@ -1,9 +1,11 @@
 """Modelling the lifecycle of UNIX files."""
+from array import array
 from os.path import dirname
 from Application import Application
 from flags import Flags
 from utils import time2Str
 import mimetypes
+import sys
 
 
 class EventFileFlags(Flags):
@@ -59,6 +61,8 @@ class EventFileFlags(Flags):
 class FileAccess(object):
     """Something to hold info on who accessed a File."""
 
+    __slots__ = ('actor', 'time', 'evflags')
+
     def __init__(self,
                  actor: Application,
                  time: int,
@@ -67,7 +71,27 @@ class FileAccess(object):
         super(FileAccess, self).__init__()
         self.actor = actor
         self.time = time
-        self.evflags = EventFileFlags(evflags)
+        self.evflags = evflags if isinstance(evflags, EventFileFlags) else \
+            EventFileFlags(evflags)
+
+    _flagsCache = dict()  # type: dict; EventFileFlags for each int value.
+
+    @staticmethod
+    def flagsFromInt(value: int):
+        """Return the EventFileFlags matching an int, shared across calls."""
+        flags = FileAccess._flagsCache.get(value)
+        if flags is None:
+            flags = FileAccess._flagsCache[value] = EventFileFlags(value)
+        return flags
+
+    @staticmethod
+    def _make(actor: Application, time: int, evflags: EventFileFlags):
+        """Make a FileAccess without converting its flags again."""
+        acc = FileAccess.__new__(FileAccess)
+        acc.actor = actor
+        acc.time = time
+        acc.evflags = evflags
+        return acc
 
     def __str__(self):
         """Human-readable version of the FileAccess."""
@@ -131,6 +155,8 @@ class FileAccess(object):
 class FileCopy(object):
     """Something to hold info on a File's previous or next version."""
 
+    __slots__ = ('inode', 'time', 'copytype')
+
     def __init__(self,
                  inode: int,
                  time: int,
@@ -148,9 +174,11 @@ class FileCopy(object):
 class FileStub(object):
     """A stub for a future File, only the path and type of which are known."""
 
+    __slots__ = ('path', 'ftype')
+
     def __init__(self, path: str, ftype: str=None):
         """Construct a FileStub."""
-        self.path = path
+        self.path = sys.intern(path) if path else path
         self.ftype = ftype
 
 
@@ -162,14 +190,19 @@ class File(object):
     their name + tstart + tend. When a file is renamed, a new File is created.
     """
 
-    inode = 0  # type: int; global inode counter used for inode allocation.
+    __slots__ = ('inode', 'path', 'pred', 'follow', 'tstart', 'tend', 'ftype',
+                 '_accActors', '_accTimes', '_accFlags', '_accObjs',
+                 'accessCosts',
+                 '_isFolder', '_isHidden', '_inHiddenFolder')
+
+    lastInode = 0  # type: int; global counter used for inode allocation.
     _namecache = dict()
 
     @staticmethod
     def __allocInode(file):
         """Get an inode number allocated to a new File object."""
-        File.inode += 1
-        file.inode = File.inode
+        File.lastInode += 1
+        file.inode = File.lastInode
 
     def __eq__(self, other: 'File'):
         """Override the default Equals behavior"""
@@ -206,7 +239,7 @@ class File(object):
 
         File.__allocInode(self)
 
-        self.path = path
+        self.path = sys.intern(path)
         self.pred = None
         self.follow = []
         # self.links = []
@@ -219,7 +252,10 @@ class File(object):
         else:
             self.ftype = None
             self.guessType()
-        self.accesses = []
+        self._accActors = array('L')  # type: array; iid of each actor.
+        self._accTimes = array('q')   # type: array; time of each access.
+        self._accFlags = array('L')   # type: array; int EventFileFlags.
+        self._accObjs = None          # type: list; FileAccess objects.
         self.accessCosts = dict()
         self._isFolder = None
         self._isHidden = None
@@ -238,7 +274,7 @@ class File(object):
             return None
 
         if path not in File._namecache:
-            parentPath = dirname(path)
+            parentPath = sys.intern(dirname(path))
             File._namecache[path] = parentPath if path != parentPath else None
 
         return File._namecache[path]
@@ -453,29 +489,64 @@ class File(object):
 
     def addAccess(self, actor: Application, time: int, flags: EventFileFlags):
         """Record an access event for this File."""
-        acc = FileAccess(actor, time, flags)
-        self.accesses.append(acc)
+        iid = actor.iid()
+        if Application.idApps.get(iid) is not actor:
+            Application.idApps[iid] = actor
+        self._accActors.append(iid)
+        self._accTimes.append(time)
+        self._accFlags.append(int(flags))
+        self._accObjs = None
+
+    def _getAccessObjects(self):
+        """Return the FileAccess objects of this File, made on first use.
+
+        Accesses are stored as columns of actor ids, times and int flags while
+        Events are simulated. They are only turned into FileAccess objects
+        when first read, and those are kept until the next access is added.
+        """
+        if self._accObjs is None:
+            apps = Application.idApps
+            flags = FileAccess.flagsFromInt
+            self._accObjs = [FileAccess._make(apps[iid], time, flags(value))
+                             for (iid, time, value) in zip(self._accActors,
+                                                           self._accTimes,
+                                                           self._accFlags)]
+        return self._accObjs
+
+    @property
+    def accesses(self):
+        """The list of acts of access on this File."""
+        return self._getAccessObjects()
 
     def hasAccesses(self):
         """Tell whether a File has had any accesses at all."""
-        return False if not self.accesses else True
+        return False if not self._accTimes else True
+
+    def getAccesses(self, flags: EventFileFlags=None, after: int=None):
+        """Get the acts of access on this File.
+
+        Only the accesses that match :flags:, and that occurred strictly after
+        :after: if given, are returned. Filters are applied on the int columns
+        of times and flags.
+        """
+        objs = self._getAccessObjects()
+        mask = int(flags) if flags else 0
+        if not mask and after is None:
+            return iter(objs)
 
-    def getAccesses(self, flags: EventFileFlags=None):
-        """Get the acts of access on this File."""
-        for access in self.accesses:
-            if (not flags) or (access.evflags & flags):
-                yield access
+        return (acc for (acc, time, value) in zip(objs,
+                                                  self._accTimes,
+                                                  self._accFlags)
+                if (not mask or value & mask) and
+                (after is None or time > after))
 
     def getAccessCount(self, flags: EventFileFlags=None):
         """Get the number of acts of access on this File."""
         if not flags:
-            return len(self.accesses)
+            return len(self._accFlags)
 
-        cnt = 0
-        for access in self.accesses:
-            if access.evflags & flags:
-                cnt += 1
-        return cnt
+        mask = int(flags)
+        return sum(1 for value in self._accFlags if value & mask)
 
     def clearAccessCosts(self):
         """Remove any past access costs that were recorded."""
@@ -557,5 +628,5 @@ class File(object):
         print("FILE %d@%s" % (self.inode, self.path), file=out)
         print("CREATED %d" % self.tstart, file=out)
         print("DELETED %d" % self.tend, file=out)
-        for a in self.accesses:
+        for a in self.getAccesses():
             print("*%s|%d|%s" % (a.actor.uid(), a.time, a.evflags), file=out)
@@ -31,30 +31,48 @@ class FileFactory(object):
         self.fileStore = fileStore
         self.appStore = appStore
         self._fileList = list()   # type: list
+        self._knownFolders = dict()  # type: dict
 
     def getFileLinks(self, reset: bool=False):
         """Return a list of all file pairs that are linked to one another."""
         if not self._fileList or reset:
             self._fileList = dict()
-            for file in self.fileStore:
+            for file in self.fileStore.iterUnsorted():
                 pred = file.getPredecessor()
                 if pred:
                     self._fileList[pred] = file.inode
 
         return self._fileList
 
+    def __isKnownFolder(self, path: str, time: int):
+        """Tell if a folder and all its ancestors were already initialised.
+
+        Folders are remembered when they are initialised as the parent of a
+        File, after their own parent. Deleting a folder deletes its children
+        and forgets it, so the ancestors of a remembered folder that is still
+        alive are alive too, and only the folder itself needs checking. As
+        long as it has not been deleted or moved, initialising it and its
+        ancestors again would have no effect.
+        """
+        folder = self._knownFolders.get(path)
+        return folder is not None and folder.path == path and \
+            not folder.getTimeOfEnd() and folder.getTimeOfStart() <= time
+
     def __getFile(self, name: str, time: int, ftype: str=''):
         """Internal implementation of getFile()."""
         # Ensure the parent folder is initialised
         parentPath = File.getParentNameFromName(name)
-        if parentPath:
-            self.getFile(parentPath, time, ftype='inode/directory')
+        if parentPath and not self.__isKnownFolder(parentPath, time):
+            parent = self.getFile(parentPath, time, ftype='inode/directory')
+            if not parentPath.startswith("@fdref"):
+                self._knownFolders[parentPath] = parent
 
         files = self.fileStore.getFilesForName(name)
-        prevTend = 0
-        for file in files:
+        index = self.fileStore.getVersionIndex(name, time)
+        prevTend = files[index-1].getTimeOfEnd() if index else 0
+        if index < len(files):
+            file = files[index]
             tstart = file.getTimeOfStart()
-            tend = file.getTimeOfEnd()
 
             # Current file is invalid, as it's been created after our time.
             # We must make our own file, which pre-existed. Note that since
@@ -69,16 +87,11 @@ class FileFactory(object):
                 f = File(path=name, tstart=prevTend, tend=tstart, ftype=ftype)
                 self.fileStore.addFile(f)
                 return file
-            # Current file is valid as it has not ended yet
-            elif not tend:
-                return file
-            # If current file has an end, ensure it is after the time we target
-            # or it is equal (useful for when referring to the deletion event
-            # itself).
-            elif tend >= time:
+            # Otherwise, the current file has not ended yet, or it ends after
+            # the time we target or on it (useful for when referring to the
+            # deletion event itself).
+            else:
                 return file
-
-            prevTend = tend
         else:
             # Make a new file starting where the last one ended, and not ending
             f = File(path=name, tstart=prevTend, tend=0, ftype=ftype)
@@ -130,7 +143,7 @@ class FileFactory(object):
             # If the File had been stored under its ref, we must update it
             if oldFile:
                 oldPath = oldFile.path
-                oldFile.path = resolved
+                oldFile.path = sys.intern(resolved)
                 self.fileStore.updateFile(oldFile, oldName=oldPath)
                 return oldFile
             # Else we create a new File, as usual
@@ -151,14 +164,9 @@ class FileFactory(object):
             name = name[:-1]
 
         files = self.fileStore.getFilesForName(name)
-        for file in files:
-            tstart = file.getTimeOfStart()
-            tend = file.getTimeOfEnd()
-
-            if time < tstart:
-                return None
-            elif not tend or tend >= time:
-                return file
+        index = self.fileStore.getVersionIndex(name, time)
+        if index < len(files) and time >= files[index].getTimeOfStart():
+            return files[index]
         else:
             return None
 
@@ -177,6 +185,8 @@ class FileFactory(object):
         if file.isFolder():
             for child in self.fileStore.getChildren(file, time):
                 self.deleteFile(child, deleter, time, evflags)
+            if self._knownFolders.get(file.path) is file:
+                del self._knownFolders[file.path]
 
         # Record access on file
         file.addAccess(actor=deleter, flags=evflags, time=time)
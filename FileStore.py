@@ -1,11 +1,25 @@
 """Service to store File instances."""
 from File import File, EventFileFlags
 from utils import time2Str, debugEnabled
+from bisect import bisect_left
 import os
 import shutil
 import sys
 
 
+def _versionEnd(file: File):
+    """Return the time of end of a File version, or infinity if it exists."""
+    return file.getTimeOfEnd() or float("inf")
+
+
+def _versionsInOrder(prev: File, file: File):
+    """Tell if :file: can follow :prev: in a bisectable list of versions."""
+    tend = file.getTimeOfEnd()
+    if tend and tend < file.getTimeOfStart():
+        return False
+    return prev is None or _versionEnd(prev) <= _versionEnd(file)
+
+
 class FileStore(object):
     """A service to store File instances."""
     __file_store = None
@@ -31,15 +45,26 @@ class FileStore(object):
         return len(self.inodeStore)
 
     def __iter__(self):
-        """Iterate over all Files."""
-        for name in sorted(self.nameStore):
+        """Iterate over all Files, sorted by name."""
+        if self._sortedNames is None:
+            self._sortedNames = sorted(self.nameStore)
+        for name in self._sortedNames:
             for f in self.nameStore[name]:
                 yield f
 
+    def iterUnsorted(self):
+        """Iterate over all Files, in no particular order."""
+        for files in self.nameStore.values():
+            yield from files
+
     def clear(self):
         """Empty the FileStore."""
         self.nameStore = dict()   # type: dict
         self.inodeStore = dict()  # type: dict
+        self._sortedNames = None  # type: list
+        self._childNames = dict()  # type: dict
+        self._positions = dict()  # type: dict
+        self._unorderedNames = set()  # type: set
 
     def getChildren(self, f: File, time: int):
         """Get a File's direct children."""
@@ -48,21 +73,26 @@ class FileStore(object):
     def getChildrenFromPath(self, path: str, time: int):
         """Get the Files whose direct parent is :path:."""
         children = []
-        for item in [k for k in self.nameStore.items()
-                     if k[0].startswith(path)]:
-            # Only direct children
-            if item[0][len(path)+1:].find('/') == -1:
-                    for file in item[1]:
-                        tstart = file.getTimeOfStart()
-                        tend = file.getTimeOfEnd()
-
-                        if time != -1 and time < tstart:
-                            break
-                        elif not tend or tend >= time:
-                            children.append(file)
-                            break
+        for name in self._childNames.get(path, ()):
+            for file in self.nameStore[name]:
+                tstart = file.getTimeOfStart()
+                tend = file.getTimeOfEnd()
+
+                if time != -1 and time < tstart:
+                    break
+                elif not tend or tend >= time:
+                    children.append(file)
+                    break
         return children
 
+    def _indexName(self, name: str):
+        """Record a new name in the index of each folder's direct children."""
+        parent = name[:name.rfind('/')+1]
+        names = self._childNames.get(parent)
+        if names is None:
+            names = self._childNames[parent] = dict()
+        names[name] = None
+
     def printFiles(self,
                    showDeleted: bool=False,
                    showCreationTime: bool=False,
@@ -214,7 +244,7 @@ class FileStore(object):
     def getUserDocumentCount(self, userHome: str, allowHiddenFiles: bool=False):
         """Return the number of user documents in the FileStore."""
         count = 0
-        for f in self:
+        for f in self.iterUnsorted():
             if f.isUserDocument(userHome, allowHiddenFiles=allowHiddenFiles):
                 count += 1
         return count
@@ -226,6 +256,27 @@ class FileStore(object):
         except(KeyError) as e:
             return []
 
+    def getVersionIndex(self, name: str, time: int):
+        """Return the index of the first version of a name alive at a time.
+
+        Looks for the first File returned by getFilesForName(:name:) that has
+        not ended before :time:, or that starts after :time:. Returns the count
+        of versions if all of them ended before :time:. Versions are searched
+        by bisection, unless a name's versions are not ordered by time.
+        """
+        files = self.nameStore.get(name)
+        if not files:
+            return 0
+
+        if name not in self._unorderedNames:
+            return bisect_left(files, time, key=_versionEnd)
+
+        for (index, file) in enumerate(files):
+            tend = file.getTimeOfEnd()
+            if time < file.getTimeOfStart() or not tend or tend >= time:
+                return index
+        return len(files)
+
     def getFile(self, inode: int):
         """Return the File identified by an inode."""
         try:
@@ -235,22 +286,32 @@ class FileStore(object):
 
     def updateFile(self, file: File, oldName: str=None):
         """Add a File to the FileStore."""
-        filesWithName = self.getFilesForName(oldName or file.getName())
+        name = oldName or file.getName()
+        filesWithName = self.getFilesForName(name)
 
-        for (index, old) in enumerate(filesWithName):
-            if old.inode == file.inode:
-                if not oldName:
-                    filesWithName[index] = file
-                    break
-                else:
-                    del filesWithName[index]
-                    self.addFile(file)
-                    break
-        else:
+        index = self._positions.get(file.inode)
+        if index is None or index >= len(filesWithName) or \
+                filesWithName[index].inode != file.inode:
             raise ArithmeticError("Attempted to update file '%s' (made on %s)"
                                   ", but it has not yet been added to the "
                                   "store." % (file, file.getTimeOfStart()))
 
+        if not oldName:
+            filesWithName[index] = file
+
+            # Times may have changed, so check the order of versions again
+            prev = filesWithName[index-1] if index else None
+            follow = filesWithName[index+1] \
+                if index+1 < len(filesWithName) else None
+            if not _versionsInOrder(prev, file) or \
+                    (follow and not _versionsInOrder(file, follow)):
+                self._unorderedNames.add(name)
+        else:
+            del filesWithName[index]
+            for later in range(index, len(filesWithName)):
+                self._positions[filesWithName[later].inode] = later
+            self.addFile(file)
+
     def addFile(self, file: File):
         """Add a File to the FileStore."""
         name = file.getName()
@@ -261,8 +322,14 @@ class FileStore(object):
 
         # Empty case
         if len(filesWithName) == 0:
+            if name not in self.nameStore:
+                self._sortedNames = None
+                self._indexName(name)
             self.nameStore[name] = [file]
             self.inodeStore[file.inode] = file
+            self._positions[file.inode] = 0
+            if not _versionsInOrder(None, file):
+                self._unorderedNames.add(name)
             return
 
         # We must be the last for this name as the data must be sorted
@@ -273,6 +340,9 @@ class FileStore(object):
                                    name, tstart, lastFile.getTimeOfEnd()))
             return
         else:
+            if not _versionsInOrder(lastFile, file):
+                self._unorderedNames.add(name)
+            self._positions[file.inode] = len(filesWithName)
             filesWithName.append(file)
             self.nameStore[name] = filesWithName
             self.inodeStore[file.inode] = file
@@ -313,10 +383,15 @@ class FileStore(object):
 
         for name in dels:
             del self.nameStore[name]
+            del self._childNames[name[:name.rfind('/')+1]][name]
+            self._unorderedNames.discard(name)
+        if dels:
+            self._sortedNames = None
 
         for inode in delInodes:
             count += 1
             del self.inodeStore[inode]
+            del self._positions[inode]
 
         if debugEnabled():
             print("Info: purged %d unresolved file descriptor references." %
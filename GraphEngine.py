@@ -845,7 +845,7 @@ class GraphEngine(object):
         self.docCount = 0
         fileStore = FileStore.get()
         userConf = UserConfigLoader.get()
-        for f in fileStore:
+        for f in fileStore.iterUnsorted():
             if f.isUserDocument(userConf.getHomeDir(), allowHiddenFiles=True) \
                     and not f.isFolder():
 
@@ -0,0 +1,92 @@
+"""Saving and restoring the simulated file model."""
+from Application import Application
+from ApplicationStore import ApplicationStore
+from File import File
+from FileFactory import FileFactory
+from FileStore import FileStore
+from itertools import chain
+import os
+import pickle
+import sys
+import tempfile
+
+
+class ModelSnapshot(object):
+    """Save and restore the simulated file model.
+
+    Once all Events have been simulated, the FileStore, the ApplicationStore
+    and the links between Files are never modified again. ModelSnapshot saves
+    them to a file, so that policies can be scored over and over without
+    loading data files and simulating Events again.
+    """
+    version = 10
+
+    @staticmethod
+    def save(path: str, stats: dict=None):
+        """Save the simulated model and the loaders' :stats: to :path:."""
+        fileFactory = FileFactory.get()
+        fileFactory.getFileLinks()
+        snapshot = dict(version=ModelSnapshot.version,
+                        inode=File.lastInode,
+                        uidIds=Application.uidIds,
+                        idApps=Application.idApps,
+                        fileStore=FileStore.get().__dict__,
+                        appStore=ApplicationStore.get().__dict__,
+                        fileLinks=fileFactory._fileList,
+                        stats=stats or dict())
+
+        directory = os.path.dirname(os.path.abspath(path))
+        tmpPath = None
+        try:
+            (fd, tmpPath) = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpPath, path)
+        except(OSError, pickle.PicklingError) as e:
+            print("Error: the simulated model could not be saved to '%s': %s" %
+                  (path, str(e)),
+                  file=sys.stderr)
+            if tmpPath and os.path.exists(tmpPath):
+                os.remove(tmpPath)
+            return False
+
+        return True
+
+    @staticmethod
+    def load(path: str):
+        """Restore the simulated model saved at :path:.
+
+        The FileStore, ApplicationStore and FileFactory are replaced with the
+        saved ones. Return the loaders' stats that were saved with the model.
+        Raise a ValueError if the model cannot be read.
+        """
+        try:
+            with open(path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except(OSError, EOFError, TypeError, AttributeError,
+               pickle.UnpicklingError) as e:
+            raise ValueError("The simulated model at '%s' could not be read: "
+                             "%s" % (path, str(e)))
+
+        if not isinstance(snapshot, dict) or \
+                snapshot.get('version') != ModelSnapshot.version:
+            raise ValueError("The simulated model at '%s' was made by an "
+                             "incompatible version of the program." % path)
+
+        # Restore the stores in place, so references to them remain valid.
+        fileStore = FileStore.get()
+        fileStore.__dict__.clear()
+        fileStore.__dict__.update(snapshot['fileStore'])
+        appStore = ApplicationStore.get()
+        appStore.__dict__.clear()
+        appStore.__dict__.update(snapshot['appStore'])
+        FileFactory.reset()
+        FileFactory.get()._fileList = snapshot['fileLinks']
+        File.lastInode = max(File.lastInode, snapshot['inode'])
+        Application.clearIds()
+        Application.uidIds.update(snapshot['uidIds'])
+        Application.idApps.update(snapshot['idApps'])
+        for app in chain(appStore, Application.idApps.values()):
+            app._idGeneration = Application.idGeneration
+
+        return snapshot['stats']
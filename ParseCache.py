@@ -0,0 +1,85 @@
+"""An on-disk cache for the parsed contents of data files."""
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+
+class ParseCache(object):
+    """An on-disk cache for the parsed contents of data files.
+
+    ParseCache stores the results of parsing a data file (e.g. a PreloadLogger
+    log or the Zeitgeist database) in a directory, so that the next runs of
+    the program can skip parsing altogether. Entries are keyed by the path,
+    size and modification time of the parsed files, and are ignored as soon as
+    one of the files changes.
+    """
+    # Bump whenever the pickled types of cached entries change, e.g. when
+    # attributes are added to or removed from SqlEvent, so that old entries
+    # are ignored rather than loaded into objects that no longer fit them.
+    version = 2  # 2: __slots__ on SqlEvent and SqlEventSubject
+
+    def __init__(self, path: str):
+        """Construct a ParseCache storing its entries in :path:."""
+        super(ParseCache, self).__init__()
+        if not path:
+            raise ValueError("A ParseCache must have a valid directory.")
+        self.path = path
+        os.makedirs(self.path, exist_ok=True)
+
+    def getSignature(self, paths: list):
+        """Return the size and modification time of a list of files."""
+        sig = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except(OSError) as e:
+                sig.append((path, None, None))
+            else:
+                sig.append((path, st.st_size, st.st_mtime_ns))
+        return tuple(sig)
+
+    def _entryPath(self, kind: str, path: str):
+        """Return the path of the cache entry for a given file."""
+        key = "%s:%d:%s" % (kind, ParseCache.version, os.path.abspath(path))
+        return os.path.join(self.path,
+                            hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def load(self, kind: str, path: str, extraPaths: list=[]):
+        """Load the cached result of parsing :path:.
+
+        Return a (signature, data) tuple. data is None if :path: or one of the
+        :extraPaths: it depends upon has changed since it was last parsed. The
+        signature is to be passed to :save(): once the file has been parsed.
+        """
+        sig = self.getSignature([path] + extraPaths)
+        try:
+            with open(self._entryPath(kind, path), 'rb') as f:
+                (cachedSig, data) = pickle.load(f)
+        except(FileNotFoundError) as e:
+            return (sig, None)
+        except(OSError, EOFError, ValueError, TypeError, AttributeError,
+               pickle.UnpicklingError) as e:
+            print("Warning: cache entry for '%s' could not be read: %s" % (
+                   path, str(e)),
+                  file=sys.stderr)
+            return (sig, None)
+
+        return (sig, data if cachedSig == sig else None)
+
+    def save(self, kind: str, path: str, sig: tuple, data):
+        """Save the result of parsing :path:, made when it had :sig:."""
+        entryPath = self._entryPath(kind, path)
+        tmpPath = None
+        try:
+            (fd, tmpPath) = tempfile.mkstemp(dir=self.path)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((sig, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpPath, entryPath)
+        except(OSError, pickle.PicklingError) as e:
+            print("Warning: cache entry for '%s' could not be saved: %s" % (
+                   path, str(e)),
+                  file=sys.stderr)
+            if tmpPath and os.path.exists(tmpPath):
+                os.remove(tmpPath)
@@ -227,7 +227,7 @@ class FolderPolicy(Policy):
         """Record that data has been previously accessed by an app."""
         if not data:
             return
-        key = app.desktopid if self.appWideRecords() else app.uid()
+        key = app.desktopid if self.appWideRecords() else app.iid()
         s = cache.get(key) or set()
         s.add(data)
         cache[key] = s
@@ -236,7 +236,7 @@ class FolderPolicy(Policy):
         """Tell if data has been previously accessed by an app."""
         if not data:
             return False
-        s = cache.get(app.desktopid if self.appWideRecords() else app.uid())
+        s = cache.get(app.desktopid if self.appWideRecords() else app.iid())
         return data in s if s else False
 
     def _allowedByPolicy(self, f: File, app: Application):
@@ -262,7 +262,7 @@ class OneFolderPolicy(FolderPolicy):
     def appHasFolderCached(self, app: Application):
         """Tell if a folder has been previously accessed by an app."""
         s = self.desigCache.get(app.desktopid if self.appWideRecords() else
-                                app.uid())
+                                app.iid())
         return s is not None
 
     def _uaccFunCondDesignation(self,
@@ -468,7 +468,7 @@ class LibraryFolderPolicy(DistantFolderPolicy):
         """Record that data has been previously accessed by an app."""
         if not data:
             return
-        key = app.desktopid if self.appWideRecords() else app.uid()
+        key = app.desktopid if self.appWideRecords() else app.iid()
         s = cache.get(key) or set()
         s.add(data)
         cache[key] = s
@@ -477,7 +477,7 @@ class LibraryFolderPolicy(DistantFolderPolicy):
         """Tell if data has been previously accessed by an app."""
         if not data:
             return False
-        s = cache.get(app.desktopid if self.appWideRecords() else app.uid())
+        s = cache.get(app.desktopid if self.appWideRecords() else app.iid())
         return data in s if s else False
 
     def _allowedByPolicy(self, f: File, app: Application):
@@ -871,13 +871,13 @@ class StickyBitPolicy(Policy):
 
     def addCreatedFile(self, f: File, app: Application):
         """Record that a file was created by an app."""
-        s = self.created.get(app.uid()) or set()
+        s = self.created.get(app.iid()) or set()
         s.add(f)
-        self.created[app.uid()] = s
+        self.created[app.iid()] = s
 
     def wasCreatedBy(self, f: File, app: Application):
         """Return True of :app: is known to have created :f:, else False."""
-        return f in (self.created.get(app.uid()) or set())
+        return f in (self.created.get(app.iid()) or set())
 
     def updateDesignationState(self, f: File, acc: FileAccess, data=None):
         """Blob for policies to update their state on DESIGNATION_ACCESS."""
@@ -1083,7 +1083,7 @@ class ExclusionPolicy(Policy):
         if not acc.evflags & EventFileFlags.designation:
             return False
 
-        key = acc.actor.desktopid if self.appWideRecords() else acc.actor.uid()
+        key = acc.actor.desktopid if self.appWideRecords() else acc.actor.iid()
         data = data or self._match(f)
 
         if key in self.currentPath:
@@ -1097,7 +1097,7 @@ class ExclusionPolicy(Policy):
     def _allowedByPolicy(self, file: File, actor: Application):
         """Tell if a File is allowed to be accessed by a Policy."""
         data = self._match(file)
-        key = actor.desktopid if self.appWideRecords() else actor.uid()
+        key = actor.desktopid if self.appWideRecords() else actor.iid()
 
         # The list is not set yet.
         if key not in self.currentPath:
@@ -1112,7 +1112,7 @@ class ExclusionPolicy(Policy):
         if data is None:
             data = self._match(f)
 
-        key = acc.actor.desktopid if self.appWideRecords() else acc.actor.uid()
+        key = acc.actor.desktopid if self.appWideRecords() else acc.actor.iid()
         if key not in self.currentPath and data:
             self.currentPath[key] = data
 
@@ -1130,7 +1130,7 @@ class ExclusionPolicy(Policy):
         """Tell if data has been previously accessed by an app."""
         if data is None:
             return False
-        key = app.desktopid if self.appWideRecords() else app.uid()
+        key = app.desktopid if self.appWideRecords() else app.iid()
         s = self.illegalCache.get(key)
         return data in s if s else False
 
@@ -1148,7 +1148,7 @@ class ExclusionPolicy(Policy):
         """Record that data has been previously accessed by an app."""
         if not data:
             return
-        key = app.desktopid if self.appWideRecords() else app.uid()
+        key = app.desktopid if self.appWideRecords() else app.iid()
         s = self.illegalCache.get(key) or set()
         s.add(data)
         self.illegalCache[key] = s
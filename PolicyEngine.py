@@ -1197,7 +1197,7 @@ class PolicyEngine(object):
                 self.illegalAppStore[acc.actor.desktopid] = t
 
         # Clean up files for the next policy run, and clear up some RAM.
-        for file in self.fileStore:
+        for file in self.fileStore.iterUnsorted():
             file.clearAccessCosts()
         del accesses
 
@@ -1,18 +1,24 @@
 import sys
 import os
 import re
+import gzip
+import lzma
+import zlib
+from functools import partial
+from itertools import chain
+from multiprocessing import Pool
 from Application import Application
 from ApplicationStore import ApplicationStore
 from Event import Event
+from ParseCache import ParseCache
 from utils import space, pyre, bashre, pynamer, pyprocname, javare, javanamer, \
                   javaprocname, perlre, perlnamer, monore, mononamer, \
-                  monoprocname, phpre, phpnamer, phpprocname, debugEnabled, \
-                  tail
+                  monoprocname, phpre, phpnamer, phpprocname, debugEnabled
 
 
 class PreloadLoggerLoader(object):
     path = ""
-    pattern = re.compile("^\d{4}-\d{2}-\d{2}_\d+_\d+.log$")
+    pattern = re.compile("^\d{4}-\d{2}-\d{2}_\d+_\d+.log(\.gz|\.xz)?$")
     header = re.compile("^@(.*?)[|](\d+)[|](.*)$")
     syscall = re.compile("^(\d+)[|](.*)$")
     delpattern = None  # TODO
@@ -295,14 +301,301 @@ class PreloadLoggerLoader(object):
         """
         self.loadDb(store=None, checkInitialised=True)
 
+    def parseLogFile(self, file: str, debug: bool=False):
+        """Parse a single PreloadLogger log file.
+
+        Return a compact tuple made of a status string ('valid', 'empty',
+        'invalid', 'nosyscalls' or 'error'), the app identity found in the
+        header, the interpreter id, the timestamps of the first and last
+        system calls, the list of (timestamp, syscall) records and a list of
+        (message, toStderr) pairs to be printed by the caller. This method does
+        not touch any store, so it can be run in a worker process.
+        """
+        messages = []
+
+        # Process log files that match the PreloadLogger name pattern
+        try:
+            f = PreloadLoggerLoader.openLog(self.path + "/" + file)
+        except(IOError) as e:
+            messages.append(("Error: could not open file %s: %s" % (
+                              file,
+                              str(e)), True))
+            return ('error', None, None, 0, 0, None, messages)
+
+        with f:
+            # Parse the first line to get the identity of the app,
+            # but sometimes the header ends up on the second line
+            # in some logs... So, parse until we find a match, and
+            # keep the lines before the header to parse them later
+            lines = self._decodeLines(file, f, messages)
+            preHeader = []
+            result = None
+            for line in lines:
+                if line is not None:
+                    result = PreloadLoggerLoader.header.match(line)
+                    if result:
+                        break
+                preHeader.append(line)
+
+            # Files without any line are empty (logger crash)
+            if result is None and not preHeader:
+                messages.append(("Info: file '%s' is empty. Skipping." % file,
+                                 False))
+                return ('empty', None, None, 0, 0, None, messages)
+
+            # Files with a missing or corrupted header are invalid
+            if result is None:
+                messages.append(("%s is missing a header" % file, True))
+                return ('invalid', None, None, 0, 0, None, messages)
+
+            # Parse the header line, make sure it has the right length.
+            g = result.groups()
+            if (len(g) != 3):
+                messages.append(("%s has wrong group count: %s" % (
+                                  file,
+                                  result.group()), True))
+                return ('invalid', None, None, 0, 0, None, messages)
+
+            # Filter interpreters, and rewrite them to get the identity
+            # of the app they launched instead.
+            items = space.split(g[2])
+            interpreterid = None
+
+            # Python
+            if (pyre.match(g[0])):
+                interpreterid = g[0]
+                g = self.parsePython(g, items)
+                # print("PYTHON APP: %s" % g[2])
+
+            # Bash
+            if (bashre.match(g[0])):
+                interpreterid = g[0]
+                g = self.parseBash(g, items)
+                # print("BASH APP: %s" % g[2])
+
+            # Java
+            if (javare.match(g[0])):
+                interpreterid = g[0]
+                g = self.parseJava(g, items)
+                # print("JAVA APP: %s" % g[2])
+            # Perl
+            if (perlre.match(g[0])):
+                interpreterid = g[0]
+                g = self.parsePerl(g, items)
+                # print("PERL APP: %s" % g[2])
+
+            # Mono
+            if (monore.match(g[0])):
+                interpreterid = g[0]
+                g = self.parseMono(g, items)
+                # print("MONO APP: %s" % g[2])
+
+            # PHP
+            if (phpre.match(g[0])):
+                interpreterid = g[0]
+                g = self.parsePHP(g, items)
+                # print("PHP APP: %s" % g[2])
+
+            # Collect system calls in the same pass as the first and last
+            # timestamps. Lines found before the header are parsed first, and
+            # the header is replaced with None as it interrupts split lines.
+            tstart = None
+            syscalls = []
+            skipCache = None
+            currentCall = None
+            prevTimestamp = 0
+            timeDelta = 0
+            lastLine = None
+            for line in chain(preHeader, (None,), lines):
+                lastLine = line
+
+                # Ignore the header and lines that could not be decoded.
+                if line is None:
+                    skipCache = None
+                    continue
+
+                # Previous line did not end and was skipped, merge it.
+                if skipCache:
+                    line = skipCache + line
+                    skipCache = None
+
+                # Line continues...
+                if line.endswith('\\\n'):
+                    skipCache = line
+                    continue
+
+                # Get the first event's timestamp (convert to ZG millisec)
+                if tstart is None:
+                    result = PreloadLoggerLoader.syscall.match(
+                        line.rstrip("\n").lstrip(" "))
+                    if result is not None:
+                        tstart = int(result.group(1)) * 1000
+
+                line = line[:-1]  # Remove ending "\n"
+
+                # Line is a parameter to the last system call logged
+                if line.startswith(' '):
+                    if currentCall:
+                        currentCall = (currentCall[0],
+                                       currentCall[1] + '\n' + line)
+                    elif debug:
+                        messages.append(("%s has a corrupted line (no call): "
+                                         "%s" % (file, line), True))
+                    continue
+
+                # Check that line is a syntactically valid system call
+                result = PreloadLoggerLoader.syscall.match(line)
+                if result is None:
+                    if debug:
+                        messages.append(("%s has a corrupted line (match): "
+                                         "%s" % (file, line), True))
+                    continue
+
+                # Update the timestamp (convert to ZG millisec format)
+                h = result.groups()
+                timestamp = int(h[0]) * 1000
+
+                # Append the system call to our syscall list. Note that
+                # we do something odd with the timestamp: because PL
+                # only logs at second precision, a lot of system calls
+                # have the same timestamp, which causes the EventStore
+                # to sort them in the wrong order. So, every time we
+                # have a timestamp identical to the previous one, we
+                # increase a counter that sorts them. This works under
+                # the assumption that there are at most 1000 events per
+                # second.
+                if timestamp == prevTimestamp:
+                    timeDelta += 1
+                else:
+                    timeDelta = 0
+
+                # Store the last system call, it is complete now.
+                if currentCall:
+                    syscalls.append(currentCall)
+
+                # Create the new syscalls list.
+                currentCall = (timestamp + timeDelta, h[1])
+                prevTimestamp = timestamp
+
+        if tstart is None:
+            tstart = float("inf")
+
+        # The last line of the file gives the app's end time.
+        tend = 0
+        result = None
+        if lastLine:
+            result = PreloadLoggerLoader.syscall.match(lastLine)
+
+        if result is None:
+            if debug:
+                messages.append(("%s's last line is corrupted: %s" % (
+                                  file,
+                                  lastLine), True))
+        else:
+            # Update the timestamp (convert to ZG millisec format)
+            h = result.groups()
+            tend = int(h[0]) * 1000
+
+        # Check if the timestamps have been set
+        if tend == 0:
+            return ('nosyscalls', g, interpreterid, 0, 0, None, messages)
+
+        # Sometimes, short logs have event ordering problems... We
+        # can try to ignore these problems as all events are indi-
+        # vidually timestamped anyway.
+        if tstart > tend:
+            tend, start = tstart, tend
+
+        # TODO: process deletions and remove corresponding files
+
+        return ('valid', g, interpreterid, tstart, tend, syscalls, messages)
+
+    @staticmethod
+    def openLog(path: str):
+        """Open a log file for reading, decompressing .gz and .xz files."""
+        if path.endswith(".gz"):
+            return gzip.open(path, 'rb')
+        elif path.endswith(".xz"):
+            return lzma.open(path, 'rb')
+        else:
+            return open(path, 'rb')
+
+    def _decodeLines(self, file: str, f, messages: list):
+        """Yield the lines of :f: decoded from UTF-8, or None if invalid.
+
+        Compressed logs that are truncated or corrupted are read up to the
+        point where decompression fails.
+        """
+        try:
+            for binary in f:
+                try:
+                    line = binary.decode('utf-8')
+                except(UnicodeDecodeError) as e:
+                    messages.append(("Error: %s has a non utf-8 line: %s " % (
+                                      file,
+                                      str(e)), True))
+                    line = None
+                yield line
+        except(EOFError, OSError, zlib.error, lzma.LZMAError) as e:
+            messages.append(("Error: %s could not be entirely decompressed: "
+                             "%s" % (file, str(e)), True))
+
+    def parseLogFiles(self,
+                      files: list,
+                      jobs: int=1,
+                      cache: ParseCache=None,
+                      pool: Pool=None):
+        """Parse log files, yielding their results in the order of :files:.
+
+        When :jobs: is greater than 1, files are parsed in a pool of worker
+        processes. Results are still yielded in the order of :files:, so that
+        the Applications built out of them are identical to a serial run. If a
+        :cache: is given, files which have been parsed before are not parsed
+        again. If a :pool: is given, it is used instead of a new one, and left
+        running for the caller to terminate.
+        """
+        debug = debugEnabled()
+        parse = partial(self.parseLogFile, debug=debug)
+        kind = "pll-debug" if debug else "pll"
+
+        # Look for previously parsed files in the cache
+        cached = dict()
+        if cache:
+            for file in files:
+                cached[file] = cache.load(kind, self.path + "/" + file)
+        missing = [f for f in files if cached.get(f, (None, None))[1] is None]
+
+        ownPool = None
+        if pool is None and jobs > 1 and len(missing) > 1:
+            pool = ownPool = Pool(processes=min(jobs, len(missing)))
+        parsed = pool.imap(parse, missing) if pool else map(parse, missing)
+
+        try:
+            for file in files:
+                (sig, result) = cached.get(file, (None, None))
+                if result is None:
+                    result = next(parsed)
+                    if cache and result[0] != 'error':
+                        cache.save(kind, self.path + "/" + file, sig, result)
+                yield result
+        finally:
+            if ownPool:
+                ownPool.terminate()
+
     def loadDb(self,
                store: ApplicationStore = None,
-               checkInitialised: bool = False):
+               checkInitialised: bool = False,
+               jobs: int = 1,
+               cache: ParseCache = None,
+               pool: Pool = None):
         """Load the PreloadLogger database.
 
         Go through the directory and create all the relevant app instances and
         events. Can be made to insert all found apps into an ApplicationStore,
         or to exit if some Application instances are not properly initialised.
+        Log files are parsed in :jobs: worker processes, and then processed in
+        the order of their names. Parsed logs are kept in :cache:, if given.
+        Log files are parsed in :pool: instead, if given.
         """
 
         count = 0              # Counter of fetched files, for stats
@@ -316,329 +609,76 @@ class PreloadLoggerLoader(object):
         invalidApps = set()    # List of desktop IDs that could not be init'd
         eventCount = 0
 
-        # List all log files that match the PreloadLogger syntax
-        for file in os.listdir(self.path):
-            # Ignore files that don't match
-            if not PreloadLoggerLoader.pattern.match(file):
-                continue
+        # List all log files that match the PreloadLogger syntax, and ignore
+        # compressed logs which have already been extracted
+        names = set(f for f in os.listdir(self.path)
+                    if PreloadLoggerLoader.pattern.match(f))
+        files = sorted(f for f in names
+                       if not (f.endswith((".gz", ".xz")) and f[:-3] in names))
+        count = len(files)
 
-            count += 1
+        for result in self.parseLogFiles(files, jobs, cache, pool):
+            (status, g, interpreterid, tstart, tend, syscalls, msgs) = result
+
+            for (msg, toStderr) in msgs:
+                print(msg, file=sys.stderr if toStderr else sys.stdout)
+
+            if status == 'empty':
+                empties += 1
+                continue
+            elif status == 'invalid':
+                invalids += 1
+                continue
+            elif status == 'nosyscalls':
+                nosyscalls.append(g)
+                nosyscallactors.add(g[0])
+                continue
+            elif status != 'valid':
+                continue
 
-            # Process log files that match the PreloadLogger name pattern
+            # Make the application
             try:
-                f = open(self.path + "/" + file, 'rb')
-            except(IOError) as e:
-                print("Error: could not open file %s: %s" % (
-                       file,
-                       str(e)),
+                app = Application(desktopid=g[0],
+                                  pid=int(g[1]),
+                                  tstart=tstart,
+                                  tend=tend,
+                                  interpreterid=interpreterid)
+                app.setCommandLine(g[2])
+            except(ValueError) as e:
+                print("MISSING: %s" % g[0],
                       file=sys.stderr)
-            else:
-                with f:
-                    if os.fstat(f.fileno()).st_size == 0:
-                        print("Info: file '%s' is empty. Skipping." % file)
-                        continue
-
-                    # Parse the first line to get the identity of the app,
-                    # but sometimes the header ends up on the second line
-                    # in some logs... So, parse until we find a match, and
-                    # remember the line index of the header
-                    idx = 0
-                    headerLocation = 0
-                    result = None
-                    for binary in f:
-                        try:
-                            line = binary.decode('utf-8')
-                        except(UnicodeDecodeError) as e:
-                            print("Error: %s has a non utf-8 line: %s " % (
-                                   file,
-                                   str(e)),
-                                  file=sys.stderr)
-                            idx += 1
-                            continue
-                        result = PreloadLoggerLoader.header.match(line)
-                        if result:
-                            headerLocation = idx
-                            break
-                        idx += 1
-
-                    # Files with a missing or corrupted header are invalid
-                    if result is None:
-                        print("%s is missing a header" % file,
-                              file=sys.stderr)
-                        invalids += 1
-                        continue
-
-                    # Parse the header line, make sure it has the right length.
-                    g = result.groups()
-                    if (len(g) != 3):
-                        print("%s has wrong group count: " % file,
-                              result.group(),
-                              file=sys.stderr)
-                        invalids += 1
-                        continue
-
-                    # Filter interpreters, and rewrite them to get the identity
-                    # of the app they launched instead.
-                    items = space.split(g[2])
-                    interpreterid = None
-
-                    # Python
-                    if (pyre.match(g[0])):
-                        interpreterid = g[0]
-                        g = self.parsePython(g, items)
-                        # print("PYTHON APP: %s" % g[2])
-
-                    # Bash
-                    if (bashre.match(g[0])):
-                        interpreterid = g[0]
-                        g = self.parseBash(g, items)
-                        # print("BASH APP: %s" % g[2])
-
-                    # Java
-                    if (javare.match(g[0])):
-                        interpreterid = g[0]
-                        g = self.parseJava(g, items)
-                        # print("JAVA APP: %s" % g[2])
-                    # Perl
-                    if (perlre.match(g[0])):
-                        interpreterid = g[0]
-                        g = self.parsePerl(g, items)
-                        # print("PERL APP: %s" % g[2])
-
-                    # Mono
-                    if (monore.match(g[0])):
-                        interpreterid = g[0]
-                        g = self.parseMono(g, items)
-                        # print("MONO APP: %s" % g[2])
-
-                    # PHP
-                    if (phpre.match(g[0])):
-                        interpreterid = g[0]
-                        g = self.parsePHP(g, items)
-                        # print("PHP APP: %s" % g[2])
-
-                    # Get first and last event to calculate the timestamps.
-                    tstart = float("inf")
-                    tend = 0
+                hasErrors = True
+                invalidApps.add(g[0])
+                continue
 
-                    skipCache = None
-                    lineIdx = 0
-                    f.seek(0, 0)
-                    for binary in f:
-                        # Ignore the header.
-                        if lineIdx == headerLocation:
-                            lineIdx += 1
-                            skipCache = None
-                            continue
-
-                        # Decode line.
-                        try:
-                            line = binary.decode('utf-8')
-                        except(UnicodeDecodeError) as e:
-                            print("Error: %s has a non utf-8 line: %s " % (
-                                   file,
-                                   str(e)),
-                                  file=sys.stderr)
-                            lineIdx += 1
-                            skipCache = None
-                            continue
-
-                        # Previous line did not end and was skipped, merge it.
-                        if skipCache:
-                            line = skipCache + line
-                            skipCache = None
-
-                        # Line continues...
-                        if line.endswith('\\\n'):
-                            skipCache = line
-                            lineIdx += 1
-                            continue
-
-                        line = line.rstrip("\n").lstrip(" ")
-
-                        # Line is a parameter to the last system call logged
-                        if line.startswith(' '):
-                            lineIdx += 1
-                            continue
-
-                        # Check that line is a syntactically valid system call
-                        result = PreloadLoggerLoader.syscall.match(line)
-                        if result is None:
-                            if debugEnabled():
-                                print("%s has a corrupted line (match): %s" % (
-                                       file,
-                                       line),
-                                      file=sys.stderr)
-                            lineIdx += 1
-                            continue
-
-                        # Update the timestamp (convert to ZG millisec format)
-                        h = result.groups()
-                        tstart = int(h[0]) * 1000
-                        break
+            # Ignore study artefacts!
+            if app.isStudyApp():
+                continue
 
-                    # TODO, first non-header line + tail code.
-                    lastLine = tail(f)
-                    result = None
-                    if lastLine:
-                        result = PreloadLoggerLoader.syscall.match(lastLine)
-
-                    if result is None:
-                        if debugEnabled():
-                            print("%s's last line is corrupted: %s" % (
-                                   file,
-                                   lastLine),
-                                  file=sys.stderr)
-                    else:
-                        # Update the timestamp (convert to ZG millisec format)
-                        h = result.groups()
-                        tend = int(h[0]) * 1000
-
-                    # Check if the timestamps have been set
-                    if tend == 0:
-                        nosyscalls.append(g)
-                        nosyscallactors.add(g[0])
-                        continue
-
-                    # Sometimes, short logs have event ordering problems... We
-                    # can try to ignore these problems as all events are indi-
-                    # vidually timestamped anyway.
-                    if tstart > tend:
-                        tend, start = tstart, tend
-
-                    # TODO: process deletions and remove corresponding files
-
-                    # Make the application
-                    try:
-                        app = Application(desktopid=g[0],
-                                          pid=int(g[1]),
-                                          tstart=tstart,
-                                          tend=tend,
-                                          interpreterid=interpreterid)
-                        app.setCommandLine(g[2])
-                    except(ValueError) as e:
-                        print("MISSING: %s" % g[0],
-                              file=sys.stderr)
-                        hasErrors = True
-                        invalidApps.add(g[0])
-                        continue
-
-                    # Ignore study artefacts!
-                    if app.isStudyApp():
-                        continue
-
-                    # Add command-line event
-                    event = Event(actor=app, time=tstart, cmdlineStr=g[2])
-                    app.addEvent(event)
-
-                    # Add system call events
-                    skipCache = None
-                    lineIdx = 0
-                    currentCall = None
-                    prevTimestamp = 0
-                    timeDelta = 0
-                    f.seek(0, 0)
-                    for binary in f:
-                        # Ignore the header.
-                        if lineIdx == headerLocation:
-                            lineIdx += 1
-                            skipCache = None
-                            continue
-
-                        # Decode line.
-                        try:
-                            line = binary.decode('utf-8')
-                        except(UnicodeDecodeError) as e:
-                            print("Error: %s has a non utf-8 line: %s " % (
-                                   file,
-                                   str(e)),
-                                  file=sys.stderr)
-                            lineIdx += 1
-                            skipCache = None
-                            continue
-
-                        # Previous line did not end and was skipped, merge it.
-                        if skipCache:
-                            line = skipCache + line
-                            skipCache = None
-
-                        # Line continues...
-                        if line.endswith('\\\n'):
-                            skipCache = line
-                            lineIdx += 1
-                            continue
-
-                        line = line[:-1]  # Remove ending "\n"
-
-                        # Line is a parameter to the last system call logged
-                        if line.startswith(' '):
-                            if currentCall:
-                                currentCall = (currentCall[0],
-                                               currentCall[1] + '\n' + line)
-                            elif debugEnabled():
-                                print("%s has a corrupted line (no call): %s" %
-                                      (file, line),
-                                      file=sys.stderr)
-                            lineIdx += 1
-                            continue
-
-                        # Check that line is a syntactically valid system call
-                        result = PreloadLoggerLoader.syscall.match(line)
-                        if result is None:
-                            if debugEnabled():
-                                print("%s has a corrupted line (match): %s" % (
-                                       file,
-                                       line),
-                                      file=sys.stderr)
-                            lineIdx += 1
-                            continue
-
-                        # Update the timestamp (convert to ZG millisec format)
-                        h = result.groups()
-                        timestamp = int(h[0]) * 1000
-
-                        # Append the system call to our syscall list. Note that
-                        # we do something odd with the timestamp: because PL
-                        # only logs at second precision, a lot of system calls
-                        # have the same timestamp, which causes the EventStore
-                        # to sort them in the wrong order. So, every time we
-                        # have a timestamp identical to the previous one, we
-                        # increase a counter that sorts them. This works under
-                        # the assumption that there are at most 1000 events per
-                        # second.
-                        if timestamp == prevTimestamp:
-                            timeDelta += 1
-                        else:
-                            timeDelta = 0
-
-                        # Process the last system call into an Event, and clear
-                        # up the syscalls list to keep RAM free!
-                        if currentCall:
-                            event = Event(actor=app,
-                                          time=currentCall[0],
-                                          syscallStr=currentCall[1])
-                            app.addEvent(event)
-                            eventCount += 1
-
-                        # Create the new syscalls list.
-                        currentCall = (timestamp + timeDelta, h[1])
-                        prevTimestamp = timestamp
-
-                        lineIdx += 1
-
-                    # Add the found process id to our list of actors, using the
-                    # app identity that was resolved by the Application ctor
-                    actors.add(app.desktopid)
-
-                    if checkInitialised and not app.isInitialised():
-                        print("MISSING: %s" % g[0],
-                              file=sys.stderr)
-                        hasErrors = True
-
-                    # Insert into the ApplicationStore if one is available
-                    if store is not None:
-                        store.insert(app)
-                        instanceCount += 1
+            # Add command-line event
+            event = Event(actor=app, time=tstart, cmdlineStr=g[2])
+            app.addEvent(event)
+
+            # Add system call events
+            for (timestamp, syscall) in syscalls:
+                event = Event(actor=app, time=timestamp, syscallStr=syscall)
+                app.addEvent(event)
+                eventCount += 1
+            del syscalls
+
+            # Add the found process id to our list of actors, using the
+            # app identity that was resolved by the Application ctor
+            actors.add(app.desktopid)
+
+            if checkInitialised and not app.isInitialised():
+                print("MISSING: %s" % g[0],
+                      file=sys.stderr)
+                hasErrors = True
+
+            # Insert into the ApplicationStore if one is available
+            if store is not None:
+                store.insert(app)
+                instanceCount += 1
 
         if checkInitialised and hasErrors:
             if invalidApps:
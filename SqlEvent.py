@@ -2,14 +2,14 @@ from utils import time2Str
 
 
 class SqlEventSubject(object):
-    uri = ''             # type: str
-    interpretation = ''  # type: str
-    manifestation = ''   # type: str
-    origin_uri = ''      # type: str
-    mimetype = ''        # type: str
-    text = ''            # type: str
-    storage_uri = ''     # type: str
-    current_uri = ''     # type: str
+    __slots__ = ('uri',             # type: str
+                 'interpretation',  # type: str
+                 'manifestation',   # type: str
+                 'origin_uri',      # type: str
+                 'mimetype',        # type: str
+                 'text',            # type: str
+                 'storage_uri',     # type: str
+                 'current_uri')     # type: str
 
     def __init__(self,
                  uri: str,
@@ -38,14 +38,14 @@ class SqlEventSubject(object):
 
 
 class SqlEvent(object):
-    id = 0                # type: int
-    pid = 0               # type: int
-    timestamp = 0         # type: int
-    interpretation = ''   # type: str
-    manifestation = ''    # type: str
-    origin_uri = ''       # type: str
-    actor_uri = ''        # type: str
-    subjects = []         # type: list
+    __slots__ = ('id',              # type: int
+                 'pid',             # type: int
+                 'timestamp',       # type: int
+                 'interpretation',  # type: str
+                 'manifestation',   # type: str
+                 'origin_uri',      # type: str
+                 'actor_uri',       # type: str
+                 'subjects')        # type: list
 
     def __init__(self,
                  id: int,
@@ -1,16 +1,14 @@
 import sqlite3 as lite
+import os
 import sys
 import re
+from itertools import groupby
+from urllib.parse import quote
 from Application import Application
 from ApplicationStore import ApplicationStore
 from Event import Event
+from ParseCache import ParseCache
 from SqlEvent import SqlEvent, SqlEventSubject
-from constants import EV_ID, EV_TIMESTAMP, EV_INTERPRETATION, \
-                      EV_MANIFESTATION, EV_ACTOR_URI, EV_EVENT_ORIGIN_URI, \
-                      EV_SUBJ_URI, EV_SUBJ_INTERPRETATION, \
-                      EV_SUBJ_MANIFESTATION, EV_SUBJ_ORIGIN_URI, \
-                      EV_SUBJ_MIMETYPE, EV_SUBJ_TEXT, EV_SUBJ_STORAGE, \
-                      EV_SUBJ_CURRENT_URI
 from utils import uq, debugEnabled
 
 
@@ -18,17 +16,70 @@ class SqlLoader(object):
     path = ""
     con = None
     cur = None
-    interpretations = dict()
-    manifestations = dict()
-    mimetypes = dict()
+
+    pidre = re.compile(r'(?<=pid://)\d+')
+    fetchSize = 8192  # Rows fetched at a time from the database.
+    mmapSize = 1 << 30  # Bytes of the database mapped into memory.
+
+    # Ids of the events that have an activity:// subject.
+    activityIds = """
+        SELECT id FROM event
+        WHERE subj_id IN (SELECT id FROM uri
+                          WHERE value LIKE 'activity://%')"""
+
+    # Columns and joins shared by the queries which load whole events.
+    eventColumns = """
+        SELECT e.id, e.timestamp, e.interpretation, e.manifestation,
+               a.value, o.value, s.value, e.subj_interpretation,
+               e.subj_manifestation, so.value, e.subj_mimetype, t.value,
+               st.value, sc.value"""
+    subjectJoins = """
+            LEFT JOIN actor AS a ON a.id = e.actor
+            LEFT JOIN uri AS o ON o.id = e.origin
+            LEFT JOIN uri AS s ON s.id = e.subj_id
+            LEFT JOIN uri AS so ON so.id = e.subj_origin
+            LEFT JOIN text AS t ON t.id = e.subj_text
+            LEFT JOIN storage AS st ON st.id = e.subj_storage
+            LEFT JOIN uri AS sc ON sc.id = e.subj_id_current"""
+
+    # Events with an activity:// subject, with all their subjects. Unlike
+    # event_view, this query lets SQLite look events up by subject and by id
+    # through the indexes of the event table, instead of scanning it twice.
+    eventQuery = eventColumns + """
+        FROM event AS e""" + subjectJoins + """
+        WHERE e.id IN (""" + activityIds + """)
+        ORDER BY e.id"""
+
+    # Subjects that may hold the pid of an event with an activity:// subject.
+    pidQuery = """
+        SELECT e.id, s.value
+        FROM event AS e JOIN uri AS s ON s.id = e.subj_id
+        WHERE e.id IN (""" + activityIds + """)
+          AND s.value LIKE '%pid://%'"""
+
+    # The same events as eventQuery, restricted to those that have a pid and
+    # ordered by pid. The CROSS JOIN makes SQLite walk the primary key of the
+    # eventpid temporary table, so that the rows need not be sorted.
+    pidEventQuery = eventColumns + """
+        FROM temp.eventpid AS p CROSS JOIN event AS e ON e.id = p.id""" + \
+        subjectJoins + """
+        ORDER BY p.pid, p.id"""
 
     """ SqlLoader loads a SQLite database from Zeitgeist and produces apps and
         app instances. Pass it the path to the activities.sqlite file. """
     def __init__(self, path):
         super(SqlLoader, self).__init__()
         self.path = path
+
+        # We never write to the database. If it has no write-ahead log, it
+        # can also be opened as immutable, which skips file locking.
+        uri = "file:%s?mode=ro" % quote(os.path.abspath(self.path))
+        if not os.path.exists(self.path + "-wal"):
+            uri += "&immutable=1"
         try:
-            self.con = lite.connect(self.path)
+            # The database may be loaded in another thread than ours
+            self.con = lite.connect(uri, uri=True, check_same_thread=False)
+            self.con.execute('PRAGMA mmap_size=%d;' % SqlLoader.mmapSize)
         except lite.Error as e:
             print("Failed to initialise SqlLoader: %s" % e.args[0],
                   file=sys.stderr)
@@ -36,26 +87,19 @@ class SqlLoader(object):
 
         self.cur = self.con.cursor()
 
-        # Cache interpretations
-        self.cur.execute('SELECT * FROM interpretation;')
-        data = self.cur.fetchone()
-        while data:
-            self.interpretations[data[0]] = data[1]
-            data = self.cur.fetchone()
-
-        # Cache manifestations
-        self.cur.execute('SELECT * FROM manifestation;')
-        data = self.cur.fetchone()
-        while data:
-            self.manifestations[data[0]] = data[1]
-            data = self.cur.fetchone()
-
-        # Cache mimetypes
-        self.cur.execute('SELECT * FROM mimetype;')
-        data = self.cur.fetchone()
-        while data:
-            self.mimetypes[data[0]] = uq(data[1])  # image%2Fjpeg in dataset
-            data = self.cur.fetchone()
+        # Cache interpretations, manifestations and mimetypes. Values are
+        # interned, as each of them is shared by a great many events.
+        self.cur.execute('SELECT id, value FROM interpretation;')
+        self.interpretations = {id: sys.intern(value)
+                                for (id, value) in self.cur}
+
+        self.cur.execute('SELECT id, value FROM manifestation;')
+        self.manifestations = {id: sys.intern(value)
+                               for (id, value) in self.cur}
+
+        self.cur.execute('SELECT id, value FROM mimetype;')
+        self.mimetypes = {id: sys.intern(uq(value))  # image%2Fjpeg in dataset
+                          for (id, value) in self.cur}
 
     def __exit__(self):
         if self.con:
@@ -101,133 +145,241 @@ class SqlLoader(object):
                 print("\t%s" % a, file=sys.stderr)
             sys.exit(-1)
 
-    def loadDb(self, store: ApplicationStore = None):
-        """Browse the SQLite db and create all the relevant app instances."""
+    def _iterEvents(self, query: str):
+        """Yield the SqlEvents loaded by :query:, one at a time.
 
-        # Load up our events from the Zeitgeist database
-        self.cur = self.con.cursor()
-        self.cur.execute('SELECT * \
-                          FROM event_view \
-                          WHERE id IN (SELECT DISTINCT id \
-                                       FROM event_view \
-                                       WHERE subj_uri LIKE "activity://%")')
+        The rows of the query must be ordered so that the subjects of each
+        event are contiguous. Each SqlEvent is yielded once all its subjects
+        are read, so that callers need not keep it afterwards.
+        """
+        cur = self.con.cursor()
+        cur.execute(query)
+        interpretations = self.interpretations
+        manifestations = self.manifestations
+        mimetypes = self.mimetypes
+        pidre = SqlLoader.pidre
 
         # Merge all event subjects based on their event id, and find their pids
-        eventsMerged = dict()
-        data = self.cur.fetchone()
-        while data:
-            pid = 0
-            if "pid://" in data[EV_SUBJ_URI]:
-                m = re.search('(?<=pid://)\d+', data[EV_SUBJ_URI])
-                pid = int(m.group(0)) if m else 0
-
-            ev = eventsMerged.get(data[EV_ID])
-            if not ev:
-                ev = SqlEvent(id=data[EV_ID],
-                              pid=pid,
-                              timestamp=data[EV_TIMESTAMP],
-                              interpretation=self.getInterpretation(
-                                             data[EV_INTERPRETATION]),
-                              manifestation=self.getManifestation(
-                                             data[EV_MANIFESTATION]),
-                              origin_uri=data[EV_EVENT_ORIGIN_URI],
-                              actor_uri=data[EV_ACTOR_URI])
-            elif pid and ev.pid:
-                assert ev.pid == pid, ("Error: multiple events record a pid "
-                                       " event %d, and they disagree on the "
-                                       "pid to record (%d != %d)." % (
-                                        data[EV_ID], ev.pid, pid))
-            elif pid and not ev.pid:
-                ev.pid = pid
-
-            subj = SqlEventSubject(uri=data[EV_SUBJ_URI],
-                                   interpretation=self.getInterpretation(
-                                                 data[EV_SUBJ_INTERPRETATION]),
-                                   manifestation=self.getManifestation(
-                                                 data[EV_SUBJ_MANIFESTATION]),
-                                   origin_uri=data[EV_SUBJ_ORIGIN_URI],
-                                   mimetype=self.getMimeType(
-                                            data[EV_SUBJ_MIMETYPE]),
-                                   text=data[EV_SUBJ_TEXT],
-                                   storage_uri=data[EV_SUBJ_STORAGE],
-                                   current_uri=data[EV_SUBJ_CURRENT_URI])
-            ev.addSubject(subj)
-            eventsMerged[data[EV_ID]] = ev
-
-            data = self.cur.fetchone()
-
-        # Now, sort the events per app PID so we can build apps
-        nopids = []            # Matching events without a PID
+        ev = None
+        for rows in iter(lambda: cur.fetchmany(SqlLoader.fetchSize), []):
+            for (id, timestamp, interpretation, manifestation, actorUri,
+                 originUri, subjUri, subjInterpretation, subjManifestation,
+                 subjOriginUri, subjMimetype, subjText, subjStorage,
+                 subjCurrentUri) in rows:
+                pid = 0
+                if "pid://" in subjUri:
+                    m = pidre.search(subjUri)
+                    pid = int(m.group(0)) if m else 0
+
+                if ev is None or ev.id != id:
+                    if ev is not None:
+                        yield ev
+                    ev = SqlEvent(id=id,
+                                  pid=pid,
+                                  timestamp=timestamp,
+                                  interpretation=interpretations.get(
+                                                 interpretation),
+                                  manifestation=manifestations.get(
+                                                manifestation),
+                                  origin_uri=originUri,
+                                  actor_uri=actorUri)
+                elif pid and ev.pid:
+                    assert ev.pid == pid, ("Error: multiple events record a "
+                                           "pid event %d, and they disagree "
+                                           "on the pid to record (%d != %d)."
+                                           % (id, ev.pid, pid))
+                elif pid and not ev.pid:
+                    ev.pid = pid
+
+                subj = SqlEventSubject(uri=subjUri,
+                                       interpretation=interpretations.get(
+                                                      subjInterpretation),
+                                       manifestation=manifestations.get(
+                                                     subjManifestation),
+                                       origin_uri=subjOriginUri,
+                                       mimetype=mimetypes.get(subjMimetype),
+                                       text=subjText,
+                                       storage_uri=subjStorage,
+                                       current_uri=subjCurrentUri)
+                ev.addSubject(subj)
+
+        if ev is not None:
+            yield ev
+
+    def loadEventsPerPid(self):
+        """Load the Zeitgeist events which have an actor from the SQLite db.
+
+        Return a tuple made of a dictionary of SqlEvents indexed by pid, of the
+        number of events without a pid, and of the total number of events.
+        """
+        nopids = 0             # Matching events without a PID
         eventsPerPid = dict()  # Storage for our events
-        count = len(eventsMerged)  # Counter of fetched events, for stats
-        instanceCount = 0      # Count of distinct app instances in the dataset
-        actors = set()
+        count = 0              # Counter of fetched events, for stats
 
-        for event in eventsMerged.items():
-            pid = event[1].pid
+        # Sort the events per app PID so we can build apps
+        for event in self._iterEvents(SqlLoader.eventQuery):
+            count += 1
+            pid = event.pid
             if not pid:
-                nopids.append(event[1])
+                nopids += 1
             else:
                 try:
-                    eventsPerPid[pid].append(event[1])
+                    eventsPerPid[pid].append(event)
                 except KeyError as e:
-                    eventsPerPid[pid] = [event[1]]
-        del eventsMerged  # no longer needed
+                    eventsPerPid[pid] = [event]
 
-        # For each PID, we'll now identify the successive Application instances
-        for (pkey, pevent) in eventsPerPid.items():
-            pevent = sorted(pevent, key=lambda x: x.timestamp)
-            currentId = ''     # currently matched Desktop Id
-            currentApp = None  # currently matched Application
-            apps = []          # temp storage for found Applications
-
-            for ev in pevent:
-                (evId, __) = Application.getDesktopIdFromDesktopUri(
-                    ev.actor_uri)
-
-                if evId != currentId:
-                    if debugEnabled():
-                        print ("New application:", evId, currentId, ev)
-                    currentId = evId
-                    currentApp = Application(desktopid=evId,
-                                             pid=int(pkey),
-                                             tstart=ev.timestamp,
-                                             tend=ev.timestamp)
-                    actors.add(currentApp.desktopid)
-                    apps.append(currentApp)
-                else:
-                    currentApp.setTimeOfStart(min(ev.timestamp,
-                                                  currentApp.getTimeOfStart()))
+        return (eventsPerPid, nopids, count)
+
+    def _iterPids(self):
+        """Yield the (event id, pid) couples found in the SQLite db."""
+        cur = self.con.cursor()
+        cur.execute(SqlLoader.pidQuery)
+        pidre = SqlLoader.pidre
+
+        for rows in iter(lambda: cur.fetchmany(SqlLoader.fetchSize), []):
+            for (id, subjUri) in rows:
+                if "pid://" in subjUri:  # LIKE ignores case, we don't
+                    m = pidre.search(subjUri)
+                    if m and int(m.group(0)):
+                        yield (id, int(m.group(0)))
+
+    def streamEventsPerPid(self):
+        """Load the Zeitgeist events which have an actor, one pid at a time.
 
-                    currentApp.setTimeOfEnd(max(ev.timestamp,
-                                                currentApp.getTimeOfEnd()))
+        Return a tuple made of an iterator of (pid, list of SqlEvents) couples,
+        of the number of events without a pid, and of the total number of
+        events. Only the events of the pid being iterated over are kept in
+        memory; the couples are ordered by pid.
+        """
+        # Index the pids of all events in a temporary table, ordered by pid
+        self.cur = self.con.cursor()
+        self.cur.execute('DROP TABLE IF EXISTS temp.eventpid;')
+        self.cur.execute('CREATE TEMP TABLE eventpid (pid INTEGER, '
+                         'id INTEGER, PRIMARY KEY (pid, id)) WITHOUT ROWID;')
+        self.cur.executemany('INSERT OR IGNORE INTO temp.eventpid '
+                             'VALUES (?, ?);',
+                             ((pid, id) for (id, pid) in self._iterPids()))
+
+        # Count events with and without a pid, for stats
+        self.cur.execute('SELECT COUNT(DISTINCT id) FROM (%s);' %
+                         SqlLoader.activityIds)
+        (count,) = self.cur.fetchone()
+        self.cur.execute('SELECT COUNT(DISTINCT id) FROM temp.eventpid;')
+        (pidCount,) = self.cur.fetchone()
+
+        events = self._iterEvents(SqlLoader.pidEventQuery)
+        return (((pid, list(pevent)) for (pid, pevent) in
+                 groupby(events, key=lambda ev: ev.pid)),
+                count - pidCount,
+                count)
+
+    def _makeApps(self, pid: int, pevent: list, store: ApplicationStore,
+                  actors: set):
+        """Create the app instances of a pid from its SqlEvents.
+
+        Insert the app instances into :store: if one is given, add their
+        Desktop IDs to :actors:, and return the number of app instances.
+        """
+        pevent = sorted(pevent, key=lambda x: x.timestamp)
+        currentId = ''     # currently matched Desktop Id
+        currentApp = None  # currently matched Application
+        apps = []          # temp storage for found Applications
+
+        for ev in pevent:
+            (evId, __) = Application.getDesktopIdFromDesktopUri(
+                ev.actor_uri)
+
+            if evId != currentId:
+                if debugEnabled():
+                    print ("New application:", evId, currentId, ev)
+                currentId = evId
+                currentApp = Application(desktopid=evId,
+                                         pid=int(pid),
+                                         tstart=ev.timestamp,
+                                         tend=ev.timestamp)
+                actors.add(currentApp.desktopid)
+                apps.append(currentApp)
+            else:
+                currentApp.setTimeOfStart(min(ev.timestamp,
+                                              currentApp.getTimeOfStart()))
+
+                currentApp.setTimeOfEnd(max(ev.timestamp,
+                                            currentApp.getTimeOfEnd()))
+            # Ignore study artefacts!
+            if not currentApp.isStudyApp():
+                event = Event(actor=currentApp,
+                              time=ev.timestamp,
+                              zgEvent=ev)
+                currentApp.addEvent(event)
+
+        # Insert into the ApplicationStore if one was given to us
+        instanceCount = len(apps)
+        if store is not None:
+            for app in apps:
                 # Ignore study artefacts!
-                if not currentApp.isStudyApp():
-                    event = Event(actor=currentApp,
-                                  time=ev.timestamp,
-                                  zgEvent=ev)
-                    currentApp.addEvent(event)
-
-            # Insert into the ApplicationStore if one was given to us
-            instanceCount += len(apps)
-            if store is not None:
-                for app in apps:
-                    # Ignore study artefacts!
-                    if not app.isStudyApp():
-                        store.insert(app)
-                    else:
-                        instanceCount -= 1  # We discount this app instance
+                if not app.isStudyApp():
+                    store.insert(app)
+                else:
+                    instanceCount -= 1  # We discount this app instance
+
+        return instanceCount
+
+    def loadDb(self,
+               store: ApplicationStore = None,
+               cache: ParseCache = None,
+               streaming: bool = False,
+               quiet: bool = False):
+        """Browse the SQLite db and create all the relevant app instances.
+
+        If a :cache: is given, the events loaded from the SQLite db are saved
+        to it, and reused as long as the database file is not modified.
+
+        If :streaming: is True, the events of each pid are loaded and turned
+        into app instances one pid after the other, so that all the events of
+        the SQLite db are never held in memory at once. The cache is not used
+        in this mode, as it holds all events at once. App instances are then
+        created in the order of their pids.
+
+        If :quiet: is True, statistics are not printed, and printStats() must
+        be called to print them instead.
+        """
+        if streaming:
+            (eventsPerPid, nopids, count) = self.streamEventsPerPid()
+        else:
+            data = None
+            if cache:
+                (sig, data) = cache.load("sql", self.path,
+                                         [self.path + "-wal"])
+            if data is None:
+                data = self.loadEventsPerPid()
+                if cache:
+                    cache.save("sql", self.path, sig, data)
+            (eventsPerPid, nopids, count) = data
+            eventsPerPid = eventsPerPid.items()
+
+        instanceCount = 0      # Count of distinct app instances in the dataset
+        actors = set()
 
+        # For each PID, we'll now identify the successive Application instances
+        for (pkey, pevent) in eventsPerPid:
+            instanceCount += self._makeApps(pkey, pevent, store, actors)
+        del eventsPerPid
 
         self.appCount = len(actors)
         self.instCount = instanceCount
         self.eventCount = count
-        self.validEventRatio = 100-100*len(nopids) / count
+        self.nopidCount = nopids
+        self.validEventRatio = 100-100*nopids / count
+
+        if not quiet:
+            self.printStats()
 
+    def printStats(self):
+        """Print statistics on the last loading of the SQLite db."""
         print("Finished loading DB.\n%d events seen, %d normal, %d without a "
               "PID.\nIn total, %.02f%% events accepted." % (
-               count,
-               count-len(nopids),
-               len(nopids),
+               self.eventCount,
+               self.eventCount - self.nopidCount,
+               self.nopidCount,
                self.validEventRatio))
         print("Instance count: %d" % self.instCount)
@@ -1,6 +1,7 @@
 """UserConfigLoader loads settings related to the user being analysed."""
 from xdg import IniFile
 from constants import USERCFG_VERSION
+import re
 
 
 class UserConfigLoader(object):
@@ -26,6 +27,8 @@ class UserConfigLoader(object):
     def __init__(self, path: str):
         """Construct a UserConfigLoader."""
         super(UserConfigLoader, self).__init__()
+        self._excludedHomeDirs = None
+        self._excludedHomeDirsRe = None
 
         self.ini = IniFile.IniFile()
         try:
@@ -61,6 +64,13 @@ class UserConfigLoader(object):
                             list=isList) or defaultValue
 
     def getExcludedHomeDirs(self):
+        """Get the list of directories excluded from analysis.
+
+        The list is built once, and shared by all callers.
+        """
+        if self._excludedHomeDirs is not None:
+            return self._excludedHomeDirs
+
         def _get(self):
             """Get the list of directories excluded from analysis."""
             if not self.ini:
@@ -77,8 +87,19 @@ class UserConfigLoader(object):
         l.append("/dev/")
         l.append("/usr/")
         l.append("/tmp/")
+        self._excludedHomeDirs = l
         return l
 
+    def getExcludedHomeDirsRe(self):
+        """Get a regexp matching paths in any of the excluded directories.
+
+        The regexp is anchored at the start of paths, and is compiled once.
+        """
+        if self._excludedHomeDirsRe is None:
+            self._excludedHomeDirsRe = re.compile("|".join(
+                re.escape(e) for e in self.getExcludedHomeDirs()))
+        return self._excludedHomeDirsRe
+
     def getSecurityExclusionLists(self):
         """Get the security exclusion lists setting."""
         if not self.ini:
@@ -2,9 +2,13 @@
 
 from ApplicationStore import ApplicationStore
 from AttackSimulator import AttackSimulator
+from ConcurrentLoader import loadConcurrently
+from DesktopIndex import DesktopIndex
 from Event import dbgPrintExcludedEvents
 from EventStore import EventStore
 from FileStore import FileStore
+from ModelSnapshot import ModelSnapshot
+from ParseCache import ParseCache
 from PreloadLoggerLoader import PreloadLoggerLoader
 from SqlLoader import SqlLoader
 from UserConfigLoader import UserConfigLoader
@@ -28,11 +32,15 @@ from utils import __setCheckMissing, __setDebug, __setOutputFs, \
                   __setRelatedFiles, __setScore, __setGraph, __setAttacks, \
                   __setPrintClusters, __setUser, __setCheckExcludedFiles, \
                   __setPlottingDisabled, __setSkip, __setPrintExtensions, \
-                  __setFrequency, \
+                  __setFrequency, __setJobs, __setCache, \
+                  __setSaveModel, __setLoadModel, __setLazyEvents, \
+                  __setStreamEvents, __setStreamZeitgeist, \
+                  streamEventsEnabled, streamZeitgeistEnabled, \
                   checkMissingEnabled, debugEnabled, outputFsEnabled, \
                   relatedFilesEnabled, scoreEnabled, graphEnabled, \
                   printClustersEnabled, checkExcludedFilesEnabled, \
-                  skipEnabled, attacksEnabled, printExtensions, \
+                  skipEnabled, attacksEnabled, printExtensions, jobCount, \
+                  cacheDir, saveModelPath, loadModelPath, \
                   initMimeTypes, getDataPath, registerTimePrint, tprnt
 import getopt
 import sys
@@ -43,6 +51,9 @@ USAGE_STRING = 'Usage: __main__.py [--user=<NAME> --check-excluded-files ' \
                '--check-missing --score\n\t\t--skip=<Policy,Policy,\'graphs' \
                '\'> --clusters --graph --extensions\n\t\t--disable-plotting ' \
                '--attacks --related-files --frequency\n\t\t--output=<DIR> ' \
+               '--jobs=<N> --cache=<DIR>\n\t\t--save-model=<FILE> ' \
+               '--load-model=<FILE> --lazy-events\n\t\t--stream-events ' \
+               '--stream-zeitgeist ' \
                '--debug] ' \
                '\n\nor:     __main__.py --inode=<INODE> [--user=<NAME> ' \
                '--debug]' \
@@ -51,6 +62,87 @@ USAGE_STRING = 'Usage: __main__.py [--user=<NAME> --check-excluded-files ' \
                '\n\nor:     __main__.py --help'
 
 
+def loadAndSimulate(store: ApplicationStore,
+                    evStore: EventStore,
+                    fileStore: FileStore,
+                    datapath: str):
+    """Load the data files and simulate all their events.
+
+    Return a dictionary of statistics collected by the data file loaders.
+    """
+    # Load up the cache of parsed data files, if any
+    cache = ParseCache(cacheDir()) if cacheDir() else None
+
+    # Index the .desktop entries of all known applications
+    DesktopIndex.get().load(cache=cache)
+
+    # Load up and check the SQLite database
+    sql = None
+    tprnt("\nLoading the SQLite database: %s..." % (datapath+DATABASENAME))
+    try:
+        sql = SqlLoader(datapath+DATABASENAME)
+    except ValueError as e:
+        print("Failed to parse SQL: %s" % e.args[0], file=sys.stderr)
+        sys.exit(-1)
+    if checkMissingEnabled():
+        tprnt("Checking for missing application identities...")
+        sql.listMissingActors()
+
+    # Load up the PreloadLogger file parser
+    pll = PreloadLoggerLoader(datapath)
+    if checkMissingEnabled():
+        tprnt("Checking for missing application identities...")
+        pll.listMissingActors()
+
+    # The SQLite database is read in a worker thread while the PreloadLogger
+    # logs are parsed, see ConcurrentLoader.
+    tprnt("\nLoading the PreloadLogger logs in folder: %s..." % datapath)
+    loadConcurrently(store, sql, pll, jobs=jobCount(), cache=cache,
+                     streaming=streamZeitgeistEnabled())
+    tprnt("Loaded the SQLite database.")
+    sqlAppCount = sql.appCount
+    sqlInstCount = sql.instCount
+    sqlEvCount = sql.eventCount
+    sqlValidEvCount = sql.validEventRatio
+    pllAppCount = pll.appCount
+    pllInstCount = pll.instCount
+    pllEvCount = pll.eventCount
+    pllValidEvCount = pll.validEventRatio
+    tprnt("Loaded the PreloadLogger logs.")
+
+    # Resolve actor ids in all apps' events
+    tprnt("\nUsing PreloadLogger Applications to resolve interpreters in "
+          "Zeitgeist Applications...")
+    (interpretersAdded, instancesEliminated) = store.resolveInterpreters()
+    tprnt("Resolved interpreter ids in %d Applications, and removed %d "
+          "instances by merging them with another as a result." % (
+           interpretersAdded, instancesEliminated))
+
+    # Update events' actor ids in the ApplicationStore, then take them and
+    # merge them into the EventStore, which remains sorted by timestamp.
+    tprnt("\nInserting and sorting all events...")
+    store.sendEventsToStore()
+    evCount = evStore.getEventCount()
+    tprnt("Sorted all %d events in the event store." % evCount)
+
+    # Simulate the events to build a file model
+    tprnt("\nSimulating all events to build a file model...")
+    evStore.simulateAllEvents(streaming=streamEventsEnabled())
+    del sql
+    del pll
+    tprnt("Simulated all events. %d files initialised." % len(fileStore))
+
+    return dict(sqlAppCount=sqlAppCount,
+                sqlInstCount=sqlInstCount,
+                sqlEvCount=sqlEvCount,
+                sqlValidEvCount=sqlValidEvCount,
+                pllAppCount=pllAppCount,
+                pllInstCount=pllInstCount,
+                pllEvCount=pllEvCount,
+                pllValidEvCount=pllValidEvCount,
+                evCount=evCount)
+
+
 # Main function
 # @profile
 def main(argv):
@@ -60,22 +152,30 @@ def main(argv):
 
     # Parse command-line parameters
     try:
-        (opts, args) = getopt.getopt(argv, "hta:cedf:o:q:sk:rpgGi:u:x",
+        (opts, args) = getopt.getopt(argv,
+                                     "hta:C:cEedf:j:Ll:m:o:q:sSk:rpgGi:u:x",
                                      ["help",
                                       "attacks",
                                       "post-analysis=",
+                                      "cache=",
                                       "check-missing",
                                       "check-excluded-files",
                                       "debug",
                                       "frequency",
                                       "inode",
+                                      "jobs=",
+                                      "lazy-events",
+                                      "load-model=",
                                       "extensions",
                                       "related-files",
                                       "output=",
                                       "output-fs=",
+                                      "save-model=",
                                       "score",
                                       "quick-pol=",
                                       "skip=",
+                                      "stream-events",
+                                      "stream-zeitgeist",
                                       "user",
                                       "clusters",
                                       "print-clusters",
@@ -92,6 +192,9 @@ def main(argv):
 
                 print("--attacks:\n\tSimulates attacks and reports "
                       "on proportions of infected files and apps.\n")
+                print("--cache=<DIR>:\n\tSaves parsed PreloadLogger logs and "
+                      "Zeitgeist events in <DIR>,\n\tand reuses them in the "
+                      "next runs unless the data files were\n\tmodified.\n")
                 print("--check-excluded-files:\n\tPrints the lists of files "
                       "accessed by apps that also wrote to excluded\n\tfiles,"
                       " then aborts execution of the program.\n")
@@ -113,6 +216,15 @@ def main(argv):
                 print("--graph:\n\tFind communities in file/app "
                       "accesses using graph theory methods.\n")
                 print("--help:\n\tPrints this help information and exits.\n")
+                print("--jobs=<N>:\n\tParses PreloadLogger log files in <N> "
+                      "worker processes. Results are\n\tidentical to those "
+                      "of a serial run (default: 1).\n")
+                print("--lazy-events:\n\tDefers the parsing of PreloadLogger "
+                      "system calls until events are\n\tsimulated, to reduce "
+                      "memory usage while loading logs.\n")
+                print("--load-model=<FILE>:\n\tRestores the file model saved "
+                      "by --save-model instead of loading\n\tand simulating "
+                      "the user's data files.\n")
                 print("--output=<DIR>:\n\tSaves a copy of the simulated "
                       "files, and some information on events\n\trelated to "
                       "them, in a folder created at the <DIR> path.\n")
@@ -126,6 +238,9 @@ def main(argv):
                       " accessed together by apps. Produces\n\toutput files in"
                       " scoring mode, and an analysis output in post-analysis"
                       "\n\tmode. See also --frequency.\n")
+                print("--save-model=<FILE>:\n\tSaves the simulated file "
+                      "model to <FILE>, so that it can be\n\trestored with "
+                      "--load-model.\n")
                 print("--score:\n\tCalculates the usability and security "
                       "scores of a number of file access\n\tcontrol policies"
                       ", replayed over the simulated accesses. Prints results"
@@ -133,7 +248,17 @@ def main(argv):
                 print("--skip=<Policy,Policy,'graphs'>:\n\tSkip the scoring of "
                       "policies in the lists. If the list contains the word"
                       "\n\t'graphs', skips the general graph computation.\n")
+                print("--stream-events:\n\tReleases each event once it is "
+                      "simulated, to reduce memory\n\tusage.\n")
+                print("--stream-zeitgeist:\n\tLoads the Zeitgeist database one "
+                      "pid at a time, to reduce\n\tmemory usage. Bypasses the "
+                      "--cache option for the database.\n")
                 sys.exit()
+            elif opt in ('-C', '--cache'):
+                if not arg:
+                    print(USAGE_STRING)
+                    sys.exit(2)
+                __setCache(arg[1:] if arg[0] == '=' else arg)
             elif opt in ('-c', '--check-missing'):
                 __setCheckMissing(True)
             elif opt in ('-e', '--check-excluded-files'):
@@ -146,6 +271,10 @@ def main(argv):
                 __setRelatedFiles(True)
             elif opt in ('-s', '--score'):
                 __setScore(True)
+            elif opt in ('-E', '--stream-events'):
+                __setStreamEvents(True)
+            elif opt in ('-S', '--stream-zeitgeist'):
+                __setStreamZeitgeist(True)
             elif opt in ('-p', '--print-clusters', '--clusters'):
                 __setPrintClusters(True)
             elif opt in ('-g', '--graph-clusters', '--graph'):
@@ -159,6 +288,27 @@ def main(argv):
                     print(USAGE_STRING)
                     sys.exit(2)
                 __setFrequency(arg[1:] if arg[0] == '=' else arg)
+            elif opt in ('-j', '--jobs'):
+                if not arg:
+                    print(USAGE_STRING)
+                    sys.exit(2)
+                try:
+                    __setJobs(arg[1:] if arg[0] == '=' else arg)
+                except(ValueError) as e:
+                    print(USAGE_STRING)
+                    sys.exit(2)
+            elif opt in ('-L', '--lazy-events'):
+                __setLazyEvents(True)
+            elif opt in ('-l', '--load-model'):
+                if not arg:
+                    print(USAGE_STRING)
+                    sys.exit(2)
+                __setLoadModel(arg[1:] if arg[0] == '=' else arg)
+            elif opt in ('-m', '--save-model'):
+                if not arg:
+                    print(USAGE_STRING)
+                    sys.exit(2)
+                __setSaveModel(arg[1:] if arg[0] == '=' else arg)
             elif opt in ('-o', '--output-fs', '--output'):
                 if not arg:
                     print(USAGE_STRING)
@@ -225,60 +375,23 @@ def main(argv):
     # Load up user-related variables
     userConf = UserConfigLoader.get(path=datapath+USERCONFIGNAME)
 
-    # Load up and check the SQLite database
-    sql = None
-    tprnt("\nLoading the SQLite database: %s..." % (datapath+DATABASENAME))
-    try:
-        sql = SqlLoader(datapath+DATABASENAME)
-    except ValueError as e:
-        print("Failed to parse SQL: %s" % e.args[0], file=sys.stderr)
-        sys.exit(-1)
-    if checkMissingEnabled():
-        tprnt("Checking for missing application identities...")
-        sql.listMissingActors()
-    sql.loadDb(store)
-    sqlAppCount = sql.appCount
-    sqlInstCount = sql.instCount
-    sqlEvCount = sql.eventCount
-    sqlValidEvCount = sql.validEventRatio
-    tprnt("Loaded the SQLite database.")
-
-    # Load up the PreloadLogger file parser
-    tprnt("\nLoading the PreloadLogger logs in folder: %s..." % datapath)
-    pll = PreloadLoggerLoader(datapath)
-    if checkMissingEnabled():
-        tprnt("Checking for missing application identities...")
-        pll.listMissingActors()
-    pll.loadDb(store)
-    pllAppCount = pll.appCount
-    pllInstCount = pll.instCount
-    pllEvCount = pll.eventCount
-    pllValidEvCount = pll.validEventRatio
-    tprnt("Loaded the PreloadLogger logs.")
-
-    # Resolve actor ids in all apps' events
-    tprnt("\nUsing PreloadLogger Applications to resolve interpreters in "
-          "Zeitgeist Applications...")
-    (interpretersAdded, instancesEliminated) = store.resolveInterpreters()
-    tprnt("Resolved interpreter ids in %d Applications, and removed %d "
-          "instances by merging them with another as a result." % (
-           interpretersAdded, instancesEliminated))
-
-    # Update events' actor ids in the ApplicationStore, then take them and send
-    # them to the EvnetStore. Finally, sort the EventStore by timestamp.
-    tprnt("\nInserting and sorting all events...")
-    store.sendEventsToStore()
-    evStore.sort()
-    evCount = evStore.getEventCount()
-    tprnt("Sorted all %d events in the event store." % evCount)
-
-    # Simulate the events to build a file model
-    tprnt("\nSimulating all events to build a file model...")
-    evStore.simulateAllEvents()
-    del sql
-    del pll
-    evStore.sort()
-    tprnt("Simulated all events. %d files initialised." % len(fileStore))
+    # Restore a previously simulated model, or build it from the data files
+    if loadModelPath():
+        tprnt("\nLoading the simulated model from '%s'..." % loadModelPath())
+        try:
+            stats = ModelSnapshot.load(loadModelPath())
+        except ValueError as e:
+            print("Error: %s" % e.args[0], file=sys.stderr)
+            sys.exit(-1)
+        tprnt("Loaded the simulated model. %d files initialised." %
+              len(fileStore))
+    else:
+        stats = loadAndSimulate(store, evStore, fileStore, datapath)
+        if saveModelPath():
+            tprnt("\nSaving the simulated model to '%s'..." % saveModelPath())
+            if not ModelSnapshot.save(saveModelPath(), stats):
+                sys.exit(-1)
+            tprnt("Saved the simulated model.")
 
     appCount = store.getAppCount()
     userAppCount = store.getUserAppCount()
@@ -289,7 +402,7 @@ def main(argv):
     
     if printExtensions():
         exts = set()
-        for f in fileStore:
+        for f in fileStore.iterUnsorted():
             exts.add(f.getExtension())
         try:
             exts.remove(None)
@@ -336,14 +449,16 @@ def main(argv):
 
         with open(os.path.join(outputFsEnabled(), "statistics.txt"), "w") as f:
             msg = "SQL: %d apps; %d instances; %d events; %d%% valid\n" % \
-                  (sqlAppCount, sqlInstCount, sqlEvCount, sqlValidEvCount)
+                  (stats['sqlAppCount'], stats['sqlInstCount'],
+                   stats['sqlEvCount'], stats['sqlValidEvCount'])
             msg += "PreloadLogger: %d apps; %d instances; %d events; " \
                    "%d%% valid\n" % \
-                  (pllAppCount, pllInstCount, pllEvCount, pllValidEvCount)
+                  (stats['pllAppCount'], stats['pllInstCount'],
+                   stats['pllEvCount'], stats['pllValidEvCount'])
             msg += "Simulated: %d apps; %d instances; %d user apps; %d user" \
                    " instances; %d events; %d files; %d user documents\n" % \
                   (appCount, instCount, userAppCount, userInstCount,
-                   evCount, fileCount, docCount)
+                   stats['evCount'], fileCount, docCount)
             exclLists = userConf.getDefinedSecurityExclusionLists()
             for l in exclLists:
                 msg += "Exclusion list '%s' defined.\n" % l
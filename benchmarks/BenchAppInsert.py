@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Compare bisecting and scanning PID lists when inserting Applications.
+
+Run from the root of the repository: python3 benchmarks/BenchAppInsert.py
+"""
+import gc
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Application import Application
+from ApplicationStore import ApplicationStore
+from constants import APPMERGEWINDOW
+
+DESKTOPIDS = ["firefox.desktop", "gimp.desktop", "vlc.desktop"]
+
+
+def makeApps(appCount: int, pidCount: int):
+    """Make :appCount: successive Applications recycling :pidCount: PIDs."""
+    rand = random.Random(0)
+    apps = []
+    step = APPMERGEWINDOW * 2
+    for i in range(appCount):
+        apps.append(Application(rand.choice(DESKTOPIDS),
+                                pid=rand.randint(1, pidCount),
+                                tstart=i*step + 1,
+                                tend=i*step + rand.randint(1, step // 2)))
+    rand.shuffle(apps)
+    return apps
+
+
+def insertAndLookup(apps: list, scan: bool):
+    """Insert :apps: in a new store, and look each of them up by time."""
+    ApplicationStore.reset()
+    store = ApplicationStore.get()
+    if scan:
+        # Make the store believe every PID overlaps, as it did before
+        store._overlappingPids = set(a.pid for a in apps)
+    gc.collect()
+    start = time.perf_counter()
+    for app in apps:
+        store.insert(app)
+    found = [store.lookupPidTimestamp(a.pid, a.getTimeOfEnd()) for a in apps]
+    return (time.perf_counter() - start, found)
+
+
+def main(argv):
+    appCount = int(argv[0]) if argv else 100000
+    pidCount = int(argv[1]) if len(argv) > 1 else 100
+    apps = makeApps(appCount, pidCount)
+
+    (scanTime, scanned) = insertAndLookup(apps, scan=True)
+    (bisectTime, bisected) = insertAndLookup(apps, scan=False)
+
+    if [a.uid() for a in bisected] != [a.uid() for a in scanned]:
+        print("Error: bisection and scan found different instances.",
+              file=sys.stderr)
+        sys.exit(1)
+
+    print("%d Applications inserted and looked up on %d PIDs." % (appCount,
+                                                                   pidCount))
+    print("linear scan: %.3fs" % scanTime)
+    print("bisect: %.3fs (%.1fx)" % (bisectTime, scanTime / bisectTime))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Compare loading the data files one after the other and concurrently.
+
+Run from the root of the repository, as .desktop files are looked up in the
+./applications/ folder: python3 benchmarks/BenchConcurrentLoad.py [jobs]
+[events] [logs] [calls]
+
+A synthetic Zeitgeist database and PreloadLogger logs are written to a
+temporary folder, and loaded with both loaders one after the other, as
+__main__.py used to, and with both loaders running at once, with -j1 and with
+-j<jobs>.
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ApplicationStore import ApplicationStore
+from BenchModelMemory import makeLogs
+from BenchZeitgeistQuery import makeDatabase
+from ConcurrentLoader import loadConcurrently
+from PreloadLoggerLoader import PreloadLoggerLoader
+from SqlLoader import SqlLoader
+from utils import initMimeTypes
+
+
+def loadSerially(path: str, jobs: int):
+    """Load the data files one after the other, with :jobs: processes."""
+    store = ApplicationStore()
+    SqlLoader(os.path.join(path, "activity.sqlite")).loadDb(store)
+    PreloadLoggerLoader(path).loadDb(store, jobs=jobs)
+    return store
+
+
+def loadAtOnce(path: str, jobs: int):
+    """Load the data files concurrently, with :jobs: processes."""
+    store = ApplicationStore()
+    loadConcurrently(store, SqlLoader(os.path.join(path, "activity.sqlite")),
+                     PreloadLoggerLoader(path), jobs=jobs)
+    return store
+
+
+def main(argv):
+    jobs = int(argv[0]) if argv else 4
+    eventCount = int(argv[1]) if len(argv) > 1 else 200000
+    logCount = int(argv[2]) if len(argv) > 2 else 40
+    callCount = int(argv[3]) if len(argv) > 3 else 5000
+    initMimeTypes()
+
+    with tempfile.TemporaryDirectory() as path:
+        makeDatabase(os.path.join(path, "activity.sqlite"), eventCount)
+        makeLogs(path, logCount, callCount)
+
+        times = []
+        stores = []
+        for (load, loadJobs) in ((loadSerially, 1), (loadAtOnce, 1),
+                                 (loadSerially, jobs), (loadAtOnce, jobs)):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                stores.append(load(path, loadJobs))
+            times.append(time.perf_counter() - start)
+
+    uids = [[a.uid() for a in store] for store in stores]
+    if any(u != uids[0] for u in uids):
+        print("Error: serial and concurrent loading made different "
+              "Applications.", file=sys.stderr)
+        sys.exit(1)
+
+    print("%d Applications loaded." % len(uids[0]))
+    print("-j1, serial loaders: %.2fs" % times[0])
+    print("-j1, concurrent loaders: %.2fs" % times[1])
+    print("-j%d, serial loaders: %.2fs" % (jobs, times[2]))
+    print("-j%d, concurrent loaders: %.2fs" % (jobs, times[3]))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Compare ways of sorting the Events of many Applications by timestamp.
+
+Run from the root of the repository: python3 benchmarks/BenchEventMerge.py
+"""
+import gc
+import heapq
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Event import Event
+from EventStore import EventStore
+
+
+def makeStreams(appCount: int, eventCount: int):
+    """Make :appCount: time-sorted lists of Events, with overlapping times."""
+    rand = random.Random(0)
+    streams = []
+    for i in range(appCount):
+        start = rand.randint(1, 10**9)
+        times = sorted(start + rand.randint(0, 10**8)
+                       for j in range(eventCount // appCount))
+        streams.append([Event(time=t) for t in times])
+    return streams
+
+
+def sortStore(streams: list):
+    """Append all Events to an EventStore and sort it."""
+    store = EventStore()
+    start = time.perf_counter()
+    for stream in streams:
+        for event in stream:
+            store.append(event)
+    store.sort()
+    return (time.perf_counter() - start, store.getAllEvents())
+
+
+def heapMerge(streams: list):
+    """Merge all Events with heapq.merge()."""
+    start = time.perf_counter()
+    events = list(heapq.merge(*streams, key=lambda x: x.time))
+    return (time.perf_counter() - start, events)
+
+
+def mergeStore(streams: list):
+    """Merge all Events into an EventStore."""
+    store = EventStore()
+    start = time.perf_counter()
+    store.merge(streams)
+    return (time.perf_counter() - start, store.getAllEvents())
+
+
+def main(argv):
+    eventCount = int(argv[0]) if argv else 2000000
+    appCount = int(argv[1]) if len(argv) > 1 else 2000
+    streams = makeStreams(appCount, eventCount)
+
+    results = []
+    for (name, func) in (("append and sort", sortStore),
+                         ("heapq.merge", heapMerge),
+                         ("EventStore.merge", mergeStore)):
+        gc.collect()
+        results.append((name, func(streams)))
+
+    reference = results[0][1][1]
+    for (name, (elapsed, events)) in results:
+        if len(events) != len(reference) or \
+                any(a is not b for (a, b) in zip(events, reference)):
+            print("Error: %s did not sort events like a full sort." % name,
+                  file=sys.stderr)
+            sys.exit(1)
+
+    print("%d events from %d applications." % (len(reference), appCount))
+    for (name, (elapsed, events)) in results:
+        print("%s: %.2fs" % (name, elapsed))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
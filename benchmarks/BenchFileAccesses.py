@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Time how fast the acts of access on Files are recorded and read back.
+
+Run from the root of the repository: python3 benchmarks/BenchFileAccesses.py
+[files] [accesses] [passes]
+
+Policy scoring walks the accesses of every File several times, unfiltered,
+so reading them back is timed over several passes.
+"""
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Application import Application
+from File import File, EventFileFlags
+
+APPS = ['firefox', 'gedit', 'vlc', 'evince', 'eog', 'totem']
+FLAGS = [EventFileFlags.read, EventFileFlags.write,
+         EventFileFlags.read | EventFileFlags.designation,
+         EventFileFlags.create | EventFileFlags.write]
+
+
+def main(argv):
+    fileCount = int(argv[0]) if argv else 200
+    accCount = int(argv[1]) if len(argv) > 1 else 1000
+    passes = int(argv[2]) if len(argv) > 2 else 5
+    rand = random.Random(0)
+    apps = [Application(APPS[i % len(APPS)] + ".desktop", pid=i, tstart=0,
+                        tend=10**9) for i in range(50)]
+    files = [File("/home/user/file%d" % i) for i in range(fileCount)]
+
+    start = time.perf_counter()
+    for f in files:
+        for t in range(accCount):
+            f.addAccess(rand.choice(apps), t, rand.choice(FLAGS))
+    addTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    count = 0
+    for __ in range(passes):
+        for f in files:
+            for acc in f.getAccesses():
+                count += acc.actor.pid & 1
+    readTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for __ in range(passes):
+        for f in files:
+            for acc in f.getAccesses(EventFileFlags.designation):
+                count += acc.time & 1
+    filterTime = time.perf_counter() - start
+
+    print("%d files with %d accesses each." % (fileCount, accCount))
+    print("adding: %.3fs" % addTime)
+    print("reading, %d passes: %.3fs" % (passes, readTime))
+    print("reading by designation, %d passes: %.3fs" % (passes, filterTime))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Compare bisecting and scanning the versions of a heavily recycled name.
+
+Run from the root of the repository: python3 benchmarks/BenchFileVersions.py
+"""
+import gc
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from File import File
+from FileFactory import FileFactory
+from FileStore import FileStore
+
+NAME = "/home/user/.cache/app/lock"
+
+
+def makeStore(versionCount: int):
+    """Make a FileStore where NAME has :versionCount: successive versions."""
+    FileStore.reset()
+    FileFactory.reset()
+    store = FileStore.get()
+    for i in range(versionCount):
+        store.addFile(File(NAME, i*10+1, i*10+5, ""))
+    store.addFile(File(NAME, versionCount*10+1, 0, ""))
+    return (store, FileFactory.get())
+
+
+def lookup(factory: FileFactory, times: list):
+    """Get the versions of NAME alive at :times:."""
+    start = time.perf_counter()
+    files = [factory.getFile(NAME, t) for t in times]
+    return (time.perf_counter() - start, files)
+
+
+def main(argv):
+    versionCount = int(argv[0]) if argv else 10000
+    lookupCount = int(argv[1]) if len(argv) > 1 else 20000
+    rand = random.Random(0)
+    times = [rand.randint(0, versionCount)*10 + rand.randint(1, 5)
+             for i in range(lookupCount)]
+
+    (store, factory) = makeStore(versionCount)
+    gc.collect()
+    (bisectTime, bisected) = lookup(factory, times)
+
+    # Make the store fall back to scanning versions, as it did before
+    (store, factory) = makeStore(versionCount)
+    store._unorderedNames.add(NAME)
+    gc.collect()
+    (scanTime, scanned) = lookup(factory, times)
+
+    if [(f.tstart, f.tend) for f in bisected] != \
+            [(f.tstart, f.tend) for f in scanned]:
+        print("Error: bisection and scan found different versions.",
+              file=sys.stderr)
+        sys.exit(1)
+
+    print("%d lookups on a name with %d versions." % (lookupCount,
+                                                       versionCount + 1))
+    print("linear scan: %.3fs" % scanTime)
+    print("bisect: %.3fs (%.1fx)" % (bisectTime, scanTime / bisectTime))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
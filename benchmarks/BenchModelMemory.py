@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Report the peak memory used to load and simulate a synthetic dataset.
+
+Run from the root of the repository, as .desktop files are looked up in the
+./applications/ folder: python3 benchmarks/BenchModelMemory.py [logs] [calls]
+
+Peak RSS is reported after loading and after simulating, so that the memory
+footprint of the model can be compared between two versions of the code.
+"""
+import contextlib
+import io
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ApplicationStore import ApplicationStore
+from EventStore import EventStore
+from FileStore import FileStore
+from PreloadLoggerLoader import PreloadLoggerLoader
+from utils import initMimeTypes
+
+APPS = ['firefox', 'gedit', 'vlc', 'evince', 'eog', 'totem']
+
+
+def makeLogs(path: str, logCount: int, callCount: int):
+    """Write :logCount: PreloadLogger logs of :callCount: system calls."""
+    rand = random.Random(0)
+    names = ["/home/user/Documents/project%d/src/module%d/file%d.txt" % (
+             i % 50, i % 400, i) for i in range(20000)]
+    for i in range(logCount):
+        app = APPS[i % len(APPS)]
+        pid = 1000 + i
+        t = 1467384000000 + rand.randint(0, 10**8)
+        lines = ["@%s|%d|/usr/bin/%s --arg %d" % (app, pid, app, i)]
+        for j in range(callCount):
+            t += rand.randint(0, 3)
+            name = rand.choice(names)
+            kind = rand.random()
+            if kind < 0.5:
+                lines.append("%d|open|%s|fd %d: with flag %d, e0|/home/user" % (
+                             t, name, rand.randint(3, 30),
+                             rand.choice((0, 1, 2, 65))))
+            elif kind < 0.6:
+                lines.append("%d|fopen|%s|FILE 0x%x: with flag 0, e0|/" % (
+                             t, name, rand.randint(4096, 65535)))
+            elif kind < 0.9:
+                lines.append("%d|close|fd: %d|e0|" % (t, rand.randint(3, 30)))
+            else:
+                lines.append("%d|opendir|%s|DIR 0x%x: e0|/" % (
+                             t, os.path.dirname(name),
+                             rand.randint(4096, 65535)))
+        logName = "2016-07-01_%d_%d.log" % (pid, t // 1000)
+        with open(os.path.join(path, logName), 'w') as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def peakRSS():
+    """Return the peak resident set size of this process, in MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(argv):
+    logCount = int(argv[0]) if argv else 40
+    callCount = int(argv[1]) if len(argv) > 1 else 5000
+    initMimeTypes()
+
+    with tempfile.TemporaryDirectory() as path:
+        makeLogs(path, logCount, callCount)
+        baseline = peakRSS()
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            store = ApplicationStore.get()
+            PreloadLoggerLoader(path).loadDb(store)
+            store.resolveInterpreters()
+            store.sendEventsToStore()
+        loadTime = time.perf_counter() - start
+        loaded = peakRSS()
+
+        start = time.perf_counter()
+        evStore = EventStore.get()
+        with contextlib.redirect_stdout(io.StringIO()):
+            evStore.simulateAllEvents()
+        simTime = time.perf_counter() - start
+        simulated = peakRSS()
+
+    print("%d events, %d files." % (evStore.getEventCount(),
+                                     len(FileStore.get())))
+    print("before loading: %.1fMB" % baseline)
+    print("after loading: %.1fMB (%.2fs)" % (loaded, loadTime))
+    print("after simulating: %.1fMB (%.2fs)" % (simulated, simTime))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
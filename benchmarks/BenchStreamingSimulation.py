@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Compare the peak memory used to simulate Events with and without streaming.
+
+Run from the root of the repository, as .desktop files are looked up in the
+./applications/ folder: python3 benchmarks/BenchStreamingSimulation.py [logs]
+[calls]
+
+Peak RSS never decreases within a process, so each mode is run in its own
+process, on the same synthetic dataset.
+"""
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ApplicationStore import ApplicationStore
+from BenchModelMemory import makeLogs, peakRSS
+from EventStore import EventStore
+from FileStore import FileStore
+from PreloadLoggerLoader import PreloadLoggerLoader
+from utils import initMimeTypes
+
+
+def simulate(path: str, streaming: bool):
+    """Load the logs in :path: and simulate them, then print statistics."""
+    initMimeTypes()
+    with contextlib.redirect_stdout(io.StringIO()):
+        store = ApplicationStore.get()
+        PreloadLoggerLoader(path).loadDb(store)
+        store.resolveInterpreters()
+        store.sendEventsToStore()
+    evStore = EventStore.get()
+    evCount = evStore.getEventCount()
+    loaded = peakRSS()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        evStore.simulateAllEvents(streaming=streaming)
+    simTime = time.perf_counter() - start
+
+    print("%s: %d events, %d files, %.1fMB after loading, %.1fMB after "
+          "simulating (%.2fs)" % ("streaming" if streaming else "default",
+                                  evCount, len(FileStore.get()), loaded,
+                                  peakRSS(), simTime))
+
+
+def main(argv):
+    if argv and argv[0] == "--simulate":
+        simulate(argv[1], argv[2] == "streaming")
+        return
+
+    logCount = int(argv[0]) if argv else 40
+    callCount = int(argv[1]) if len(argv) > 1 else 5000
+    with tempfile.TemporaryDirectory() as path:
+        makeLogs(path, logCount, callCount)
+        for mode in ("default", "streaming"):
+            subprocess.check_call([sys.executable, "-W", "ignore",
+                                   os.path.abspath(__file__),
+                                   "--simulate", path, mode])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Compare the throughput of the fast and regex-based syscall tokenizers.
+
+Run from the root of the repository, as .desktop files are looked up in the
+./applications/ folder: python3 benchmarks/BenchSyscallTokenizer.py
+"""
+import gc
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Application import Application
+from Event import Event
+from utils import int16
+
+TOKENIZERS = {
+    'open': (Event.posixOpenRe, (str, int, int, int, str), Event._splitOpen),
+    'fopen': (Event.posixFopenRe, (str, int16, int, int, str),
+              Event._splitFopen),
+    'opendir': (Event.posixOpendirRe, (str, int16, int, str),
+                Event._splitOpendir),
+    'unlink': (Event.posixUnlinkRe, (str, int, str), Event._splitUnlink),
+    'close': (Event.posixCloseRe, (int, int), Event._splitClose),
+    'fclose': (Event.posixFcloseRe, (int16, int), Event._splitFclose),
+}
+
+
+def makeSyscalls(count: int):
+    """Make a list of PreloadLogger system call strings."""
+    rand = random.Random(0)
+    calls = []
+    for i in range(count):
+        path = "/home/user/Documents/dir%d/file%d.txt" % (i % 50, i % 1000)
+        kind = i % 6
+        if kind == 0:
+            calls.append("open|%s|fd %d: with flag %d, e0|/home/user" % (
+                         path, rand.randint(3, 50), rand.choice([0, 1, 577])))
+        elif kind == 1:
+            calls.append("fopen|%s|FILE 0x%x: with flag %d, e0|/home/user" % (
+                         path, rand.randint(4096, 99999), rand.choice([0, 1])))
+        elif kind == 2:
+            calls.append("opendir|%s|DIR 0x%x: e0|/home/user" % (
+                         os.path.dirname(path), rand.randint(4096, 99999)))
+        elif kind == 3:
+            calls.append("unlink|%s|e0|/home/user" % path)
+        elif kind == 4:
+            calls.append("close|fd: %d|e0|" % rand.randint(3, 50))
+        else:
+            calls.append("fclose|FILE: 0x%x|e0|" % rand.randint(4096, 99999))
+    return calls
+
+
+def tokenize(calls: list, fast: bool):
+    """Tokenize the content of all :calls: and return the elapsed time."""
+    Event.fastTokenizer = fast
+    start = time.perf_counter()
+    for call in calls:
+        (syscall, __, content) = call.partition('|')
+        (regex, func, splitter) = TOKENIZERS[syscall]
+        Event._tokenize(content, regex, func, splitter)
+    return time.perf_counter() - start
+
+
+def parse(calls: list, actor: Application, fast: bool):
+    """Parse all :calls: into Events and return the elapsed time and data."""
+    Event.fastTokenizer = fast
+    start = time.perf_counter()
+    events = [Event(actor=actor, time=t+1, syscallStr=s)
+              for (t, s) in enumerate(calls)]
+    elapsed = time.perf_counter() - start
+    return (elapsed, [(int(e.evflags),
+                       [(f.path, f.ftype) for f in e.data or []],
+                       e.data_app) for e in events])
+
+
+def best(func, *args, repeat: int=3):
+    """Return the best time out of :repeat: calls to :func:."""
+    times = []
+    for i in range(repeat):
+        gc.collect()
+        res = func(*args)
+        times.append(res[0] if isinstance(res, tuple) else res)
+    return min(times)
+
+
+def main(argv):
+    count = int(argv[0]) if argv else 300000
+    calls = makeSyscalls(count)
+    actor = Application("firefox.desktop", pid=1, tstart=0, tend=count+1)
+
+    (__, regexData) = parse(calls, actor, False)
+    (__, fastData) = parse(calls, actor, True)
+    if regexData != fastData:
+        print("Error: both tokenizers did not produce the same Events.",
+              file=sys.stderr)
+        sys.exit(1)
+    del regexData, fastData
+
+    print("%d system calls." % count)
+    for (name, func, args) in (("Tokenizing", tokenize, (calls,)),
+                               ("Parsing into Events", parse,
+                                (calls, actor))):
+        regexTime = best(func, *(args + (False,)))
+        fastTime = best(func, *(args + (True,)))
+        print("%s:\n\tregex tokenizer: %.2fs, %d syscalls/sec\n"
+              "\tfast tokenizer:  %.2fs, %d syscalls/sec\n"
+              "\tspeedup: %.2fx" % (
+               name,
+               regexTime, count / regexTime,
+               fastTime, count / fastTime,
+               regexTime / fastTime))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
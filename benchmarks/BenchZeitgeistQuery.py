@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Compare reading Zeitgeist events through event_view and SqlLoader.
+
+Run from the root of the repository: python3 benchmarks/BenchZeitgeistQuery.py
+[events]. A synthetic Zeitgeist database is written to a temporary folder;
+the default of 400k events makes about 1M rows in the event table.
+"""
+import os
+import random
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from SqlEvent import SqlEvent, SqlEventSubject
+from SqlLoader import SqlLoader
+
+SCHEMA = """
+CREATE TABLE interpretation (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                             value VARCHAR UNIQUE);
+CREATE TABLE manifestation (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            value VARCHAR UNIQUE);
+CREATE TABLE mimetype (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                       value VARCHAR UNIQUE);
+CREATE TABLE actor (id INTEGER PRIMARY KEY AUTOINCREMENT, value VARCHAR UNIQUE);
+CREATE TABLE uri (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE text (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE payload (id INTEGER PRIMARY KEY, value BLOB);
+CREATE TABLE storage (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE,
+                      state INTEGER, icon VARCHAR, display_name VARCHAR);
+CREATE TABLE event (id INTEGER, timestamp INTEGER, interpretation INTEGER,
+                    manifestation INTEGER, actor INTEGER, payload INTEGER,
+                    subj_id INTEGER, subj_id_current INTEGER,
+                    subj_interpretation INTEGER, subj_manifestation INTEGER,
+                    subj_origin INTEGER, subj_origin_current INTEGER,
+                    subj_mimetype INTEGER, subj_text INTEGER,
+                    subj_storage INTEGER, origin INTEGER,
+                    CONSTRAINT unique_event UNIQUE (timestamp, interpretation,
+                    manifestation, actor, subj_id));
+CREATE INDEX event_id ON event(id);
+CREATE INDEX event_timestamp ON event(timestamp);
+CREATE INDEX event_subj_id ON event(subj_id);
+CREATE INDEX event_subj_id_current ON event(subj_id_current);
+CREATE INDEX event_actor ON event(actor);
+CREATE VIEW event_view AS
+ SELECT event.id, event.timestamp, event.interpretation, event.manifestation,
+ event.actor,
+ (SELECT value FROM payload WHERE payload.id=event.payload) AS payload,
+ (SELECT value FROM uri WHERE uri.id=event.subj_id) AS subj_uri,
+ event.subj_id, event.subj_interpretation, event.subj_manifestation,
+ event.subj_origin,
+ (SELECT value FROM uri WHERE uri.id=event.subj_origin) AS subj_origin_uri,
+ event.subj_mimetype,
+ (SELECT value FROM text WHERE text.id = event.subj_text) AS subj_text,
+ (SELECT value FROM storage WHERE storage.id=event.subj_storage)
+  AS subj_storage,
+ (SELECT state FROM storage WHERE storage.id=event.subj_storage)
+  AS subj_storage_state,
+ event.origin,
+ (SELECT value FROM uri WHERE uri.id=event.origin) AS event_origin_uri,
+ (SELECT value FROM uri WHERE uri.id=event.subj_id_current)
+  AS subj_current_uri,
+ event.subj_id_current, event.subj_text AS subj_text_id,
+ event.subj_storage AS subj_storage_id,
+ (SELECT value FROM actor WHERE actor.id=event.actor) AS actor_uri,
+ event.subj_origin_current,
+ (SELECT value FROM uri WHERE uri.id=event.subj_origin_current)
+  AS subj_origin_current_uri
+ FROM event;
+"""
+
+INTERPRETATIONS = [
+    "activity://gui-toolkit/gtk3/FileChooser/FileCreate",
+    "activity://gui-toolkit/gtk3/FileChooser/FileAccess",
+    "http://www.zeitgeist-project.com/ontologies/2010/01/27/zg#AccessEvent",
+    "http://www.zeitgeist-project.com/ontologies/2010/01/27/zg#MoveEvent"]
+ACTORS = ["application://gedit.desktop", "application://firefox.desktop",
+          "application://eog.desktop", "application://evince.desktop"]
+
+
+def makeDatabase(path: str, eventCount: int):
+    """Write a Zeitgeist database with :eventCount: synthetic events."""
+    rand = random.Random(0)
+    con = sqlite3.connect(path)
+    con.executescript(SCHEMA)
+    con.executemany("INSERT INTO interpretation VALUES (?, ?)",
+                    enumerate(INTERPRETATIONS, 1))
+    con.execute("INSERT INTO manifestation VALUES (1, 'http://www.zeitgeist-"
+                "project.com/ontologies/2010/01/27/zg#UserActivity')")
+    con.execute("INSERT INTO mimetype VALUES (1, 'text%2Fplain'), "
+                "(2, 'image/png')")
+    con.executemany("INSERT INTO actor VALUES (?, ?)", enumerate(ACTORS, 1))
+    con.execute("INSERT INTO storage VALUES (1, 'local', 1, NULL, NULL)")
+
+    uris = dict()
+
+    def _uri(value: str):
+        if value not in uris:
+            uris[value] = len(uris) + 1
+            con.execute("INSERT INTO uri VALUES (?, ?)", (uris[value], value))
+        return uris[value]
+
+    files = ["file:///home/user/Documents/doc%d.txt" % i for i in range(2000)]
+    rows = []
+    t = 1467384000000
+    for e in range(1, eventCount + 1):
+        t += rand.randint(1, 5000)
+        actor = rand.randint(1, len(ACTORS))
+        pid = 1000 + (actor * 7 + e // 500) % 300
+        interpretation = rand.randint(1, len(INTERPRETATIONS))
+        subjects = []
+        if rand.random() < 0.8:
+            subjects.append(_uri("activity://null///pid://%d///" % pid))
+        for k in range(rand.randint(1, 2)):
+            subjects.append(_uri(files[(e * 3 + k) % len(files)]))
+        for subject in subjects:
+            rows.append((e, t, interpretation, 1, actor, None, subject,
+                         subject, 1, 1, None, None, rand.randint(1, 2), None,
+                         1, None))
+        if len(rows) > 50000:
+            con.executemany("INSERT INTO event VALUES (%s)" %
+                            ",".join("?" * 16), rows)
+            rows = []
+    con.executemany("INSERT INTO event VALUES (%s)" % ",".join("?" * 16), rows)
+    con.commit()
+    con.close()
+
+
+def viewLoad(path: str, loader: SqlLoader):
+    """Load events through event_view and fetchone(), as SqlLoader used to."""
+    con = sqlite3.connect(path)
+    cur = con.cursor()
+    cur.execute('SELECT * FROM event_view WHERE id IN (SELECT DISTINCT id '
+                'FROM event_view WHERE subj_uri LIKE "activity://%")')
+    eventsMerged = dict()
+    data = cur.fetchone()
+    while data:
+        pid = 0
+        if "pid://" in data[6]:
+            m = re.search(r'(?<=pid://)\d+', data[6])
+            pid = int(m.group(0)) if m else 0
+        ev = eventsMerged.get(data[0])
+        if not ev:
+            ev = SqlEvent(id=data[0], pid=pid, timestamp=data[1],
+                          interpretation=loader.getInterpretation(data[2]),
+                          manifestation=loader.getManifestation(data[3]),
+                          origin_uri=data[17], actor_uri=data[22])
+        elif pid and not ev.pid:
+            ev.pid = pid
+        ev.addSubject(SqlEventSubject(
+            uri=data[6],
+            interpretation=loader.getInterpretation(data[8]),
+            manifestation=loader.getManifestation(data[9]),
+            origin_uri=data[11], mimetype=loader.getMimeType(data[12]),
+            text=data[13], storage_uri=data[14], current_uri=data[18]))
+        eventsMerged[data[0]] = ev
+        data = cur.fetchone()
+    con.close()
+    return eventsMerged
+
+
+def summarise(events):
+    """Return the contents of a list of SqlEvents, for comparisons."""
+    return [(e.id, e.pid, e.timestamp, e.interpretation, e.manifestation,
+             e.origin_uri, e.actor_uri,
+             [(s.uri, s.interpretation, s.manifestation, s.origin_uri,
+               s.mimetype, s.text, s.storage_uri, s.current_uri)
+              for s in e.subjects]) for e in events]
+
+
+def main(argv):
+    eventCount = int(argv[0]) if argv else 400000
+    folder = tempfile.mkdtemp()
+    try:
+        path = os.path.join(folder, "activity.sqlite")
+        makeDatabase(path, eventCount)
+        con = sqlite3.connect(path)
+        rowCount = con.execute("SELECT COUNT(*) FROM event").fetchone()[0]
+        con.close()
+
+        loader = SqlLoader(path)
+        start = time.perf_counter()
+        viewEvents = viewLoad(path, loader)
+        viewTime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        (eventsPerPid, nopids, count) = SqlLoader(path).loadEventsPerPid()
+        loaderTime = time.perf_counter() - start
+    finally:
+        shutil.rmtree(folder)
+
+    loaded = [e for events in eventsPerPid.values() for e in events]
+    expected = [e for e in viewEvents.values() if e.pid]
+    if sorted(summarise(loaded)) != sorted(summarise(expected)) or \
+            count != len(viewEvents):
+        print("Error: the view and the loader read different events.",
+              file=sys.stderr)
+        sys.exit(1)
+
+    print("%d events made of %d rows, %d read." % (eventCount, rowCount,
+                                                   count))
+    print("event_view with fetchone(): %.3fs" % viewTime)
+    print("SqlLoader: %.3fs (%.1fx)" % (loaderTime, viewTime / loaderTime))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
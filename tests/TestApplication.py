@@ -1,5 +1,6 @@
 import unittest
 from Application import Application
+from Event import Event
 
 
 class TestApplication(unittest.TestCase):
@@ -13,3 +14,31 @@ class TestApplication(unittest.TestCase):
         self.assertTrue(cf.isDesktopApp())
         self.assertTrue(th.isDesktopApp())
         self.assertTrue(gd.isDesktopApp())
+
+    def test_split(self):
+        app = Application("firefox.desktop", pid=1, tstart=0, tend=100)
+        cmd = "@firefox|1|firefox"
+        for t in (10, 20, 70, 90):
+            app.addEvent(Event(actor=app, time=t, cmdlineStr=cmd))
+        app.openFD(3, "/path/to/left", 5)
+        app.closeFD(3, 15)
+        app.openFD(3, "/path/to/right", 80)
+        app.openFD(4, "/path/to/both", 12)
+
+        (left, right) = app.split(beforeEnd=40, afterStart=60)
+        self.assertEqual([e.time for e in left.events], [10, 20])
+        self.assertEqual([e.time for e in right.events], [70, 90])
+        self.assertEqual((left.tstart, left.tend), (0, 20))
+        self.assertEqual((right.tstart, right.tend), (70, 100))
+        self.assertNotEqual(left.uid(), right.uid())
+        self.assertEqual(left.uid(), app.uid())
+        self.assertEqual(left.resolveFD(3, 10), "/path/to/left")
+        self.assertIsNone(left.resolveFD(3, 85))
+        self.assertEqual(right.resolveFD(3, 85), "/path/to/right")
+        self.assertEqual(left.resolveFD(4, 20), "/path/to/both")
+        self.assertEqual(right.resolveFD(4, 90), "/path/to/both")
+        self.assertEqual(len(app.events), 4)
+
+        app.addEvent(Event(actor=app, time=50, cmdlineStr=cmd))
+        with self.assertRaises(IndexError):
+            app.split(beforeEnd=40, afterStart=60)
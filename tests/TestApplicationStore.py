@@ -1,6 +1,8 @@
 import unittest
 from Application import Application
 from ApplicationStore import ApplicationStore
+from constants import APPMERGEWINDOW
+from Event import Event
 from EventStore import EventStore
 
 
@@ -50,6 +52,95 @@ class TestApplicationStore(unittest.TestCase):
         self.assertEqual(count["gimp"], 1)
         self.assertEqual(count["ristretto"], 1)
 
+    def test_lookup_uid(self):
+        self.store.clear()
+        a = Application("firefox.desktop", pid=21, tstart=1, tend=2)
+        b = Application("firefox.desktop", pid=21, tstart=20, tend=32)
+        c = Application("gimp.desktop", pid=22, tstart=3, tend=239)
+        self.store.insert(a)
+        self.store.insert(b)
+        self.store.insert(c)
+
+        self.assertIs(self.store.lookupUid(b.uid()), b)
+        self.assertIs(self.store.lookupId(c.iid()), c)
+        self.assertIs(self.store.lookupUid("firefox:21:25"), b)
+        self.assertIsNone(self.store.lookupUid("gimp:21:25"))
+        self.assertIsNone(self.store.lookupUid("invalid"))
+
+        d = Application("firefox.desktop", pid=21, tstart=20, tend=32)
+        self.assertEqual(d.iid(), b.iid())
+        self.assertNotEqual(a.iid(), b.iid())
+
+    def test_lazy_ids(self):
+        self.store.clear()
+        count = len(Application.uidIds)
+        a = Application("firefox.desktop", pid=2121, tstart=1, tend=2)
+        b = Application("firefox.desktop", pid=2121, tstart=0, tend=3)
+        a.merge(b)
+        self.assertEqual(len(Application.uidIds), count)
+
+        self.store.insert(a)
+        self.store.sendEventsToStore()
+        self.assertEqual(len(Application.uidIds), count + 1)
+        iid = a.iid()
+
+        a.setTimeOfStart(4)
+        a._regenUid()
+        self.assertEqual(a.iid(), iid)
+        self.assertIs(self.store.lookupId(iid), a)
+        self.assertEqual(len(Application.uidIds), count + 2)
+
+        c = Application("firefox.desktop", pid=2121, tstart=10, tend=30)
+        c.addEvent(Event(c, 11, syscallStr="test"))
+        c.addEvent(Event(c, 21, syscallStr="test"))
+        (left, right) = c.split(15, 20)
+        self.assertEqual(len(Application.uidIds), count + 2)
+        self.assertNotEqual(left.iid(), right.iid())
+
+    def test_reset_ids(self):
+        a = Application("firefox.desktop", pid=2121, tstart=1, tend=2)
+        b = Application("firefox.desktop", pid=2122, tstart=1, tend=2)
+        a.iid()
+        b.iid()
+        Application.idApps[b.iid()] = b
+        ApplicationStore.reset()
+        self.assertEqual(Application.uidIds, dict())
+        self.assertEqual(Application.idApps, dict())
+
+        # Applications made before the reset are handed out new ids.
+        c = Application("gimp.desktop", pid=2123, tstart=1, tend=2)
+        self.assertEqual(c.iid(), 0)
+        self.assertEqual(b.iid(), 1)
+        self.assertEqual(Application.uidIds, {c.uid(): 0, b.uid(): 1})
+
+    def test_lookup_pid_timestamp(self):
+        self.store.clear()
+        step = APPMERGEWINDOW * 2
+        apps = [Application("gimp.desktop" if t == 3 else "firefox.desktop",
+                            pid=21, tstart=t*step+1, tend=t*step+50)
+                for t in range(50)]
+        for app in reversed(apps):
+            self.store.insert(app)
+        self.assertEqual(self.store.lookupPid(21), apps)
+        self.assertIs(self.store.lookupPidTimestamp(21, step*2+1), apps[2])
+        self.assertIs(self.store.lookupPidTimestamp(21, step*2+50), apps[2])
+        self.assertIsNone(self.store.lookupPidTimestamp(21, step*2+75))
+        self.assertIsNone(self.store.lookupPidTimestamp(21, step*60))
+
+        # Merging an instance spanning another one makes the PID overlap
+        long = Application("firefox.desktop", pid=21, tstart=step*2+40,
+                           tend=step*3+60)
+        self.store.insert(long)
+        self.assertEqual(apps[2].getTimeOfEnd(), step*3+60)
+        pids = self.store.lookupPid(21)
+        for time in range(0, step*51, step//8):
+            linear = None
+            for app in pids:
+                if app.getTimeOfStart() <= time <= app.getTimeOfEnd():
+                    linear = app
+                    break
+            self.assertIs(self.store.lookupPidTimestamp(21, time), linear)
+
     def tearDown(self):
         EventStore.reset()
         ApplicationStore.reset()
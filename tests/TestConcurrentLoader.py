@@ -0,0 +1,116 @@
+import contextlib
+import io
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from Application import Application
+from ApplicationStore import ApplicationStore
+from ConcurrentLoader import loadConcurrently
+from PreloadLoggerLoader import PreloadLoggerLoader
+from SqlLoader import SqlLoader
+
+SCHEMA = """
+CREATE TABLE interpretation (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE manifestation (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE mimetype (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE actor (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE uri (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE text (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE storage (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE event (id INTEGER, timestamp INTEGER, interpretation INTEGER,
+                    manifestation INTEGER, actor INTEGER, subj_id INTEGER,
+                    subj_id_current INTEGER, subj_interpretation INTEGER,
+                    subj_manifestation INTEGER, subj_origin INTEGER,
+                    subj_mimetype INTEGER, subj_text INTEGER,
+                    subj_storage INTEGER, origin INTEGER);
+INSERT INTO interpretation VALUES
+    (1, 'activity://gui-toolkit/gtk3/FileChooser/FileAccess');
+INSERT INTO manifestation VALUES (1, 'zg#UserActivity');
+INSERT INTO mimetype VALUES (1, 'text%2Fplain');
+INSERT INTO actor VALUES (1, 'application://gedit.desktop'),
+                         (2, 'application://firefox.desktop');
+INSERT INTO storage VALUES (1, 'local');
+INSERT INTO uri VALUES (1, 'activity://null///pid://300///'),
+                       (2, 'activity://null///pid://200///'),
+                       (3, 'file:///home/user/a.txt');
+INSERT INTO event VALUES
+    (1, 1467384000100, 1, 1, 1, 1, 1, 1, 1, NULL, 1, NULL, 1, NULL),
+    (1, 1467384000100, 1, 1, 1, 3, 3, 1, 1, NULL, 1, NULL, 1, NULL),
+    (2, 1467384000200, 1, 1, 2, 2, 2, 1, 1, NULL, 1, NULL, 1, NULL),
+    (2, 1467384000200, 1, 1, 2, 3, 3, 1, 1, NULL, 1, NULL, 1, NULL);
+"""
+
+LOGS = {
+    '2016-07-01_1234_1467384000.log':
+        '@firefox|1234|/usr/bin/firefox\n'
+        '1467384000|open|/home/user/a.txt|fd 3: with flag 0, e0|/home\n'
+        '1467384000|close|fd: 3|e0|\n',
+    '2016-07-01_1240_1467384010.log':
+        '@gedit|1240|gedit /home/user/b.txt\n'
+        '1467384010|open|/home/user/b.txt|fd 3: with flag 2, e0|/home\n'
+        '1467384011|close|fd: 3|e0|\n',
+}
+
+
+class TestConcurrentLoader(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.db = os.path.join(self.path, 'activity.sqlite')
+        con = sqlite3.connect(self.db)
+        con.executescript(SCHEMA)
+        con.close()
+        for (name, content) in LOGS.items():
+            with open(os.path.join(self.path, name), 'w') as f:
+                f.write(content)
+
+    def test_same_as_serial(self):
+        serial = ApplicationStore()
+        with contextlib.redirect_stdout(io.StringIO()):
+            SqlLoader(self.db).loadDb(serial)
+            PreloadLoggerLoader(self.path).loadDb(serial)
+
+        for jobs in (1, 2):
+            concurrent = ApplicationStore()
+            with contextlib.redirect_stdout(io.StringIO()):
+                # Loading hands out no ids, so they cannot depend on threads.
+                count = len(Application.uidIds)
+                sql = SqlLoader(self.db)
+                loadConcurrently(concurrent, sql,
+                                 PreloadLoggerLoader(self.path), jobs=jobs)
+                self.assertEqual(len(Application.uidIds), count)
+
+            self.assertEqual(sql.instCount, 2)
+            self.assertEqual([a.uid() for a in serial],
+                             [a.uid() for a in concurrent])
+            for (a, b) in zip(serial, concurrent):
+                self.assertEqual([(e.time, e.evflags) for e in a.events],
+                                 [(e.time, e.evflags) for e in b.events])
+
+    def test_pool_forked_first(self):
+        children = []
+        sql = SqlLoader(self.db)
+        loadDb = sql.loadDb
+
+        def _loadDb(*args, **kwargs):
+            children.append(len(multiprocessing.active_children()))
+            return loadDb(*args, **kwargs)
+
+        sql.loadDb = _loadDb
+        with contextlib.redirect_stdout(io.StringIO()):
+            loadConcurrently(ApplicationStore(), sql,
+                             PreloadLoggerLoader(self.path), jobs=2)
+        self.assertEqual(children, [2])
+
+    def test_stats_printed_last(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            loadConcurrently(ApplicationStore(), SqlLoader(self.db),
+                             PreloadLoggerLoader(self.path), jobs=2)
+        self.assertTrue(out.getvalue().endswith("Instance count: 2\n"))
+        self.assertEqual(out.getvalue().count("Instance count: 2\n"), 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
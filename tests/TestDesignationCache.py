@@ -0,0 +1,77 @@
+import contextlib
+import io
+import unittest
+from Application import Application
+from DesignationCache import DesignationCache
+from Event import Event
+from File import EventFileFlags, FileStub
+from SqlEvent import SqlEvent, SqlEventSubject
+
+
+class TestDesignationCache(unittest.TestCase):
+    def setUp(self):
+        self.app = Application("firefox.desktop", pid=21, tstart=1,
+                               tend=10000000)
+        self.cache = DesignationCache()
+        self.a = FileStub("/home/user/a.txt")
+        self.b = FileStub("/home/user/b.txt")
+        self.c = FileStub("/home/user/c.txt")
+
+    def _zgRead(self, time: int, paths: list):
+        zge = SqlEvent(id=1, pid=21, timestamp=time,
+                       interpretation='activity://gui-toolkit/gtk3/'
+                                      'FileChooser/FileAccess',
+                       manifestation='', origin_uri='',
+                       actor_uri='application://firefox.desktop')
+        for path in paths:
+            zge.addSubject(SqlEventSubject(uri='file://' + path,
+                                           interpretation='',
+                                           manifestation='', origin_uri='',
+                                           mimetype='text/plain', text='',
+                                           storage_uri='', current_uri=''))
+        event = Event(actor=self.app, time=time, zgEvent=zge)
+        self.cache.addItem(event, start=time - 5*60*1000,
+                           duration=10*60*1000)
+
+    def _check(self, time: int, files: list):
+        ss = "open|/home/user/a.txt|fd 4: with flag 0, e0|/home/user"
+        event = Event(actor=self.app, time=time, syscallStr=ss)
+        with contextlib.redirect_stdout(io.StringIO()):
+            res = self.cache.checkForDesignation(event, files)
+        return dict((f.path, bool(flags & EventFileFlags.designation))
+                    for (f, flags) in res)
+
+    def test_zeitgeist_acts(self):
+        self._zgRead(1000000, [self.a.path, self.b.path])
+        self._zgRead(3000000, [self.c.path])
+
+        files = [self.a, self.b, self.c]
+        self.assertEqual(self._check(1100000, files),
+                         {self.a.path: True, self.b.path: True,
+                          self.c.path: False})
+        self.assertEqual(len(files), 3)
+
+        # The first act has expired, and the second one has started
+        self.assertEqual(self._check(2900000, files),
+                         {self.a.path: False, self.b.path: False,
+                          self.c.path: True})
+        self.assertEqual(self._check(3600000, files),
+                         {self.a.path: False, self.b.path: False,
+                          self.c.path: False})
+
+        # Going back in time gives access to expired acts again
+        self.assertEqual(self._check(1000000, [self.b]), {self.b.path: True})
+        self.assertEqual(self._check(600000, [self.b]), {self.b.path: False})
+
+    def test_cmdline_acts(self):
+        cmd = "@firefox|21|firefox /home/user/b.txt"
+        self.cache.addItem(Event(actor=self.app, time=5000, cmdlineStr=cmd))
+
+        self.assertEqual(self._check(4000, [self.b]), {self.b.path: False})
+        self.assertEqual(self._check(5000000, [self.a, self.b]),
+                         {self.a.path: False, self.b.path: True})
+
+        # Acts added after the clock has moved on are taken into account
+        self._zgRead(5500000, [self.a.path])
+        self.assertEqual(self._check(5600000, [self.a, self.b]),
+                         {self.a.path: True, self.b.path: True})
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+from Application import Application
+from DesktopIndex import DesktopIndex
+from ParseCache import ParseCache
+
+
+class TestDesktopIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = DesktopIndex.get()
+
+    def test_lookup(self):
+        (did, entry) = self.index.lookup("firefox.desktop")
+        self.assertEqual(did, "firefox")
+        self.assertEqual(entry.get("Name"), "Firefox Web Browser")
+        self.assertIs(self.index.lookup("firefox")[1], entry)
+        self.assertEqual(self.index.lookup("Eclipse")[0], "eclipse")
+        self.assertIsNone(self.index.lookup("not-an-app"))
+
+    def test_cache(self):
+        path = tempfile.mkdtemp()
+        try:
+            cache = ParseCache(path)
+            self.index.load(cache=cache)
+            DesktopIndex.reset()
+            index = DesktopIndex.get()
+            index.load(cache=cache)
+            (did, entry) = index.lookup("firefox")
+            self.assertEqual(did, "firefox")
+            self.assertEqual(entry.get("Name"), "Firefox Web Browser")
+        finally:
+            shutil.rmtree(path)
+
+    def test_cache_edited_entry(self):
+        path = tempfile.mkdtemp()
+        try:
+            apps = os.path.join(path, "applications") + "/"
+            os.mkdir(apps)
+            entry = apps + "editor.desktop"
+            with open(entry, 'w') as f:
+                f.write("[Desktop Entry]\nType=Application\nName=Old\n")
+            os.utime(entry, ns=(1000000000, 1000000000))
+            os.utime(apps, ns=(1000000000, 1000000000))
+
+            cache = ParseCache(os.path.join(path, "cache"))
+            self.index.load(path=apps, cache=cache)
+            self.assertEqual(self.index.lookup("editor")[1].get("Name"),
+                             "Old")
+
+            # Edit the entry in place, without changing the directory
+            with open(entry, 'w') as f:
+                f.write("[Desktop Entry]\nType=Application\nName=New\n")
+            os.utime(apps, ns=(1000000000, 1000000000))
+
+            DesktopIndex.reset()
+            index = DesktopIndex.get()
+            index.load(path=apps, cache=cache)
+            self.assertEqual(index.lookup("editor")[1].get("Name"), "New")
+        finally:
+            shutil.rmtree(path)
+
+    def test_settings(self):
+        app = Application("firefox.desktop", pid=1, tstart=0, tend=2)
+        types = app.getSetting("MimeType", type="string list")
+        self.assertIn("text/html", types)
+        types.append("not/a-type")
+        self.assertEqual(app.getSetting("MimeType", type="string list"),
+                         types[:-1])
+        self.assertEqual(app.getSetting("NoSuchKey", type="string list"), [])
+        self.assertEqual(app.getSetting("NoSuchKey", defaultValue=3), 3)
+
+        DesktopIndex.reset()
+        self.assertEqual(Application.settingCache, dict())
+
+    def tearDown(self):
+        DesktopIndex.reset()
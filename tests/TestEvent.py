@@ -0,0 +1,104 @@
+import unittest
+from Application import Application
+from Event import Event, exclItemsRORW
+from File import EventFileFlags
+from UserConfigLoader import UserConfigLoader
+from constants import FD_OPEN, FD_CLOSE
+from utils import __setLazyEvents as setLazyEvents, \
+                  __setCheckExcludedFiles as setCheckExcludedFiles
+
+
+class TestEvent(unittest.TestCase):
+    def setUp(self):
+        self.app = Application("firefox.desktop", pid=21, tstart=0, tend=300)
+        self.calls = [
+            "open|/home/user/a.txt|fd 4: with flag 577, e0|/home/user",
+            "open|b|c.txt|fd 5: with flag 0, e0|/home/user",
+            "open|/x|fd 4: with flag 0, e-2|/",
+            "open|/x|fd oops: with flag 0, e0|/",
+            "fopen|d.txt|FILE 0x1f2e: with flag 1, e0|/home/user",
+            "fopen|/e.txt|FILE (nil): with flag 0, e-1|/",
+            "opendir|/home/user/dir|DIR 0xab12: e0|/",
+            "unlink|/home/user/|e|e0|/",
+            "rmdir|dir|e39|/home/user",
+            "close|fd: 4|e0|",
+            "fclose|FILE: 0x1f2e|e0|",
+            "closedir|DIR: 0xab12|e0|",
+            "closedir|DIR: (nil)|e0|",
+            "open|/home/user/long\\\nname.txt|fd 4: with flag 0, e0|/",
+            "unknown|call",
+        ]
+
+    def _parseAll(self, fast: bool):
+        Event.fastTokenizer = fast
+        events = [Event(actor=self.app, time=t+1, syscallStr=s)
+                  for (t, s) in enumerate(self.calls)]
+        return [(int(e.evflags),
+                 [(f.path, f.ftype) for f in e.data or []],
+                 e.data_app) for e in events]
+
+    def test_fast_tokenizer(self):
+        self.assertEqual(self._parseAll(False), self._parseAll(True))
+
+    def test_split_functions(self):
+        self.assertEqual(Event._splitOpen("a|b|fd 4: with flag 2, e0|/c"),
+                         ("a|b", 4, 2, 0, "/c"))
+        self.assertIsNone(Event._splitOpen("a|fd 4: with flag x, e0|/c"))
+        self.assertEqual(Event._splitFopen("a|FILE (nil): with flag 0, e-1|"),
+                         ("a", -1, 0, -1, ""))
+        self.assertIsNone(Event._splitFclose("FILE: (nil)|e0|"))
+        self.assertEqual(Event._splitClose("fd: -1|e-9|"), (-1, -9))
+
+    def test_parse_syscall(self):
+        Event.fastTokenizer = True
+        ev = Event(actor=self.app, time=1, syscallStr=self.calls[0])
+        self.assertFalse(ev.isInvalid())
+        self.assertEqual(ev.data[0].path, "/home/user/a.txt")
+        self.assertEqual(ev.data_app, [(4, "/home/user/a.txt", FD_OPEN)])
+        self.assertTrue(ev.evflags & EventFileFlags.create)
+        self.assertTrue(ev.evflags & EventFileFlags.write)
+
+        ev = Event(actor=self.app, time=2, syscallStr=self.calls[9])
+        self.assertEqual(ev.data_app, [(4, None, FD_CLOSE)])
+
+        ev = Event(actor=self.app, time=3, syscallStr=self.calls[-1])
+        self.assertTrue(ev.isInvalid())
+
+    def test_lazy_parse(self):
+        eager = self._parseAll(True)
+
+        setLazyEvents(True)
+        events = [Event(actor=self.app, time=t+1, syscallStr=s)
+                  for (t, s) in enumerate(self.calls)]
+        for event in events:
+            self.assertIsNone(event.data)
+            self.assertIs(event.actor, self.app)
+            self.assertTrue(event.parse())
+            self.assertFalse(event.parse())
+        lazy = [(int(e.evflags),
+                 [(f.path, f.ftype) for f in e.data or []],
+                 e.data_app) for e in events]
+        self.assertEqual(eager, lazy)
+
+    def test_check_excluded(self):
+        UserConfigLoader.get("user.ini")
+        setCheckExcludedFiles(True)
+        calls = ["open|/tmp/a.txt|fd 4: with flag 0, e0|/",
+                 "open|/home/user/.cache/b|fd 4: with flag 0, e0|/",
+                 "open|/home/user/c.txt|fd 4: with flag 0, e0|/",
+                 "open|/media/user/d.txt|fd 4: with flag 0, e0|/"]
+        events = [Event(actor=self.app, time=t+1, syscallStr=s)
+                  for (t, s) in enumerate(calls)]
+        self.assertEqual([e.isInvalid() for e in events],
+                         [True, False, False, False])
+
+        # User files read by the app are counted for each excluded directory
+        rorw = exclItemsRORW[self.app.uid()]["/tmp/"]
+        self.assertEqual(rorw[0], 1)
+        self.assertEqual(rorw[4], set(["/home/user/c.txt",
+                                       "/media/user/d.txt"]))
+
+    def tearDown(self):
+        setCheckExcludedFiles(False)
+        setLazyEvents(False)
+        Event.fastTokenizer = True
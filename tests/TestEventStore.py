@@ -1,7 +1,11 @@
 import unittest
 from Application import Application
+from ApplicationStore import ApplicationStore
 from Event import Event
 from EventStore import EventStore
+from FileFactory import FileFactory
+from FileStore import FileStore
+from utils import __setLazyEvents as setLazyEvents
 
 
 class TestEventStore(unittest.TestCase):
@@ -53,5 +57,100 @@ class TestEventStore(unittest.TestCase):
         sorte = [first, second, third, last]
         self.assertEqual(sorte, alle)
 
+    def test_simulate_lazy_events(self):
+        setLazyEvents(True)
+        app = Application("firefox.desktop", pid=21, tstart=0, tend=10)
+        ApplicationStore.get().insert(app)
+        valid = Event(app, 1, syscallStr="open|/home/user/f|fd 4: with flag "
+                                         "64, e0|/home/user")
+        invalid = Event(app, 2, syscallStr="open|/home/user/g|fd -1: with "
+                                           "flag 0, e-2|/home/user")
+        unknown = Event(app, 3, syscallStr="test")
+        for event in (valid, invalid, unknown):
+            self.assertIsNone(event.data)
+            self.store.append(event)
+
+        # Events that were not loaded lazily are kept, even if invalid.
+        eager = Event(app, 4, cmdlineStr="@firefox|21|firefox")
+        eager.markInvalid()
+        self.store.append(eager)
+
+        self.store.simulateAllEvents()
+        self.assertEqual(self.store.getAllEvents(), [valid, eager])
+        self.assertIsNone(invalid.data_app)
+        self.assertIsNone(unknown.data_app)
+        self.assertEqual(valid.data[0].path, "/home/user/f")
+        f = FileStore.get().getFilesForName("/home/user/f")[0]
+        self.assertEqual(len(f.accesses), 1)
+        self.assertEqual(FileStore.get().getFilesForName("/home/user/g"), [])
+
+    def test_simulate_lazy_error(self):
+        setLazyEvents(True)
+        app = Application("firefox.desktop", pid=21, tstart=0, tend=10)
+        ApplicationStore.get().insert(app)
+        events = [Event(app, 1, syscallStr="test"),
+                  Event(app, 2, syscallStr="open|/home/user/f|fd 4: with "
+                                           "flag 64, e0|/home/user"),
+                  Event(app, 3, syscallStr="test"),
+                  Event(app, 4, syscallStr="test")]
+        for event in events:
+            self.store.append(event)
+
+        simulateEvent = self.store.simulateEvent
+
+        def _simulateEvent(event, fileFactory, fileStore):
+            if event.time == 3:
+                raise ValueError("failed")
+            return simulateEvent(event, fileFactory, fileStore)
+
+        self.store.simulateEvent = _simulateEvent
+        with self.assertRaises(ValueError):
+            self.store.simulateAllEvents()
+        self.assertEqual(self.store.getAllEvents(), events[1:])
+
+    def test_simulate_streaming(self):
+        app = Application("firefox.desktop", pid=21, tstart=0, tend=10)
+        ApplicationStore.get().insert(app)
+        cmd = "@firefox|21|firefox /home/user/f"
+        self.store.append(Event(app, 1, cmdlineStr=cmd))
+        self.store.append(Event(app, 2, syscallStr="open|/home/user/f|fd 4: "
+                                                   "with flag 0, e0|/"))
+        self.store.append(Event(app, 3, syscallStr="test"))
+
+        self.store.simulateAllEvents(streaming=True)
+        self.assertEqual(self.store.getAllEvents(), [])
+        self.assertEqual(self.store.desigcache.store, dict())
+        f = FileStore.get().getFilesForName("/home/user/f")[0]
+        self.assertEqual(len(f.accesses), 1)
+        self.assertTrue(f.accesses[0].isByDesignation())
+
+    def test_simulate_streaming_error(self):
+        app = Application("firefox.desktop", pid=21, tstart=0, tend=10)
+        ApplicationStore.get().insert(app)
+        events = [Event(app, t, syscallStr="open|/home/user/f%d|fd 4: with "
+                                           "flag 0, e0|/" % t)
+                  for t in range(1, 5)]
+        for event in events:
+            self.store.append(event)
+
+        simulateEvent = self.store.simulateEvent
+
+        def _simulateEvent(event, fileFactory, fileStore):
+            if event.time == 3:
+                raise ValueError("failed")
+            return simulateEvent(event, fileFactory, fileStore)
+
+        self.store.simulateEvent = _simulateEvent
+        with self.assertRaises(ValueError):
+            self.store.simulateAllEvents(streaming=True)
+        self.assertEqual(self.store.getAllEvents(), events[2:])
+        self.assertEqual(FileStore.get().getFilesForName("/home/user/f3"), [])
+        self.assertEqual(len(FileStore.get().getFilesForName(
+                         "/home/user/f2")), 1)
+
     def tearDown(self):
+        setLazyEvents(False)
         EventStore.reset()
+        FileStore.reset()
+        ApplicationStore.reset()
+        FileFactory.reset()
@@ -4,7 +4,7 @@ from ApplicationStore import ApplicationStore
 from Event import Event
 from EventStore import EventStore
 from FileStore import FileStore
-from File import EventFileFlags
+from File import EventFileFlags, File, FileStub
 from FileFactory import FileFactory
 from UserConfigLoader import UserConfigLoader
 
@@ -75,5 +75,44 @@ class TestFile(unittest.TestCase):
         self.assertTrue(file2.isHidden())
         self.assertTrue(file3.isHidden())
 
+    def test_accesses(self):
+        app = Application("firefox.desktop", pid=21, tstart=0, tend=300)
+        file1 = File("/path/to/first")
+        self.assertFalse(file1.hasAccesses())
+        file1.addAccess(app, 10, EventFileFlags.read)
+        file1.addAccess(app, 20, EventFileFlags.write |
+                        EventFileFlags.designation)
+        file1.addAccess(app, 30, EventFileFlags.read | EventFileFlags.write)
+
+        self.assertTrue(file1.hasAccesses())
+        self.assertEqual(file1.getAccessCount(), 3)
+        self.assertEqual(file1.getAccessCount(EventFileFlags.write), 2)
+        self.assertEqual([a.time for a in
+                          file1.getAccesses(EventFileFlags.read)], [10, 30])
+        self.assertEqual([a.time for a in file1.getAccesses(after=10)],
+                         [20, 30])
+        acc = next(file1.getAccesses(EventFileFlags.designation))
+        self.assertIs(acc.actor, app)
+        self.assertTrue(acc.isByDesignation())
+        self.assertEqual(acc.evflags,
+                         EventFileFlags.write | EventFileFlags.designation)
+
+        # FileAccess objects are reused until another access is added.
+        self.assertIs(file1.accesses, file1.accesses)
+        self.assertIs(next(file1.getAccesses(after=10)), file1.accesses[1])
+        other = Application("gimp.desktop", pid=22, tstart=0, tend=300)
+        file1.addAccess(other, 40, EventFileFlags.read)
+        self.assertEqual(len(file1.accesses), 4)
+        self.assertIs(file1.accesses[3].actor, other)
+        self.assertIs(file1.accesses[0].actor, app)
+
+    def test_paths_interned(self):
+        path = "".join(["/path/to/", "first"])
+        stub = FileStub("".join(["/path/to/", "first"]))
+        file1 = File(path)
+        self.assertIs(stub.path, file1.path)
+        self.assertIs(File.getParentNameFromName(path + "/child"),
+                      file1.path)
+
     def tearDown(self):
         FileFactory.reset()
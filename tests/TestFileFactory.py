@@ -60,6 +60,27 @@ class TestFileFactory(unittest.TestCase):
         f3 = self.factory.getFile(path, 0)
         self.assertEqual(f3.getTimeOfEnd(), 100)
 
+    def test_parent_folders(self):
+        app = Application("firefox.desktop", pid=21, tstart=0, tend=300)
+        self.appStore.insert(app)
+
+        self.factory.getFile("/home/user/docs/a.txt", 10)
+        parent = self.fileStore.getFilesForName("/home/user/docs")[0]
+        self.assertTrue(parent.isFolder())
+        self.factory.getFile("/home/user/docs/b.txt", 20)
+        self.assertEqual(self.fileStore.getFilesForName("/home/user/docs"),
+                         [parent])
+
+        # Deleting an ancestor must cause parents to be created again
+        home = self.fileStore.getFilesForName("/home/user")[0]
+        self.factory.deleteFile(home, app, 30, EventFileFlags.no_flags)
+        self.assertEqual(parent.getTimeOfEnd(), 30)
+        self.factory.getFile("/home/user/docs/c.txt", 40)
+        self.assertEqual(len(self.fileStore.getFilesForName("/home/user")), 2)
+        docs = self.fileStore.getFilesForName("/home/user/docs")
+        self.assertEqual(len(docs), 2)
+        self.assertEqual(docs[1].getTimeOfStart(), 30)
+
     # TODO test file links
 
     def tearDown(self):
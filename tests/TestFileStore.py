@@ -29,6 +29,23 @@ class TestFileStore(unittest.TestCase):
         self.assertTrue(file1 in children)
         self.assertTrue(file2 in children)
 
+    def test_get_direct_children(self):
+        file1 = File("/path/to/file", 0, 5, "image/jpg")
+        file2 = File("/path/to/file", 6, 0, "image/jpg")
+        file3 = File("/path/to/dir", 0, 0, "inode/directory")
+        file4 = File("/path/to/dir/file", 0, 0, "image/jpg")
+        file5 = File("/path/tofile", 0, 0, "image/jpg")
+        for f in (file1, file2, file3, file4, file5):
+            self.fileStore.addFile(f)
+
+        self.assertEqual(self.fileStore.getChildrenFromPath("/path/to/", 3),
+                         [file1, file3])
+        self.assertEqual(self.fileStore.getChildrenFromPath("/path/to/", 7),
+                         [file2, file3])
+        self.assertEqual(self.fileStore.getChildren(file3, 7), [file4])
+        self.assertEqual(self.fileStore.getChildrenFromPath("/path/", -1),
+                         [file5])
+
     def test_iteration(self):
         file1 = File("/path/to/file", 0, 0, "image/jpg")
         file2 = File("/path/to/document", 0, 5, "image/jpg")
@@ -45,6 +62,63 @@ class TestFileStore(unittest.TestCase):
         self.assertEqual(rebuilt[1], file3)
         self.assertEqual(rebuilt[2], file1)
 
+    def test_iteration_after_insert(self):
+        file1 = File("/path/to/file", 0, 0, "image/jpg")
+        file2 = File("/path/to/document", 0, 0, "image/jpg")
+        file3 = File("@fdref:4", 0, 0, "")
+        self.fileStore.addFile(file1)
+        self.assertEqual(list(self.fileStore), [file1])
+
+        self.fileStore.addFile(file2)
+        self.fileStore.addFile(file3)
+        self.assertEqual(list(self.fileStore), [file2, file1, file3])
+        self.assertEqual(set(self.fileStore.iterUnsorted()),
+                         set([file1, file2, file3]))
+
+        self.fileStore.purgeFDReferences()
+        self.assertEqual(list(self.fileStore), [file2, file1])
+
+    def test_version_index(self):
+        name = "/path/to/lock"
+        files = [File(name, t*10, t*10+5, "") for t in range(100)]
+        files.append(File(name, 1000, 0, ""))
+        for f in files:
+            self.fileStore.addFile(f)
+
+        def _linear(time):
+            for (index, f) in enumerate(files):
+                if time < f.tstart or not f.tend or f.tend >= time:
+                    return index
+            return len(files)
+
+        for time in range(0, 1010, 3):
+            self.assertEqual(self.fileStore.getVersionIndex(name, time),
+                             _linear(time))
+
+        # Shortening a version breaks the order, so the store stops bisecting
+        files[50].setTimeOfEnd(1)
+        self.fileStore.updateFile(files[50])
+        for time in range(0, 1010, 3):
+            self.assertEqual(self.fileStore.getVersionIndex(name, time),
+                             _linear(time))
+
+    def test_update_renamed(self):
+        file1 = File("/path/to/a", 0, 5, "")
+        file2 = File("/path/to/a", 6, 7, "")
+        file3 = File("/path/to/a", 8, 0, "")
+        for f in (file1, file2, file3):
+            self.fileStore.addFile(f)
+
+        file2.path = "/path/to/b"
+        self.fileStore.updateFile(file2, oldName="/path/to/a")
+        self.assertEqual(self.fileStore.getFilesForName("/path/to/a"),
+                         [file1, file3])
+        self.assertEqual(self.fileStore.getFilesForName("/path/to/b"),
+                         [file2])
+        file3.setTimeOfEnd(9)
+        self.fileStore.updateFile(file3)
+        self.assertEqual(self.fileStore.getVersionIndex("/path/to/a", 9), 1)
+
     def getChildren(self, f: File):
         parent = f.getName() + '/'
         children = []
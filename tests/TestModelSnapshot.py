@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+from Application import Application
+from ApplicationStore import ApplicationStore
+from File import File, EventFileFlags
+from FileFactory import FileFactory
+from FileStore import FileStore
+from ModelSnapshot import ModelSnapshot
+
+
+class TestModelSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.model = os.path.join(self.path, "model.pkl")
+        self.fileStore = FileStore.get()
+        self.appStore = ApplicationStore.get()
+
+    def test_save_and_load(self):
+        app = Application("firefox.desktop", pid=21, tstart=0, tend=300)
+        self.appStore.insert(app)
+
+        f1 = File("/home/user/file1", 10, 20, "text/plain")
+        f2 = File("/home/user/file2", 20, 0, "text/plain")
+        f1.addAccess(app, 10, EventFileFlags.create | EventFileFlags.write)
+        f1.addFollower(f2.inode, 20, "move")
+        f2.setPredecessor(f1.inode, 20, "move")
+        f2.addAccess(app, 30, EventFileFlags.read)
+        self.fileStore.addFile(f1)
+        self.fileStore.addFile(f2)
+
+        self.assertTrue(ModelSnapshot.save(self.model, dict(evCount=3)))
+        FileStore.get().clear()
+        ApplicationStore.get().clear()
+        FileFactory.reset()
+
+        stats = ModelSnapshot.load(self.model)
+        self.assertEqual(stats, dict(evCount=3))
+        self.assertIs(FileStore.get(), self.fileStore)
+        self.assertEqual(len(self.fileStore), 2)
+
+        app = self.appStore.lookupUid("firefox:21:0")
+        self.assertIsNotNone(app)
+        self.assertEqual(app.getSetting("Name"), "Firefox Web Browser")
+
+        f1 = self.fileStore.getFile(f1.inode)
+        f2 = self.fileStore.getFile(f2.inode)
+        self.assertEqual(f1.getFollowers()[0].inode, f2.inode)
+        self.assertEqual(f2.getPredecessor().inode, f1.inode)
+        self.assertEqual(len(list(f2.getAccesses())), 1)
+        self.assertIs(list(f1.getAccesses())[0].actor, app)
+        self.assertEqual(FileFactory.get().getFileLinks(),
+                         {f2.getPredecessor(): f2.inode})
+
+        f3 = File("/home/user/file3")
+        self.assertGreater(f3.inode, f2.inode)
+
+    def test_load_invalid(self):
+        with open(self.model, 'wb') as f:
+            f.write(b"not a model")
+        self.assertRaises(ValueError, ModelSnapshot.load, self.model)
+        self.assertRaises(ValueError, ModelSnapshot.load,
+                          os.path.join(self.path, "missing.pkl"))
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        FileStore.reset()
+        ApplicationStore.reset()
+        FileFactory.reset()
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+from ParseCache import ParseCache
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.cache = ParseCache(os.path.join(self.path, "cache"))
+        self.file = os.path.join(self.path, "data.log")
+        with open(self.file, 'w') as f:
+            f.write("content\n")
+
+    def test_miss_and_hit(self):
+        (sig, data) = self.cache.load("test", self.file)
+        self.assertIsNone(data)
+        self.cache.save("test", self.file, sig, [(1, "a"), (2, "b")])
+
+        (sig2, data) = self.cache.load("test", self.file)
+        self.assertEqual(sig, sig2)
+        self.assertEqual(data, [(1, "a"), (2, "b")])
+
+        (__, data) = self.cache.load("other", self.file)
+        self.assertIsNone(data)
+
+    def test_invalidation(self):
+        (sig, __) = self.cache.load("test", self.file)
+        self.cache.save("test", self.file, sig, "parsed")
+
+        with open(self.file, 'a') as f:
+            f.write("more content\n")
+        (__, data) = self.cache.load("test", self.file)
+        self.assertIsNone(data)
+
+    def test_extra_paths(self):
+        extra = self.file + "-wal"
+        (sig, __) = self.cache.load("test", self.file, [extra])
+        self.cache.save("test", self.file, sig, "parsed")
+        (__, data) = self.cache.load("test", self.file, [extra])
+        self.assertEqual(data, "parsed")
+
+        with open(extra, 'w') as f:
+            f.write("uncommitted\n")
+        (__, data) = self.cache.load("test", self.file, [extra])
+        self.assertIsNone(data)
+
+    def test_version(self):
+        (sig, __) = self.cache.load("test", self.file)
+        self.cache.save("test", self.file, sig, "parsed")
+
+        version = ParseCache.version
+        try:
+            ParseCache.version += 1
+            (__, data) = self.cache.load("test", self.file)
+            self.assertIsNone(data)
+        finally:
+            ParseCache.version = version
+        (__, data) = self.cache.load("test", self.file)
+        self.assertEqual(data, "parsed")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        self.cache = None
@@ -1,4 +1,13 @@
+import contextlib
+import gzip
+import io
+import lzma
+import os
+import shutil
+import tempfile
 import unittest
+from ApplicationStore import ApplicationStore
+from ParseCache import ParseCache
 from PreloadLoggerLoader import PreloadLoggerLoader
 
 
@@ -103,3 +112,120 @@ class TestPreloadLoggerLoader(unittest.TestCase):
 
     def tearDown(self):
         self.loader = None
+
+
+class TestPreloadLoggerLoaderFiles(unittest.TestCase):
+    logs = {
+        '2016-07-01_1234_1467384000.log':
+            '@firefox|1234|/usr/bin/firefox\n'
+            '1467384000|open|/home/user/a.txt|fd 3: with flag 0, e0|/home\n'
+            '1467384000|close|fd: 3|e0|\n'
+            '1467384002|rename\n'
+            ' /home/user/a.txt|Old file|/home\n'
+            ' /home/user/b.txt|New file: with flags 0, e0|/home\n'
+            '1467384003|close|fd: 4|e0|\n',
+        '2016-07-01_1240_1467384010.log':
+            'corrupted\n'
+            '@gedit|1240|gedit /home/user/b.txt\n'
+            '1467384010|open|/home/user/b.txt|fd 3: with flag 2, e0|/home\n'
+            '1467384011|close|fd: 3|e0|\n',
+        '2016-07-01_1250_1467384020.log':
+            '@gedit|1250|gedit\n',
+        '2016-07-01_1260_1467384030.log':
+            '',
+    }
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        for (name, content) in self.logs.items():
+            with open(os.path.join(self.path, name), 'w') as f:
+                f.write(content)
+        self.loader = PreloadLoggerLoader(self.path)
+
+    def test_parse_log_file(self):
+        res = self.loader.parseLogFile('2016-07-01_1234_1467384000.log')
+        (status, g, interpreterid, tstart, tend, syscalls, msgs) = res
+        self.assertEqual(status, 'valid')
+        self.assertEqual(g, ('firefox', '1234', '/usr/bin/firefox'))
+        self.assertIsNone(interpreterid)
+        self.assertEqual(tstart, 1467384000000)
+        self.assertEqual(tend, 1467384003000)
+        self.assertEqual(len(syscalls), 3)
+        self.assertEqual(syscalls[1], (1467384000001, 'close|fd: 3|e0|'))
+        self.assertEqual(syscalls[2][1], 'rename\n'
+                         ' /home/user/a.txt|Old file|/home\n'
+                         ' /home/user/b.txt|New file: with flags 0, e0|/home')
+
+        res = self.loader.parseLogFile('2016-07-01_1240_1467384010.log')
+        self.assertEqual(res[0], 'valid')
+        self.assertEqual(res[1][0], 'gedit')
+
+        res = self.loader.parseLogFile('2016-07-01_1250_1467384020.log')
+        self.assertEqual(res[0], 'nosyscalls')
+        res = self.loader.parseLogFile('2016-07-01_1260_1467384030.log')
+        self.assertEqual(res[0], 'empty')
+
+    def test_compressed_logs(self):
+        name = '2016-07-01_1234_1467384000.log'
+        content = self.logs[name].encode('utf-8')
+        with gzip.open(os.path.join(self.path, name + '.gz'), 'wb') as f:
+            f.write(content)
+        with lzma.open(os.path.join(self.path, '2016-07-01_1235_1467384000'
+                                    '.log.xz'), 'wb') as f:
+            f.write(content)
+        with open(os.path.join(self.path, '2016-07-01_1236_1467384000.log.gz'),
+                  'wb') as f:
+            f.write(gzip.compress(content)[:-20])
+
+        plain = self.loader.parseLogFile(name)
+        res = self.loader.parseLogFile(name + '.gz')
+        self.assertEqual(plain, res)
+        res = self.loader.parseLogFile('2016-07-01_1235_1467384000.log.xz')
+        self.assertEqual(plain, res)
+        res = self.loader.parseLogFile('2016-07-01_1236_1467384000.log.gz')
+        self.assertEqual(res[1], plain[1])
+        self.assertTrue(res[-1][-1][0].endswith('could not be entirely '
+                                                'decompressed: Compressed file'
+                                                ' ended before the end-of-'
+                                                'stream marker was reached'))
+
+        # The .log.gz copy of an existing .log file is not loaded
+        store = ApplicationStore()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.loader.loadDb(store)
+        self.assertEqual(self.loader.instCount, 3)
+
+    def test_parallel_load(self):
+        serial = ApplicationStore()
+        parallel = ApplicationStore()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.loader.loadDb(serial)
+            self.loader.loadDb(parallel, jobs=2)
+
+        self.assertEqual(self.loader.instCount, 2)
+        self.assertEqual(self.loader.eventCount, 4)
+        self.assertEqual([a.uid() for a in serial],
+                         [a.uid() for a in parallel])
+        for (a, b) in zip(serial, parallel):
+            self.assertEqual([(e.time, e.evflags) for e in a.events],
+                             [(e.time, e.evflags) for e in b.events])
+
+    def test_cached_load(self):
+        cache = ParseCache(os.path.join(self.path, 'cache'))
+        serial = ApplicationStore()
+        cached = ApplicationStore()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.loader.loadDb(serial)
+            self.loader.loadDb(ApplicationStore(), cache=cache)
+            self.loader.parseLogFile = lambda *args, **kwargs: self.fail()
+            self.loader.loadDb(cached, jobs=2, cache=cache)
+
+        self.assertEqual([a.uid() for a in serial],
+                         [a.uid() for a in cached])
+        for (a, b) in zip(serial, cached):
+            self.assertEqual([(e.time, e.evflags) for e in a.events],
+                             [(e.time, e.evflags) for e in b.events])
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        self.loader = None
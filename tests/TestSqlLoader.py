@@ -0,0 +1,303 @@
+import contextlib
+import io
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from ApplicationStore import ApplicationStore
+from SqlEvent import SqlEvent, SqlEventSubject
+from SqlLoader import SqlLoader
+from constants import EV_ID, EV_TIMESTAMP, EV_INTERPRETATION, \
+                      EV_MANIFESTATION, EV_SUBJ_URI, EV_SUBJ_INTERPRETATION, \
+                      EV_SUBJ_MANIFESTATION, EV_SUBJ_ORIGIN_URI, \
+                      EV_SUBJ_MIMETYPE, EV_SUBJ_TEXT, EV_SUBJ_STORAGE, \
+                      EV_EVENT_ORIGIN_URI, EV_SUBJ_CURRENT_URI, EV_ACTOR_URI
+
+SCHEMA = """
+CREATE TABLE interpretation (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE manifestation (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE mimetype (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE actor (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE uri (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE text (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE storage (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE event (id INTEGER, timestamp INTEGER, interpretation INTEGER,
+                    manifestation INTEGER, actor INTEGER, subj_id INTEGER,
+                    subj_id_current INTEGER, subj_interpretation INTEGER,
+                    subj_manifestation INTEGER, subj_origin INTEGER,
+                    subj_mimetype INTEGER, subj_text INTEGER,
+                    subj_storage INTEGER, origin INTEGER);
+CREATE INDEX event_id ON event(id);
+CREATE INDEX event_subj_id ON event(subj_id);
+INSERT INTO interpretation VALUES
+    (1, 'activity://gui-toolkit/gtk3/FileChooser/FileAccess');
+INSERT INTO manifestation VALUES (1, 'zg#UserActivity');
+INSERT INTO mimetype VALUES (1, 'text%2Fplain');
+INSERT INTO actor VALUES (1, 'application://gedit.desktop'),
+                         (2, 'application://firefox.desktop');
+INSERT INTO storage VALUES (1, 'local');
+INSERT INTO uri VALUES (1, 'activity://null///pid://300///'),
+                       (2, 'activity://null///pid://200///'),
+                       (3, 'activity://null///'),
+                       (4, 'file:///home/user/a.txt'),
+                       (5, 'file:///home/user/b.txt');
+"""
+
+# Events as (id, timestamp, actor, subjects)
+EVENTS = [(1, 1000, 1, (1, 4)),
+          (2, 2000, 2, (2, 5)),
+          (3, 3000, 1, (4, 1)),
+          (4, 4000, 1, (3, 5)),
+          (5, 5000, 2, (2, 4, 5)),
+          (6, 6000, 1, (5,))]
+
+
+class TestSqlLoader(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.db = os.path.join(self.path, 'activity.sqlite')
+        con = sqlite3.connect(self.db)
+        con.executescript(SCHEMA)
+        for (id, timestamp, actor, subjects) in EVENTS:
+            for subj in subjects:
+                con.execute("INSERT INTO event VALUES (?, ?, 1, 1, ?, ?, ?, "
+                            "1, 1, NULL, 1, NULL, 1, NULL)",
+                            (id, timestamp, actor, subj, subj))
+        con.commit()
+        con.close()
+
+    def test_lookup_tables(self):
+        loader = SqlLoader(self.db)
+        self.assertEqual(loader.getMimeType(1), 'text/plain')
+        self.assertEqual(loader.getManifestation(1), 'zg#UserActivity')
+        loader.mimetypes[2] = 'image/png'
+        self.assertIsNone(SqlLoader(self.db).getMimeType(2))
+
+    def test_stream_events(self):
+        loader = SqlLoader(self.db)
+        (eventsPerPid, nopids, count) = loader.loadEventsPerPid()
+        (stream, nopids2, count2) = loader.streamEventsPerPid()
+
+        self.assertEqual((nopids, count), (1, 5))
+        self.assertEqual((nopids2, count2), (1, 5))
+        streamed = [(pid, [(e.id, e.pid, len(e.subjects)) for e in events])
+                    for (pid, events) in stream]
+        self.assertEqual(streamed, [(200, [(2, 200, 2), (5, 200, 3)]),
+                                    (300, [(1, 300, 2), (3, 300, 2)])])
+        self.assertEqual(sorted(streamed),
+                         sorted((pid, [(e.id, e.pid, len(e.subjects))
+                                       for e in events])
+                                for (pid, events) in eventsPerPid.items()))
+
+    def test_streaming_load(self):
+        store = ApplicationStore()
+        streamed = ApplicationStore()
+        loader = SqlLoader(self.db)
+        with contextlib.redirect_stdout(io.StringIO()):
+            loader.loadDb(store)
+            loader.loadDb(streamed, streaming=True)
+
+        self.assertEqual(loader.instCount, 2)
+        self.assertEqual(loader.eventCount, 5)
+        self.assertEqual(sorted(a.uid() for a in store),
+                         sorted(a.uid() for a in streamed))
+        self.assertEqual(sorted((e.time, e.evflags) for a in store
+                                for e in a.events),
+                         sorted((e.time, e.evflags) for a in streamed
+                                for e in a.events))
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+
+# The tables and event_view of a Zeitgeist database, as SqlLoader used to
+# read them before it queried the event table.
+ZG_SCHEMA = """
+CREATE TABLE interpretation (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE manifestation (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE mimetype (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE actor (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE uri (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE text (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE);
+CREATE TABLE payload (id INTEGER PRIMARY KEY, value BLOB);
+CREATE TABLE storage (id INTEGER PRIMARY KEY, value VARCHAR UNIQUE,
+                      state INTEGER, icon VARCHAR, display_name VARCHAR);
+CREATE TABLE event (id INTEGER, timestamp INTEGER, interpretation INTEGER,
+                    manifestation INTEGER, actor INTEGER, payload INTEGER,
+                    subj_id INTEGER, subj_id_current INTEGER,
+                    subj_interpretation INTEGER, subj_manifestation INTEGER,
+                    subj_origin INTEGER, subj_origin_current INTEGER,
+                    subj_mimetype INTEGER, subj_text INTEGER,
+                    subj_storage INTEGER, origin INTEGER);
+CREATE INDEX event_id ON event(id);
+CREATE INDEX event_subj_id ON event(subj_id);
+CREATE VIEW event_view AS
+ SELECT event.id, event.timestamp, event.interpretation, event.manifestation,
+ event.actor,
+ (SELECT value FROM payload WHERE payload.id=event.payload) AS payload,
+ (SELECT value FROM uri WHERE uri.id=event.subj_id) AS subj_uri,
+ event.subj_id, event.subj_interpretation, event.subj_manifestation,
+ event.subj_origin,
+ (SELECT value FROM uri WHERE uri.id=event.subj_origin) AS subj_origin_uri,
+ event.subj_mimetype,
+ (SELECT value FROM text WHERE text.id = event.subj_text) AS subj_text,
+ (SELECT value FROM storage WHERE storage.id=event.subj_storage)
+  AS subj_storage,
+ (SELECT state FROM storage WHERE storage.id=event.subj_storage)
+  AS subj_storage_state,
+ event.origin,
+ (SELECT value FROM uri WHERE uri.id=event.origin) AS event_origin_uri,
+ (SELECT value FROM uri WHERE uri.id=event.subj_id_current)
+  AS subj_current_uri,
+ event.subj_id_current, event.subj_text AS subj_text_id,
+ event.subj_storage AS subj_storage_id,
+ (SELECT value FROM actor WHERE actor.id=event.actor) AS actor_uri,
+ event.subj_origin_current,
+ (SELECT value FROM uri WHERE uri.id=event.subj_origin_current)
+  AS subj_origin_current_uri
+ FROM event;
+INSERT INTO interpretation VALUES
+    (1, 'activity://gui-toolkit/gtk3/FileChooser/FileAccess'),
+    (2, 'zg#AccessEvent');
+INSERT INTO manifestation VALUES (1, 'zg#UserActivity');
+INSERT INTO mimetype VALUES (1, 'text%2Fplain'), (2, 'image/png');
+INSERT INTO actor VALUES (1, 'application://gedit.desktop'),
+                         (2, 'application://firefox.desktop');
+INSERT INTO payload VALUES (1, X'00ff');
+INSERT INTO text VALUES (1, 'a.txt');
+INSERT INTO storage VALUES (1, 'local', 1, NULL, NULL);
+INSERT INTO uri VALUES (1, 'activity://null///pid://300///'),
+                       (2, 'activity://null///pid://200///'),
+                       (3, 'activity://null///'),
+                       (4, 'file:///home/user/a.txt'),
+                       (5, 'file:///home/user/b.txt'),
+                       (6, 'file:///home/user/Downloads');
+"""
+
+# Subjects as (event id, timestamp, actor, payload, subject, interpretation,
+# origin, mimetype, text, storage, event origin), in the order of their rows.
+ZG_ROWS = [
+    # Several subjects, the pid last, and all values set
+    (1, 1000, 1, 1, 4, 2, 6, 1, 1, 1, 6),
+    (1, 1000, 1, 1, 1, 1, None, None, None, 1, 6),
+    # Three subjects, with NULL payload, text and storage
+    (2, 2000, 2, None, 2, 1, None, None, None, None, None),
+    (2, 2000, 2, None, 4, 2, 6, 1, None, None, None),
+    (2, 2000, 2, None, 5, 2, None, 2, None, None, None),
+    # No pid
+    (3, 3000, 1, None, 3, 1, None, None, None, None, None),
+    (3, 3000, 1, None, 5, 2, None, 1, 1, 1, None),
+    # No activity:// subject, so not loaded
+    (4, 4000, 2, 1, 4, 2, None, 1, 1, 1, None),
+    # A single subject holding the pid
+    (5, 5000, 2, None, 2, 1, None, None, None, None, None),
+    # Events interleaved with other events' rows
+    (6, 6000, 1, None, 5, 2, None, 1, None, 1, None),
+    (7, 7000, 1, None, 1, 1, None, None, None, None, None),
+    (6, 6000, 1, None, 1, 1, None, None, None, None, None),
+]
+
+
+class TestSqlLoaderEventView(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.db = os.path.join(self.path, 'activity.sqlite')
+        con = sqlite3.connect(self.db)
+        con.executescript(ZG_SCHEMA)
+        for (id, timestamp, actor, payload, subj, interpretation, origin,
+             mimetype, text, storage, evOrigin) in ZG_ROWS:
+            con.execute("INSERT INTO event VALUES (?, ?, 1, 1, ?, ?, ?, ?, ?, "
+                        "1, ?, NULL, ?, ?, ?, ?)",
+                        (id, timestamp, actor, payload, subj, subj,
+                         interpretation, origin, mimetype, text, storage,
+                         evOrigin))
+        con.commit()
+        con.close()
+
+    def _viewEvents(self, loader: SqlLoader):
+        """Load events through event_view, as SqlLoader used to."""
+        con = sqlite3.connect(self.db)
+        cur = con.execute("SELECT * FROM event_view WHERE id IN "
+                          "(SELECT DISTINCT id FROM event_view "
+                          "WHERE subj_uri LIKE 'activity://%')")
+        events = dict()
+        for data in cur:
+            pid = 0
+            if "pid://" in data[EV_SUBJ_URI]:
+                m = re.search(r'(?<=pid://)\d+', data[EV_SUBJ_URI])
+                pid = int(m.group(0)) if m else 0
+
+            ev = events.get(data[EV_ID])
+            if not ev:
+                ev = SqlEvent(id=data[EV_ID],
+                              pid=pid,
+                              timestamp=data[EV_TIMESTAMP],
+                              interpretation=loader.getInterpretation(
+                                             data[EV_INTERPRETATION]),
+                              manifestation=loader.getManifestation(
+                                            data[EV_MANIFESTATION]),
+                              origin_uri=data[EV_EVENT_ORIGIN_URI],
+                              actor_uri=data[EV_ACTOR_URI])
+                events[data[EV_ID]] = ev
+            elif pid and not ev.pid:
+                ev.pid = pid
+            ev.addSubject(SqlEventSubject(
+                uri=data[EV_SUBJ_URI],
+                interpretation=loader.getInterpretation(
+                               data[EV_SUBJ_INTERPRETATION]),
+                manifestation=loader.getManifestation(
+                              data[EV_SUBJ_MANIFESTATION]),
+                origin_uri=data[EV_SUBJ_ORIGIN_URI],
+                mimetype=loader.getMimeType(data[EV_SUBJ_MIMETYPE]),
+                text=data[EV_SUBJ_TEXT],
+                storage_uri=data[EV_SUBJ_STORAGE],
+                current_uri=data[EV_SUBJ_CURRENT_URI]))
+        con.close()
+        return list(events.values())
+
+    @staticmethod
+    def _summarise(events):
+        """Return the contents of SqlEvents, sorted by id, for comparisons."""
+        return sorted((e.id, e.pid, e.timestamp, e.interpretation,
+                       e.manifestation, e.origin_uri, e.actor_uri,
+                       [(s.uri, s.interpretation, s.manifestation,
+                         s.origin_uri, s.mimetype, s.text, s.storage_uri,
+                         s.current_uri) for s in e.subjects])
+                      for e in events)
+
+    def test_same_as_event_view(self):
+        loader = SqlLoader(self.db)
+        expected = self._summarise(self._viewEvents(loader))
+        self.assertEqual([e[0] for e in expected], [1, 2, 3, 5, 6, 7])
+
+        events = list(loader._iterEvents(SqlLoader.eventQuery))
+        self.assertEqual(self._summarise(events), expected)
+
+        # Subjects keep their values, and NULL values are kept as None
+        (first, second) = [e for e in expected if e[0] in (1, 2)]
+        self.assertEqual(first[5], 'file:///home/user/Downloads')
+        self.assertEqual(first[7][0], ('file:///home/user/a.txt',
+                                       'zg#AccessEvent', 'zg#UserActivity',
+                                       'file:///home/user/Downloads',
+                                       'text/plain', 'a.txt', 'local',
+                                       'file:///home/user/a.txt'))
+        self.assertEqual(len(second[7]), 3)
+        self.assertEqual(second[7][0][3:7], (None, None, None, None))
+
+        (eventsPerPid, nopids, count) = loader.loadEventsPerPid()
+        self.assertEqual((nopids, count), (1, 6))
+        self.assertEqual(sorted(eventsPerPid), [200, 300])
+        self.assertEqual(self._summarise(e for events in eventsPerPid.values()
+                                         for e in events),
+                         [e for e in expected if e[1]])
+
+        (stream, nopids, count) = loader.streamEventsPerPid()
+        self.assertEqual((nopids, count), (1, 6))
+        self.assertEqual(self._summarise(e for (__, events) in stream
+                                         for e in events),
+                         [e for e in expected if e[1]])
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
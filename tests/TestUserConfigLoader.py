@@ -18,5 +18,16 @@ class TestUserConfigLoader(unittest.TestCase):
         home = self.userConf.getSetting("HomeDir")
         self.assertEqual(home, "/home/user")
 
+    def test_excluded_home_dirs(self):
+        excl = self.userConf.getExcludedHomeDirs()
+        self.assertIs(excl, self.userConf.getExcludedHomeDirs())
+        self.assertEqual(excl.count("/tmp/"), 1)
+
+        exclRe = self.userConf.getExcludedHomeDirsRe()
+        self.assertTrue(exclRe.match("/tmp/file"))
+        self.assertTrue(exclRe.match("/usr/share/file"))
+        self.assertFalse(exclRe.match("/tmp"))
+        self.assertFalse(exclRe.match("/home/user/tmp/file"))
+
     def tearDown(self):
         self.userConf = None
@@ -16,6 +16,8 @@ __opt_check_exclfiles = False
 __opt_debug = False
 __opt_ext = False
 __opt_freq = 40
+__opt_jobs = 1
+__opt_lazy_events = False
 __opt_output_fs = None
 __opt_related_files = False
 __opt_score = False
@@ -25,6 +27,11 @@ __opt_plotting_disabled = False
 __opt_clusters = False
 __opt_user = None
 __opt_attack = False
+__opt_cache = None
+__opt_save_model = None
+__opt_load_model = None
+__opt_stream_events = False
+__opt_stream_zeitgeist = False
 
 
 def __setAttacks(opt):
@@ -33,6 +40,12 @@ def __setAttacks(opt):
     __opt_attack = opt
 
 
+def __setCache(opt):
+    """Set the return value of :cacheDir():."""
+    global __opt_cache
+    __opt_cache = opt
+
+
 def __setCheckMissing(opt):
     """Set the return value of :checkMissingEnabled():."""
     global __opt_check
@@ -63,6 +76,24 @@ def __setFrequency(opt):
     __opt_freq = int(opt)
 
 
+def __setJobs(opt):
+    """Set the return value of :jobCount():."""
+    global __opt_jobs
+    __opt_jobs = max(1, int(opt))
+
+
+def __setLazyEvents(opt):
+    """Set the return value of :lazyEventsEnabled():."""
+    global __opt_lazy_events
+    __opt_lazy_events = opt
+
+
+def __setLoadModel(opt):
+    """Set the return value of :loadModelPath():."""
+    global __opt_load_model
+    __opt_load_model = opt
+
+
 def __setOutputFs(opt):
     """Set the return value of :outputFsEnabled():."""
     global __opt_output_fs
@@ -81,6 +112,24 @@ def __setScore(opt):
     __opt_score = opt
 
 
+def __setSaveModel(opt):
+    """Set the return value of :saveModelPath():."""
+    global __opt_save_model
+    __opt_save_model = opt
+
+
+def __setStreamEvents(opt):
+    """Set the return value of :streamEventsEnabled():."""
+    global __opt_stream_events
+    __opt_stream_events = opt
+
+
+def __setStreamZeitgeist(opt):
+    """Set the return value of :streamZeitgeistEnabled():."""
+    global __opt_stream_zeitgeist
+    __opt_stream_zeitgeist = opt
+
+
 def __setSkip(opt):
     """Set the return value of :skipEnabled():."""
     global __opt_skip
@@ -118,6 +167,12 @@ def attacksEnabled():
     return __opt_attack
 
 
+def cacheDir():
+    """Return the value passed to the --cache flag, if any."""
+    global __opt_cache
+    return __opt_cache
+
+
 def checkMissingEnabled():
     """Return True if the --check-missing flag was passed, False otherwise."""
     global __opt_check
@@ -148,6 +203,24 @@ def frequency():
     return __opt_freq
 
 
+def jobCount():
+    """Return the value passed to the --jobs flag (default 1)."""
+    global __opt_jobs
+    return __opt_jobs
+
+
+def lazyEventsEnabled():
+    """Return True if the --lazy-events flag was passed, False otherwise."""
+    global __opt_lazy_events
+    return __opt_lazy_events
+
+
+def loadModelPath():
+    """Return the value passed to the --load-model flag, if any."""
+    global __opt_load_model
+    return __opt_load_model
+
+
 def outputFsEnabled():
     """Return the value passed to the --output-fs flag, if any."""
     global __opt_output_fs
@@ -166,6 +239,24 @@ def scoreEnabled():
     return __opt_score
 
 
+def saveModelPath():
+    """Return the value passed to the --save-model flag, if any."""
+    global __opt_save_model
+    return __opt_save_model
+
+
+def streamEventsEnabled():
+    """Return True if the --stream-events flag was passed, False otherwise."""
+    global __opt_stream_events
+    return __opt_stream_events
+
+
+def streamZeitgeistEnabled():
+    """Return True if --stream-zeitgeist was passed, False otherwise."""
+    global __opt_stream_zeitgeist
+    return __opt_stream_zeitgeist
+
+
 def skipEnabled():
     """Return the value of --skip if it was passed, None otherwise."""
     global __opt_skip
@@ -800,50 +891,6 @@ phpnamer = re.compile(PHPNAMER)
 phpprocname = re.compile(PHPPROCNAME)
 
 
-# Get the last line of a file
-BLOCKSIZE = 4096
-def tail(f):
-    # Save old position.
-    oldPos = f.tell()
-
-    # Seek to end of file to get file length.
-    f.seek(0, 2)
-    bytesInFile = f.tell()
-
-    # Parse file to get tail.
-    linesFound = 0
-    totalBytesScanned = 0
-
-    # Find any position (efficiently-ish) such that it's before 2+ lines.
-    while (linesFound < 2 and bytesInFile > totalBytesScanned):
-        byteBlock = min(BLOCKSIZE, bytesInFile - totalBytesScanned)
-        f.seek( -(byteBlock + totalBytesScanned), 2)
-        totalBytesScanned += byteBlock
-
-        buff = f.read(BLOCKSIZE)
-        try:
-            countableBuff = buff.decode('utf-8')
-        except(UnicodeDecodeError) as e:
-            return None
-        else:
-            linesFound += countableBuff.count('\n')
-
-    # Seek to that position where there are 2+ lines, and then read lines.
-    f.seek(-totalBytesScanned, 2)
-    lineList = list(f.readlines())
-
-    # Reset position;
-    f.seek(oldPos, 0)
-
-    # Return the last line.
-    try:
-        readableLine = lineList[-1].decode('utf-8')
-    except(UnicodeDecodeError) as e:
-        return None
-    else:
-        return readableLine
-
-
 # Copied from StackExchange, timed prints.
 import atexit
 from time import time